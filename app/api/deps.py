@@ -0,0 +1,36 @@
+from fastapi import HTTPException, Request, WebSocketException, status
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.domain.services.quote_hub import QuoteHub
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.cache.response_cache import ResponseCache
+
+
+def get_stock_service(request: Request) -> StockService:
+    """进程内共享的 StockService（由 app lifespan 创建；未经 lifespan 启动时按需创建一次）"""
+    service = getattr(request.app.state, "stock_service", None)
+    if service is None:
+        service = request.app.state.stock_service = StockService()
+    return service
+
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """进程内共享的 HTTP 响应缓存（单票信息 / K 线）"""
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is None:
+        cache = request.app.state.response_cache = ResponseCache(settings.HTTP_CACHE_MAX_ENTRIES)
+    return cache
+
+
+def get_quote_hub(conn: HTTPConnection) -> QuoteHub:
+    """
+    进程内共享的行情推送中心，HTTP 与 WebSocket 路由共用；只由 app lifespan 创建和停止，
+    不在这里按需创建（否则其后台轮询无人停止）。未经 lifespan 启动时返回 503 / 关闭 WebSocket
+    """
+    hub = getattr(conn.app.state, "quote_hub", None)
+    if hub is None:
+        if conn.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER, reason="行情推送未启动")
+        raise HTTPException(status_code=503, detail="行情推送未启动")
+    return hub
@@ -0,0 +1,204 @@
+"""
+大响应的快速序列化：直接从 DataFrame / NumPy 列生成 JSON 字节（orjson），不逐条构造 pydantic 模型
+
+- K 线 records 布局（默认）：与 List[StockKLineOut] 相同的结构
+- K 线 columns 布局：{"date": [...], "open": [...], ..., "volume": [...], "amount": [...],
+  "indicators": {"ma5": [...]}}；数值列整列编码，成交量 / 额为原始数值（手 / 元），缺失值为 null
+- 股票列表：记录按 StockResponse 的字段投影后编码
+- 选股结果 / 因子排名：宽表记录直接编码
+
+与 FastAPI 默认路径（response_model 校验 + jsonable_encoder + json.dumps）输出的 JSON 等价。
+
+批量导出（Arrow IPC stream / Parquet）：record batch 每写入一批就把已编码的字节交给响应流，
+不在内存中拼出完整文件；Parquet 按 EXPORT_ROW_GROUP_ROWS 行攒成一个 row group。
+"""
+
+import io
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, List, Union
+
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.domain.models.schemas.stock import StockResponse
+from app.domain.services.stock_service import KLINE_COLUMNS
+from app.infrastructure.data.arrow import to_arrow_table
+
+KLINE_LAYOUTS = ('records', 'columns')
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+_STOCK_FIELDS = list(StockResponse.model_fields)
+
+
+def _dates(frame: pd.DataFrame) -> List[str]:
+    return pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d").tolist()
+
+
+def _nullable(values: np.ndarray) -> list:
+    """float 数组 → list，NaN 记为 None"""
+    values = np.asarray(values, dtype="float64")
+    out = values.tolist()
+    for i in np.flatnonzero(np.isnan(values)):
+        out[i] = None
+    return out
+
+
+def kline_records_json(frame: pd.DataFrame) -> bytes:
+    """StockService.get_kline_frame 的结果 → StockKLineOut 记录数组的 JSON"""
+    dates = _dates(frame)
+    prices = [frame[c].to_numpy(dtype="float64").tolist() for c in ("open", "high", "low", "close")]
+    volume_str = ((frame["volume"] / 1e4).round(2).astype(str) + " 万手").tolist()
+    amount_str = ((frame["amount"] / 1e8).round(2).astype(str) + " 亿").tolist()
+    rows = [
+        {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume_str": v, "amount_str": a}
+        for d, o, h, lo, c, v, a in zip(dates, *prices, volume_str, amount_str)
+    ]
+    names = [c for c in frame.columns if c not in KLINE_COLUMNS]
+    if names:
+        columns = [_nullable(frame[name].to_numpy()) for name in names]
+        for row, values in zip(rows, zip(*columns)):
+            row["indicators"] = dict(zip(names, values))
+    return orjson.dumps(rows)
+
+
+def kline_columns_json(frame: pd.DataFrame) -> bytes:
+    """StockService.get_kline_frame 的结果 → 列式 JSON"""
+    payload = {"date": _dates(frame)}
+    for column in KLINE_COLUMNS[1:]:
+        payload[column] = frame[column].to_numpy(dtype="float64")
+    names = [c for c in frame.columns if c not in KLINE_COLUMNS]
+    if names:
+        # NumPy 数组中的 NaN 由 orjson 编码为 null
+        payload["indicators"] = {name: frame[name].to_numpy(dtype="float64") for name in names}
+    return orjson.dumps(payload, option=_OPTIONS)
+
+
+def kline_json(frame: pd.DataFrame, layout: str = "records") -> bytes:
+    if layout == "columns":
+        return kline_columns_json(frame)
+    if layout == "records":
+        return kline_records_json(frame)
+    raise ValueError(f"不支持的 K 线布局: {layout}")
+
+
+def stocks_json(stocks: List[dict]) -> bytes:
+    """股票池索引记录 → StockResponse 数组的 JSON（缺失字段为 null，updated_at 为当前 UTC 时间）"""
+    now = datetime.utcnow()
+    rows = []
+    for stock in stocks:
+        row = {field: stock.get(field) for field in _STOCK_FIELDS}
+        if row["volume"] is not None:
+            row["volume"] = int(row["volume"])
+        if row["updated_at"] is None:
+            row["updated_at"] = now
+        rows.append(row)
+    return orjson.dumps(rows, option=_OPTIONS)
+
+
+def records_json(frame: pd.DataFrame, **fields) -> bytes:
+    """宽表 → {**fields, "count": 行数, "data": 记录}（选股 / 因子排名）；日期列为 YYYY-MM-DD，NaN 为 null"""
+    frame = frame.copy()
+    for column in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[column]):
+            frame[column] = frame[column].dt.strftime("%Y-%m-%d").astype(object).where(frame[column].notna(), None)
+    payload = {**fields, "count": len(frame), "data": frame.to_dict("records")}
+    return orjson.dumps(payload, option=_OPTIONS)
+
+
+# ------------ Arrow / Parquet 导出 ------------
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+EXPORT_MEDIA_TYPES = {"arrow": ARROW_STREAM_MEDIA_TYPE, "parquet": PARQUET_MEDIA_TYPE}
+EXPORT_SUFFIXES = {"arrow": "arrows", "parquet": "parquet"}
+EXPORT_ROW_GROUP_ROWS = 128 * 1024
+
+KLINE_ARROW_SCHEMA = pa.schema([
+    ("symbol", pa.string()), ("date", pa.date32()),
+    ("open", pa.float64()), ("high", pa.float64()), ("low", pa.float64()), ("close", pa.float64()),
+    ("volume", pa.float64()), ("amount", pa.float64()),
+])
+
+
+class _ChunkSink(io.RawIOBase):
+    """pyarrow 写入目标：收集写出的字节，由 drain() 取走"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def kline_batch(symbol: str, frame: pd.DataFrame) -> pa.RecordBatch:
+    """单只股票的 K 线 → KLINE_ARROW_SCHEMA 的 record batch"""
+    dates = pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[D]")
+    columns = [pa.array(np.full(len(frame), symbol, dtype=object), pa.string()), pa.array(dates, pa.date32())]
+    columns += [pa.array(frame[c].to_numpy(dtype="float64")) for c in KLINE_COLUMNS[1:]]
+    return pa.RecordBatch.from_arrays(columns, schema=KLINE_ARROW_SCHEMA)
+
+
+def frame_table(frame: pd.DataFrame) -> pa.Table:
+    """快照 / 股票池等整表导出"""
+    return to_arrow_table(frame.reset_index(drop=True)).replace_schema_metadata(None)
+
+
+async def _batches_of(table: pa.Table) -> AsyncIterator[pa.RecordBatch]:
+    for batch in table.to_batches(max_chunksize=EXPORT_ROW_GROUP_ROWS):
+        yield batch
+
+
+async def export_stream(schema: pa.Schema, batches: Union[pa.Table, AsyncIterable[pa.RecordBatch]],
+                        fmt: str) -> AsyncIterator[bytes]:
+    """
+    把 record batch 逐批编码为 Arrow IPC stream（fmt='arrow'）或 Parquet（fmt='parquet'）的字节流
+    :param batches: pa.Table 或产出 pa.RecordBatch 的异步迭代器
+    """
+    if isinstance(batches, pa.Table):
+        batches = _batches_of(batches)
+    sink = _ChunkSink()
+    if fmt == "arrow":
+        writer = pa.ipc.new_stream(sink, schema)
+    elif fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+
+    buffered: List[pa.RecordBatch] = []
+    buffered_rows = 0
+    try:
+        async for batch in batches:
+            if fmt == "arrow":
+                writer.write_batch(batch)
+            else:
+                buffered.append(batch)
+                buffered_rows += batch.num_rows
+                if buffered_rows < EXPORT_ROW_GROUP_ROWS:
+                    continue
+                writer.write_table(pa.Table.from_batches(buffered, schema=schema))
+                buffered, buffered_rows = [], 0
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        if buffered:
+            writer.write_table(pa.Table.from_batches(buffered, schema=schema))
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,50 @@
+"""
+路由级 HTTP 缓存：服务端缓存序列化后的响应体，ETag + If-None-Match 条件请求，Cache-Control 跟随交易日历
+
+    return await cached_json(request, cache, key, render, service.cache_max_age)
+
+- render() 返回响应体字节（已按 response_model 序列化），只在缓存未命中时调用
+- If-None-Match 与缓存条目的 ETag 相同时回 304，不触碰数据源也不发送响应体
+- max-age：交易时段内短（HTTP_CACHE_SESSION_MAX_AGE），盘外缓存到下一次开盘
+"""
+
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.infrastructure.data.cache.response_cache import ResponseCache, etag_matches
+
+
+def json_renderer(adapter: TypeAdapter, produce: Callable[[], Awaitable[Any]],
+                  exclude_unset: bool = False) -> Callable[[], Awaitable[bytes]]:
+    """把返回 dict / list 的协程包装为按 response_model 序列化为 JSON 字节的 render 函数"""
+
+    async def render() -> bytes:
+        data = await produce()
+        return adapter.dump_json(adapter.validate_python(data), exclude_unset=exclude_unset)
+
+    return render
+
+
+async def cached_json(request: Request, cache: ResponseCache, key: Hashable,
+                      render: Callable[[], Awaitable[bytes]],
+                      max_age: Callable[[], Awaitable[int]]) -> Response:
+    if not settings.HTTP_CACHE_ENABLED:
+        return Response(await render(), media_type="application/json")
+
+    async def fill():
+        body = await render()
+        return body, await max_age()
+
+    entry, hit = await cache.get_or_render(key, fill)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={entry.remaining()}",
+        "X-Cache": "HIT" if hit else "MISS",
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
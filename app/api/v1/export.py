@@ -0,0 +1,89 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_stock_service
+from app.api.encoders import (
+    EXPORT_MEDIA_TYPES, EXPORT_SUFFIXES, KLINE_ARROW_SCHEMA, PARQUET_MEDIA_TYPE,
+    export_stream, frame_table, kline_batch,
+)
+from app.domain.services.stock_service import StockService
+
+router = APIRouter(prefix="/stocks/export", tags=["Export"])
+
+FORMAT_QUERY = Query(None, regex="^(arrow|parquet)$",
+                     description="arrow 为 Arrow IPC stream，parquet 为 Parquet；不传时按 Accept 协商，默认 arrow")
+
+
+def _negotiate(request: Request, fmt: Optional[str]) -> str:
+    """?format= 优先，其次 Accept（application/vnd.apache.parquet → parquet），默认 Arrow IPC stream"""
+    if fmt:
+        return fmt
+    return "parquet" if PARQUET_MEDIA_TYPE in request.headers.get("accept", "") else "arrow"
+
+
+def _export_response(schema, batches, fmt: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        export_stream(schema, batches, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{EXPORT_SUFFIXES[fmt]}"'},
+    )
+
+
+# ------------ 多股 K 线 ------------
+@router.get("/klines")
+async def export_klines(
+        request: Request,
+        symbols: Optional[str] = Query(None, description="逗号分隔的股票代码；不传时导出整个股票池"),
+        freq: str = Query("daily", regex="^(daily|weekly|monthly)$"),
+        limit: int = Query(250, ge=1, le=20000, description="每只股票最近多少根"),
+        adjust: str = Query("", regex="^(|qfq|hfq)$", description="复权方式：空为不复权，qfq 前复权，hfq 后复权"),
+        format: Optional[str] = FORMAT_QUERY,
+        service: StockService = Depends(get_stock_service)
+):
+    """
+    长表 symbol/date/open/high/low/close/volume/amount，按 symbols 顺序每只股票一个 record batch 流式返回；
+    获取失败的股票跳过
+    """
+    fmt = _negotiate(request, format)
+    if symbols:
+        symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    else:
+        symbol_list = (await service.get_universe_frame())["symbol"].tolist()
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="没有可导出的股票")
+
+    async def batches():
+        async for symbol, frame in service.iter_kline_frames(symbol_list, freq, limit, adjust):
+            yield kline_batch(symbol, frame)
+
+    return _export_response(KLINE_ARROW_SCHEMA, batches(), fmt, f"klines_{freq}")
+
+
+# ------------ 股票池 ------------
+@router.get("/universe")
+async def export_universe(
+        request: Request,
+        format: Optional[str] = FORMAT_QUERY,
+        service: StockService = Depends(get_stock_service)
+):
+    frame = await service.get_universe_frame()
+    if frame.empty:
+        raise HTTPException(status_code=503, detail="股票池暂时不可用")
+    table = frame_table(frame)
+    return _export_response(table.schema, table, _negotiate(request, format), "universe")
+
+
+# ------------ 实时快照 ------------
+@router.get("/snapshot")
+async def export_snapshot(
+        request: Request,
+        format: Optional[str] = FORMAT_QUERY,
+        service: StockService = Depends(get_stock_service)
+):
+    frame = await service.get_snapshot_frame()
+    if frame.empty:
+        raise HTTPException(status_code=503, detail="行情快照暂时不可用")
+    table = frame_table(frame)
+    return _export_response(table.schema, table, _negotiate(request, format), "snapshot")
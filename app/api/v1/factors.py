@@ -0,0 +1,62 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+
+from app.api.deps import get_stock_service
+from app.api.encoders import records_json
+from app.domain.models.schemas.stock import FactorRankResponse
+from app.domain.services.stock_service import StockService
+
+router = APIRouter(prefix="/factors", tags=["Factors"])
+
+BY_QUERY = Query("score", description="排名字段：score / score_ind / 因子名（如 ep）/ {因子}_z / {因子}_pct / {因子}_ind_pct")
+WEIGHTS_QUERY = Query(None, description="临时的综合分权重，如 ep:2,bp:1；未列出的因子权重为 0")
+
+
+# ------------ 因子列表 ------------
+@router.get("")
+async def list_factors(service: StockService = Depends(get_stock_service)):
+    """可用因子、说明与当前综合分权重"""
+    return [
+        {"name": name, "description": description, "weight": weight}
+        for name, description, weight in service.factor_engine.describe()
+    ]
+
+
+# ------------ 因子排名 ------------
+async def _rank(service: StockService, by: str, n: int, bottom: bool,
+                industry: Optional[str], weights: Optional[str]) -> Response:
+    industries = [s.strip() for s in industry.split(",") if s.strip()] if industry else None
+    try:
+        frame, total, as_of = await service.rank_factors(
+            by=by, n=n, bottom=bottom, industry=industries,
+            weights=service.factor_engine.parse_weights(weights)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(records_json(frame, as_of=as_of, total=total), media_type="application/json")
+
+
+@router.get("/top", response_model=FactorRankResponse)
+async def top_stocks(
+        by: str = BY_QUERY,
+        n: int = Query(50, ge=1, le=1000),
+        industry: Optional[str] = Query(None, description="行业，逗号分隔多个"),
+        weights: Optional[str] = WEIGHTS_QUERY,
+        service: StockService = Depends(get_stock_service)
+):
+    """当前快照上排名字段最高的 n 只股票（该字段为空的不参与排名）"""
+    return await _rank(service, by, n, False, industry, weights)
+
+
+@router.get("/bottom", response_model=FactorRankResponse)
+async def bottom_stocks(
+        by: str = BY_QUERY,
+        n: int = Query(50, ge=1, le=1000),
+        industry: Optional[str] = Query(None, description="行业，逗号分隔多个"),
+        weights: Optional[str] = WEIGHTS_QUERY,
+        service: StockService = Depends(get_stock_service)
+):
+    """当前快照上排名字段最低的 n 只股票（该字段为空的不参与排名）"""
+    return await _rank(service, by, n, True, industry, weights)
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, Query, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_quote_hub
+from app.domain.services.quote_hub import QuoteHub
+
+router = APIRouter(prefix="/quotes", tags=["Quotes"])
+
+# SSE 空闲时的心跳间隔（秒），防止代理断开长连接
+SSE_HEARTBEAT_SECONDS = 15
+
+
+def _parse_symbols(value) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return [s.strip() for s in value or [] if s and s.strip()]
+
+
+# ------------ WebSocket ------------
+@router.websocket("/ws")
+async def quote_websocket(websocket: WebSocket, symbols: str = Query("", description="逗号分隔的股票代码"),
+                          hub: QuoteHub = Depends(get_quote_hub)):
+    """
+    行情推送：首条消息为订阅股票的全量快照，之后只推送变化的字段
+    客户端可随时发送 {"action": "subscribe" | "unsubscribe", "symbols": [...]} 调整订阅
+    """
+    await websocket.accept()
+    sub = hub.subscribe(_parse_symbols(symbols))
+
+    async def receive():
+        while True:
+            try:
+                request = json.loads(await websocket.receive_text())
+                action, codes = request.get("action"), _parse_symbols(request.get("symbols"))
+            except (ValueError, AttributeError):
+                await websocket.send_text('{"type":"error","message":"无效的订阅消息"}')
+                continue
+            if action == "subscribe":
+                hub.update(sub, add=codes)
+            elif action == "unsubscribe":
+                hub.update(sub, remove=codes)
+            else:
+                await websocket.send_text('{"type":"error","message":"action 只能为 subscribe / unsubscribe"}')
+
+    async def send():
+        while True:
+            await websocket.send_text(await sub.get())
+
+    # 收发任一方结束（通常是客户端断开）即退出；清理时不再 await，避免与服务器关停时的取消交错
+    tasks = [asyncio.ensure_future(receive()), asyncio.ensure_future(send())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not task.cancelled():
+                task.exception()
+    finally:
+        hub.unsubscribe(sub)
+        for task in tasks:
+            task.cancel()
+
+
+# ------------ SSE ------------
+@router.get("/stream")
+async def quote_stream(request: Request, symbols: str = Query(..., description="逗号分隔的股票代码"),
+                       hub: QuoteHub = Depends(get_quote_hub)):
+    """Server-Sent Events 行情推送，消息格式与 WebSocket 相同"""
+    sub = hub.subscribe(_parse_symbols(symbols))
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(sub.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
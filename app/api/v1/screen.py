@@ -0,0 +1,53 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.api.deps import get_response_cache, get_stock_service
+from app.api.encoders import records_json
+from app.api.http_cache import cached_json
+from app.domain.analysis.screen import FIELD_ALIASES, SCREEN_FIELDS, parse_filters
+from app.domain.models.schemas.stock import ScreenResponse
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.cache.response_cache import ResponseCache
+
+router = APIRouter(prefix="/screen", tags=["Screen"])
+
+
+# ------------ 横截面选股 ------------
+@router.get("", response_model=ScreenResponse)
+async def screen_stocks(
+        request: Request,
+        industry: Optional[str] = Query(None, description="行业，逗号分隔多个"),
+        exchange: Optional[str] = Query(None, description="交易所：SSE / SZSE / BSE"),
+        market_type: Optional[str] = Query(None, description="板块，如 主板 / 创业板 / 科创板 / 北交所"),
+        period: Optional[str] = Query(None, regex=r"^\d{4}(0331|0630|0930|1231)$",
+                                      description="报告期（YYYYMMDD 季末日）；默认取披露较全的最近一期"),
+        sort: Optional[str] = Query(None, description="排序字段，默认按股票代码"),
+        order: str = Query("desc", regex="^(asc|desc)$"),
+        limit: int = Query(100, ge=1, le=10000),
+        service: StockService = Depends(get_stock_service),
+        cache: ResponseCache = Depends(get_response_cache)
+):
+    """
+    全市场选股：数值条件写作 {字段}_{lt|le|gt|ge}=数值，例如 `pe_lt=15&roe_gt=0.1`；
+    可用字段为实时行情（current_price / pe_ratio / pb_ratio / market_cap ...）与同一报告期的财务
+    （eps / roe / revenue_yoy / net_profit_yoy / gross_margin ...，年初至今累计），比例字段为小数；
+    响应中的 period 为实际所用报告期
+    """
+    try:
+        filters = parse_filters(request.query_params, SCREEN_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sort = FIELD_ALIASES.get(sort, sort)
+    if sort is not None and sort not in SCREEN_FIELDS:
+        raise HTTPException(status_code=400, detail=f"不支持的排序字段: {sort}")
+    industries = [s.strip() for s in industry.split(",") if s.strip()] if industry else None
+
+    async def render() -> bytes:
+        frame, total, used = await service.screen(filters, industry=industries, exchange=exchange,
+                                                  market_type=market_type, sort=sort, ascending=order == "asc",
+                                                  limit=limit, period=period)
+        return records_json(frame, period=used, total=total)
+
+    key = ("screen",) + tuple(sorted(request.query_params.multi_items()))
+    return await cached_json(request, cache, key, render, service.cache_max_age)
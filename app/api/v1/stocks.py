@@ -1,46 +1,107 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import List
-from app.domain.models.schemas.stock import StockResponse, StockKLineOut
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from pydantic import TypeAdapter
+from typing import List, Optional, Union
+from app.domain.models.schemas.stock import (
+    StockResponse, StockKLineOut, KLineBatchRequest, KLineBatchResponse
+)
+from app.api.deps import get_response_cache, get_stock_service
+from app.api.encoders import kline_json, stocks_json
+from app.api.http_cache import cached_json, json_renderer
+from app.domain.analysis.indicators import IndicatorEngine
 from app.domain.services.stock_service import StockService
+from app.infrastructure.data.cache.response_cache import ResponseCache
 
 router = APIRouter(prefix="/stocks", tags=["Stocks"])
 
+_STOCK_ADAPTER = TypeAdapter(StockResponse)
+
 
 # ------------ 列表 ------------
 @router.get("", response_model=List[StockResponse])
 async def list_stocks(
         limit: int = Query(100, ge=1, le=1000),
         offset: int = Query(0, ge=0),
-        service: StockService = Depends()
+        cursor: Optional[str] = Query(None, description="上一页响应头 X-Next-Cursor 的值；提供时忽略 offset"),
+        exchange: Optional[str] = Query(None, description="交易所：SSE / SZSE / BSE"),
+        industry: Optional[str] = Query(None, description="行业"),
+        market_type: Optional[str] = Query(None, description="板块，如 主板 / 创业板 / 科创板 / 北交所"),
+        service: StockService = Depends(get_stock_service)
 ):
     try:
-        stocks = await service.get_stocks(limit=limit, offset=offset)
-        return stocks
+        stocks, next_cursor = await service.get_stocks_page(
+            limit=limit, offset=offset, cursor=cursor,
+            exchange=exchange, industry=industry, market_type=market_type
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    # 直接按记录编码，不逐条构造 StockResponse
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return Response(stocks_json(stocks), media_type="application/json", headers=headers)
 
 
 # ------------ 单票基础信息 ------------
 @router.get("/{symbol}", response_model=StockResponse)
 async def get_stock(
+        request: Request,
         symbol: str,
-        service: StockService = Depends()
+        service: StockService = Depends(get_stock_service),
+        cache: ResponseCache = Depends(get_response_cache)
 ):
-    stock = await service.get_stock(symbol)
-    if not stock:
-        raise HTTPException(status_code=404, detail=f"股票 {symbol} 不存在")
-    return stock
+    async def produce():
+        stock = await service.get_stock(symbol)
+        if not stock:
+            raise HTTPException(status_code=404, detail=f"股票 {symbol} 不存在")
+        return stock
+
+    return await cached_json(request, cache, ("stock", symbol),
+                             json_renderer(_STOCK_ADAPTER, produce), service.cache_max_age)
 
 
 # ------------ K 线 ------------
-@router.get("/{symbol}/kline", response_model=List[StockKLineOut])
+@router.get("/{symbol}/kline", response_model=List[StockKLineOut], response_model_exclude_unset=True)
 async def get_kline(
+        request: Request,
         symbol: str,
         freq: str = Query("daily", regex="^(daily|weekly|monthly)$"),
         limit: int = Query(30, ge=1, le=1000),
-        service: StockService = Depends()
+        indicators: Optional[str] = Query(None, description="逗号分隔的技术指标组：ma,ema,macd,rsi,boll,kdj,atr"),
+        adjust: str = Query("", regex="^(|qfq|hfq)$", description="复权方式：空为不复权，qfq 前复权，hfq 后复权"),
+        layout: str = Query("records", regex="^(records|columns)$",
+                            description="records 为逐条记录（默认）；columns 为列式 {\"date\": [...], \"open\": [...]}，"
+                                        "成交量 / 额为原始数值"),
+        service: StockService = Depends(get_stock_service),
+        cache: ResponseCache = Depends(get_response_cache)
 ):
+    groups = _parse_indicators(indicators)
+
+    async def render() -> bytes:
+        try:
+            frame = await service.get_kline_frame(symbol, freq, limit, groups, adjust)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+        # 直接从列数据编码 JSON，不逐条构造 StockKLineOut
+        return kline_json(frame, layout)
+
+    # 同一组参数的响应只在交易时段内变化：命中缓存时不再读日线、算指标和序列化
+    key = ("kline", symbol, freq, limit, adjust, tuple(groups or ()), layout)
+    return await cached_json(request, cache, key, render, service.cache_max_age)
+
+
+def _parse_indicators(indicators: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
+    if not indicators:
+        return None
+    items = indicators.split(",") if isinstance(indicators, str) else indicators
     try:
-        return await service.get_kline(symbol, freq, limit)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return list(IndicatorEngine.resolve_groups(items))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------ 批量 K 线 ------------
+@router.post("/kline/batch", response_model=KLineBatchResponse, response_model_exclude_unset=True)
+async def get_kline_batch(
+        body: KLineBatchRequest,
+        service: StockService = Depends(get_stock_service)
+):
+    groups = _parse_indicators(body.indicators)
+    return await service.get_kline_many(body.symbols, body.freq, body.limit, indicators=groups, adjust=body.adjust)
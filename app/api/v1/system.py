@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.api.deps import get_stock_service
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.executor import executor_stats
+from app.infrastructure.data.ratelimit import rate_limiter_stats
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+# ------------ 缓存状态 ------------
+@router.get("/caches")
+async def get_caches(request: Request, service: StockService = Depends(get_stock_service)):
+    tasks = getattr(request.app.state, "periodic_tasks", [])
+    hub = getattr(request.app.state, "quote_hub", None)
+    response_cache = getattr(request.app.state, "response_cache", None)
+    return {
+        "service": service.cache_stats(),
+        "executors": executor_stats(),
+        "rate_limiters": rate_limiter_stats(),
+        "quote_hub": hub.stats() if hub is not None else None,
+        "http_response": response_cache.stats() if response_cache is not None else None,
+        "tasks": {task.name: task.stats() for task in tasks},
+    }
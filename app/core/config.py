@@ -13,18 +13,110 @@ class Settings(BaseSettings):
     DB_USER: str = Field(default="stock_user", env="DB_USER")
     DB_PASSWORD: str = Field(default="", env="DB_PASSWORD")
     DB_URL: Optional[str] = None
+    DB_POOL_SIZE: int = Field(default=10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=20, env="DB_MAX_OVERFLOW")
+    DB_POOL_RECYCLE: int = Field(default=3600, env="DB_POOL_RECYCLE")
+    DB_ECHO: bool = Field(default=False, env="DB_ECHO")
+    # 批量写入时每条 INSERT 语句携带的行数
+    DB_BATCH_SIZE: int = Field(default=1000, env="DB_BATCH_SIZE")
 
-    # 数据源配置
+    # 数据源配置（DATA_SOURCE: eastmoney / synthetic，见 sources.registry）
+    DATA_SOURCE: str = Field(default="eastmoney", env="DATA_SOURCE")
     TU_SHARE_TOKEN: Optional[str] = Field(None, env="TU_SHARE_TOKEN")
     SINA_API_ENDPOINT: str = Field(default="https://hq.sinajs.cn/list=", env="SINA_API_ENDPOINT")
     TENCENT_STOCK_URL: str = Field(default="https://qt.gtimg.cn/q=", env="TENCENT_STOCK_URL")
 
+    # 数据源执行层（线程池 / 在途上限 / 超时）
+    SOURCE_MAX_IN_FLIGHT: int = Field(default=8, env="SOURCE_MAX_IN_FLIGHT")
+    SOURCE_TIMEOUT_SECONDS: float = Field(default=30.0, env="SOURCE_TIMEOUT_SECONDS")
+    EASTMONEY_MAX_IN_FLIGHT: Optional[int] = Field(None, env="EASTMONEY_MAX_IN_FLIGHT")
+    TUSHARE_MAX_IN_FLIGHT: Optional[int] = Field(None, env="TUSHARE_MAX_IN_FLIGHT")
+    # 东财后台批量回源（行业板块成分、财务报告期同步）使用单独的小线程池，不占用请求路径的名额
+    EASTMONEY_BULK_MAX_IN_FLIGHT: int = Field(default=2, env="EASTMONEY_BULK_MAX_IN_FLIGHT")
+
+    # Tushare 积分限流（所有 pro 接口共享一个令牌桶）与配额超限重试
+    TUSHARE_POINTS_PER_MINUTE: float = Field(default=500, env="TUSHARE_POINTS_PER_MINUTE")
+    TUSHARE_MAX_RETRIES: int = Field(default=5, env="TUSHARE_MAX_RETRIES")
+    TUSHARE_RETRY_BACKOFF_SECONDS: float = Field(default=2.0, env="TUSHARE_RETRY_BACKOFF_SECONDS")
+
+    # 本地K线存储
+    KLINE_STORE_DIR: str = Field(default="data/kline", env="KLINE_STORE_DIR")
+    KLINE_SYNC_INTERVAL_SECONDS: int = Field(default=300, env="KLINE_SYNC_INTERVAL_SECONDS")
+
+    # 交易日历（本地缓存，按天刷新）
+    CALENDAR_PATH: str = Field(default="data/calendar/sse.parquet", env="CALENDAR_PATH")
+    CALENDAR_REFRESH_SECONDS: int = Field(default=86400, env="CALENDAR_REFRESH_SECONDS")
+
+    # K 线主备对冲（东财为主、Tushare 为备，需配置 TU_SHARE_TOKEN）：主源超过近期耗时的 p95 未返回时请求备源
+    KLINE_HEDGE_ENABLED: bool = Field(default=True, env="KLINE_HEDGE_ENABLED")
+    KLINE_HEDGE_PERCENTILE: float = Field(default=95.0, env="KLINE_HEDGE_PERCENTILE")
+    KLINE_HEDGE_MIN_DELAY_SECONDS: float = Field(default=0.2, env="KLINE_HEDGE_MIN_DELAY_SECONDS")
+    KLINE_HEDGE_MAX_DELAY_SECONDS: float = Field(default=5.0, env="KLINE_HEDGE_MAX_DELAY_SECONDS")
+    KLINE_HEDGE_DEFAULT_DELAY_SECONDS: float = Field(default=2.0, env="KLINE_HEDGE_DEFAULT_DELAY_SECONDS")
+
+    # 数据源熔断：连续失败次数阈值与熔断时长
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(default=5, env="CIRCUIT_FAILURE_THRESHOLD")
+    CIRCUIT_RESET_SECONDS: float = Field(default=30.0, env="CIRCUIT_RESET_SECONDS")
+
+    # 财务数据（业绩报表）：本地按报告期存储，保留最近 N 年，后台增量刷新间隔
+    FINANCIAL_STORE_DIR: str = Field(default="data/financial", env="FINANCIAL_STORE_DIR")
+    FINANCIAL_HISTORY_YEARS: int = Field(default=3, env="FINANCIAL_HISTORY_YEARS")
+    FINANCIAL_REFRESH_ENABLED: bool = Field(default=True, env="FINANCIAL_REFRESH_ENABLED")
+    FINANCIAL_REFRESH_SECONDS: float = Field(default=21600.0, env="FINANCIAL_REFRESH_SECONDS")
+    FINANCIAL_REFRESH_DELAY_SECONDS: float = Field(default=120.0, env="FINANCIAL_REFRESH_DELAY_SECONDS")
+
+    # 横截面因子综合分权重（如 ep:2,bp:1,size:1），留空为各因子等权
+    FACTOR_WEIGHTS: str = Field(default="", env="FACTOR_WEIGHTS")
+
+    # 批量K线并发数
+    KLINE_BATCH_CONCURRENCY: int = Field(default=8, env="KLINE_BATCH_CONCURRENCY")
+
+    # 技术指标预热K线数（指标在 limit 之外多取这么多根，避免开头指标失真）
+    INDICATOR_WARMUP_BARS: int = Field(default=250, env="INDICATOR_WARMUP_BARS")
+
+    # 全市场分析任务（tasks/run_analysis.py）
+    ANALYSIS_OUTPUT_DIR: str = Field(default="data/analysis", env="ANALYSIS_OUTPUT_DIR")
+    ANALYSIS_WORKERS: Optional[int] = Field(None, env="ANALYSIS_WORKERS")
+    ANALYSIS_SHARD_SIZE: int = Field(default=250, env="ANALYSIS_SHARD_SIZE")
+    ANALYSIS_BARS: int = Field(default=500, env="ANALYSIS_BARS")
+
+    # 全市场行情快照缓存
+    SNAPSHOT_TTL_SECONDS: float = Field(default=5.0, env="SNAPSHOT_TTL_SECONDS")
+    UNIVERSE_TTL_SECONDS: float = Field(default=3600.0, env="UNIVERSE_TTL_SECONDS")
+
+    # HTTP 响应缓存（单票信息 / K 线，ETag + 条件请求）：交易时段内的 max-age 与盘外的最长 max-age
+    HTTP_CACHE_ENABLED: bool = Field(default=True, env="HTTP_CACHE_ENABLED")
+    HTTP_CACHE_MAX_ENTRIES: int = Field(default=2048, env="HTTP_CACHE_MAX_ENTRIES")
+    HTTP_CACHE_SESSION_MAX_AGE: int = Field(default=30, env="HTTP_CACHE_SESSION_MAX_AGE")
+    HTTP_CACHE_MAX_AGE: int = Field(default=86400, env="HTTP_CACHE_MAX_AGE")
+
+    # 实时行情推送（WebSocket / SSE）
+    QUOTE_STREAM_INTERVAL_SECONDS: float = Field(default=3.0, env="QUOTE_STREAM_INTERVAL_SECONDS")
+    QUOTE_STREAM_QUEUE_SIZE: int = Field(default=8, env="QUOTE_STREAM_QUEUE_SIZE")
+
+    # 股票池索引后台刷新
+    UNIVERSE_REFRESH_SECONDS: float = Field(default=3600.0, env="UNIVERSE_REFRESH_SECONDS")
+    UNIVERSE_INDUSTRY_ENABLED: bool = Field(default=True, env="UNIVERSE_INDUSTRY_ENABLED")
+    INDUSTRY_REFRESH_SECONDS: float = Field(default=86400.0, env="INDUSTRY_REFRESH_SECONDS")
+    INDUSTRY_REFRESH_DELAY_SECONDS: float = Field(default=60.0, env="INDUSTRY_REFRESH_DELAY_SECONDS")
+
+    # 上游调用录制 / 回放（record / replay / auto，留空关闭）；回放延迟 = 固定秒数 + 录制耗时 × 倍数
+    CASSETTE_MODE: str = Field(default="", env="CASSETTE_MODE")
+    CASSETTE_PATH: str = Field(default="data/cassettes/default", env="CASSETTE_PATH")
+    CASSETTE_LATENCY_SECONDS: float = Field(default=0.0, env="CASSETTE_LATENCY_SECONDS")
+    CASSETTE_LATENCY_SCALE: float = Field(default=0.0, env="CASSETTE_LATENCY_SCALE")
+
+    # 指标（/metrics，Prometheus 文本格式）；关闭时记录点只做一次布尔判断
+    METRICS_ENABLED: bool = Field(default=False, env="METRICS_ENABLED")
+
     # 安全配置
     APP_SECRET_KEY: str = Field(default_factory=lambda: secrets.token_urlsafe(32), env="APP_SECRET_KEY")
     APP_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=1440, env="APP_ACCESS_TOKEN_EXPIRE_MINUTES")
 
     # 应用配置
     APP_DEBUG: bool = Field(default=True, env="APP_DEBUG")
+    APP_WARMUP_ON_STARTUP: bool = Field(default=True, env="APP_WARMUP_ON_STARTUP")
+    APP_WARMUP_TIMEOUT_SECONDS: float = Field(default=30.0, env="APP_WARMUP_TIMEOUT_SECONDS")
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,66 @@
+"""
+数据库引擎与会话
+
+引擎按 URL 缓存，进程内共享同一个连接池；SQLite（本地测试）不使用连接池参数
+"""
+
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_engines: Dict[str, Engine] = {}
+
+
+def get_engine(url: Optional[str] = None) -> Engine:
+    """获取（或创建）连接池引擎，默认使用 settings.DB_URL"""
+    url = url or settings.DB_URL
+    if url not in _engines:
+        _engines[url] = _create_engine(url)
+    return _engines[url]
+
+
+def _create_engine(url: str) -> Engine:
+    if url.startswith('sqlite'):
+        engine = create_engine(url, echo=settings.DB_ECHO)
+
+        @event.listens_for(engine, 'connect')
+        def _sqlite_pragmas(dbapi_conn, _):
+            cursor = dbapi_conn.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.close()
+
+        return engine
+
+    return create_engine(
+        url,
+        echo=settings.DB_ECHO,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
+
+
+def get_session(url: Optional[str] = None) -> Session:
+    """新建会话，调用方负责关闭（可用 with 语句）"""
+    return sessionmaker(bind=get_engine(url), expire_on_commit=False)()
+
+
+def init_db(engine: Optional[Engine] = None):
+    """建表（已存在的表不变）"""
+    from app.domain.models.orm import Base
+    Base.metadata.create_all(engine or get_engine())
+
+
+def dispose_engines():
+    for engine in _engines.values():
+        engine.dispose()
+    _engines.clear()
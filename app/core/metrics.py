@@ -0,0 +1,271 @@
+"""
+进程内指标：延迟直方图 / 错误计数 / 返回行数，以 Prometheus 文本格式导出（/metrics）
+
+- instrument(component)：装饰数据源与服务方法，记录耗时、异常类型与返回行数
+- timer(...) / upstream(...)：单独计时每次上游调用（akshare / tushare），与 pandas 后处理区分开
+- MetricsMiddleware：按路由模板记录 HTTP 请求耗时（WebSocket 不计）
+- 缓存命中率等已有统计在抓取时由 collector 现算，不在请求路径上维护
+
+METRICS_ENABLED=false（默认）时所有记录点只做一次布尔判断即返回。
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+
+# 覆盖内存计算（毫秒级）到 akshare 全市场下载（数十秒）
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f'{self.name}{_labels(self.labelnames, k)} {_number(v)}' for k, v in items)
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [各桶计数（非累计，最后一格为 +Inf）, sum, count]
+        self._values: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *labels) -> int:
+        state = self._values.get(labels)
+        return 0 if state is None else state[2]
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+    collector 为抓取时调用的函数，返回 (指标名, 类型, 说明, [(标签 dict, 值)]) 列表，用于导出已有的统计
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f'{name}{_labels(list(labels), list(labels.values()))} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+CALL_SECONDS = registry.histogram(
+    'stock_call_duration_seconds', '数据源 / 服务方法耗时', ('component', 'method'))
+CALL_ERRORS = registry.counter(
+    'stock_call_errors_total', '数据源 / 服务方法抛出的异常数', ('component', 'method', 'error'))
+CALL_ROWS = registry.counter(
+    'stock_call_rows_total', '数据源 / 服务方法返回的行数', ('component', 'method'))
+UPSTREAM_SECONDS = registry.histogram(
+    'stock_upstream_duration_seconds', '单次上游接口调用耗时（不含本地后处理）', ('source', 'api', 'outcome'))
+HTTP_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'HTTP 请求耗时（含响应序列化）', ('method', 'route', 'status'))
+
+
+def _rows(result) -> Optional[int]:
+    if isinstance(result, (pd.DataFrame, list, tuple)):
+        return len(result)
+    if isinstance(result, dict) and isinstance(result.get('data'), (dict, list)):
+        return len(result['data'])
+    return None
+
+
+def _record(component: str, method: str, started: float, result=None, error: Optional[BaseException] = None):
+    CALL_SECONDS.observe(time.perf_counter() - started, component, method)
+    if error is not None:
+        CALL_ERRORS.inc(component, method, error.__class__.__name__)
+        return
+    rows = _rows(result)
+    if rows is not None:
+        CALL_ROWS.inc(component, method, amount=rows)
+
+
+def instrument(component: str):
+    """方法装饰器：记录耗时、异常与返回行数；支持协程与普通函数"""
+
+    def decorator(fn):
+        method = fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return await fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    _record(component, method, started, error=e)
+                    raise
+                _record(component, method, started, result)
+                return result
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not registry.enabled:
+                    return fn(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    _record(component, method, started, error=e)
+                    raise
+                _record(component, method, started, result)
+                return result
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def timer(source: str, api: str):
+    """上游调用计时：with timer('eastmoney', 'stock_zh_a_hist'): raw = ak.stock_zh_a_hist(...)"""
+    if not registry.enabled:
+        yield
+        return
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        UPSTREAM_SECONDS.observe(time.perf_counter() - started, source, api, outcome)
+
+
+def upstream(source: str, fn: Callable) -> Callable:
+    """包装交给线程池执行的上游函数：executor.run(upstream('tushare', self.pro.daily), **kwargs)"""
+    # tushare pro 接口是 partial(query, api_name)
+    api = fn.args[0] if isinstance(fn, functools.partial) and fn.args else getattr(fn, '__name__', repr(fn))
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with timer(source, api):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """
+    ASGI 中间件：按路由模板（如 /api/v1/stocks/{symbol}/kline）记录耗时，避免按具体路径产生海量标签
+    只统计 http 请求；流式响应计到响应结束
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            path = getattr(route, 'path', None) or 'unmatched'
+            HTTP_SECONDS.observe(time.perf_counter() - started, scope['method'], path, str(status[0]))
@@ -0,0 +1,64 @@
+"""
+进程内周期任务：在事件循环上按固定间隔执行协程，由 app lifespan 启停
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    周期任务
+    :param name: 任务名（日志用）
+    :param interval: 两次执行之间的间隔秒数
+    :param func: 无参协程函数；抛出的异常只记录日志，不会终止任务
+    :param initial_delay: 启动后多久执行第一次（秒），默认等一个 interval；0 为立即执行
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable[None]],
+                 initial_delay: Optional[float] = None):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.initial_delay = interval if initial_delay is None else initial_delay
+        self.runs = 0
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        if self.initial_delay > 0:
+            await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                await self.func()
+                self.runs += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.failures += 1
+                logger.exception(f"周期任务 {self.name} 执行失败")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> dict:
+        return {
+            'interval': self.interval,
+            'running': self._task is not None and not self._task.done(),
+            'runs': self.runs,
+            'failures': self.failures,
+        }
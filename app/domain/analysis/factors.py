@@ -0,0 +1,222 @@
+"""
+向量化横截面因子引擎（NumPy）：在每份全市场快照上对全部股票打分
+
+输入为快照的列数组（每只股票一个值）与行业标签，输出与输入等长的数组：
+- {factor}_z        去极值 z 分数（按方向调整，越大越好；原始值先截尾到中位数 ± winsor 倍 MAD 再标准化）
+- {factor}_pct      全市场百分位（0 ~ 1，越大越好）
+- {factor}_ind_pct  行业内百分位（行业中性）
+- score / score_pct        各因子 z 分数的加权平均及其全市场百分位
+- score_ind / score_ind_pct 各因子行业内百分位的加权平均及其全市场百分位
+
+约定：
+- 没有有效报价（最新价 ≤ 0，停牌等）的股票所有因子为 NaN；
+  市盈率 / 市净率 ≤ 0（亏损或缺失）时对应因子为 NaN
+- 百分位为 (平均秩 - 1) / (有效个数 - 1)，并列取平均秩；组内只有一只股票时为 0.5；NaN 不参与排序
+- 综合分只对有效因子加权平均；全部因子都无效时为 NaN
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# MAD 换算为正态分布标准差的系数
+MAD_SCALE = 1.4826
+
+
+@dataclass(frozen=True)
+class Factor:
+    """单因子：快照列 → 变换 → 方向"""
+    column: str
+    transform: Optional[str]  # None / 'log' / 'inverse'
+    direction: int            # 1 越大越好，-1 越小越好
+    description: str
+
+
+FACTORS: Dict[str, Factor] = {
+    'ep': Factor('pe_ratio', 'inverse', 1, '盈利收益率 1/PE（估值越低越好）'),
+    'bp': Factor('pb_ratio', 'inverse', 1, '账面市值比 1/PB（估值越低越好）'),
+    'size': Factor('market_cap', 'log', -1, '对数总市值（小市值得分高）'),
+    'momentum': Factor('change_percent', None, 1, '当日涨跌幅'),
+    'turnover': Factor('turnover_rate', 'log', -1, '对数换手率（低换手得分高）'),
+}
+
+# 快照中计算因子需要的列
+FACTOR_INPUTS = ('current_price',) + tuple(dict.fromkeys(f.column for f in FACTORS.values()))
+
+
+# ------------ 基础算子 ------------
+def _transform(values: np.ndarray, transform: Optional[str]) -> np.ndarray:
+    values = np.asarray(values, dtype='float64')
+    if transform is None:
+        return values.copy()
+    positive = values > 0
+    out = np.full_like(values, np.nan)
+    if transform == 'log':
+        np.log(values, out=out, where=positive)
+    elif transform == 'inverse':
+        np.divide(1.0, values, out=out, where=positive)
+    else:
+        raise ValueError(f"不支持的因子变换: {transform}")
+    return out
+
+
+def winsorize(values: np.ndarray, k: float = 3.0) -> np.ndarray:
+    """截尾到 中位数 ± k × MAD（MAD 按 MAD_SCALE 换算为标准差口径）；MAD 为 0 时不截尾"""
+    median = np.median(values)
+    mad = np.median(np.abs(values - median)) * MAD_SCALE
+    if mad == 0:
+        return values
+    return np.clip(values, median - k * mad, median + k * mad)
+
+
+def zscore(values: np.ndarray, winsor: float = 3.0) -> np.ndarray:
+    """
+    全市场 z 分数：先按 winsorize(k=winsor) 截尾，再用截尾后的均值 / 标准差标准化，
+    极端值不会拉大标准差、压扁其余股票的分数；有效值少于 2 个或方差为 0 时为 0（NaN 保持 NaN）
+    """
+    valid = ~np.isnan(values)
+    out = np.full_like(values, np.nan)
+    if valid.sum() < 2:
+        out[valid] = 0.0
+        return out
+    x = winsorize(values[valid], winsor)
+    std = x.std()
+    out[valid] = (x - x.mean()) / std if std > 0 else 0.0
+    return out
+
+
+def group_percentile(values: np.ndarray, groups: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    组内百分位（并列取平均秩）；groups 为 None 时为全市场百分位
+    :param groups: 与 values 等长的整数组号
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if valid.size == 0:
+        return out
+    x = values[valid]
+    g = np.zeros(valid.size, dtype=np.int64) if groups is None else np.asarray(groups)[valid]
+
+    order = np.lexsort((x, g))
+    xs, gs = x[order], g[order]
+    # 组边界与组内位置（1 起）
+    new_group = np.empty(valid.size, dtype=bool)
+    new_group[0] = True
+    new_group[1:] = gs[1:] != gs[:-1]
+    starts = np.flatnonzero(new_group)
+    sizes = np.diff(np.append(starts, valid.size))
+    group_id = np.cumsum(new_group) - 1
+    position = np.arange(valid.size) - starts[group_id] + 1
+    # 并列值（同组同值）取平均秩
+    new_run = new_group.copy()
+    new_run[1:] |= xs[1:] != xs[:-1]
+    run_id = np.cumsum(new_run) - 1
+    avg_rank = (np.bincount(run_id, weights=position) / np.bincount(run_id))[run_id]
+
+    size = sizes[group_id]
+    pct = np.where(size > 1, (avg_rank - 1) / np.maximum(size - 1, 1), 0.5)
+    out[valid[order]] = pct
+    return out
+
+
+def weighted_mean(columns: List[np.ndarray], weights: List[float]) -> np.ndarray:
+    """按列加权平均，跳过 NaN；所有列都是 NaN 的位置为 NaN"""
+    values = np.vstack(columns)
+    w = np.asarray(weights, dtype='float64')[:, np.newaxis] * ~np.isnan(values)
+    total = w.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, np.nansum(values * w, axis=0) / total, np.nan)
+
+
+# ------------ 引擎 ------------
+class FactorEngine:
+    """横截面因子引擎"""
+
+    def __init__(self, factors: Optional[Mapping[str, Factor]] = None,
+                 weights: Optional[Mapping[str, float]] = None, winsor: float = 3.0):
+        self.factors = dict(factors or FACTORS)
+        self.weights = self.resolve_weights(weights)
+        self.winsor = winsor
+
+    def columns(self) -> List[str]:
+        cols = []
+        for name in self.factors:
+            cols += [f'{name}_z', f'{name}_pct', f'{name}_ind_pct']
+        return cols + ['score', 'score_pct', 'score_ind', 'score_ind_pct']
+
+    def resolve_weights(self, weights: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        """综合分权重；未给出时各因子等权，只给出部分时其余因子权重为 0；权重须为有限的非负数"""
+        if not weights:
+            return {name: 1.0 for name in self.factors}
+        unknown = set(weights) - set(self.factors)
+        if unknown:
+            raise ValueError(f"不支持的因子: {', '.join(sorted(unknown))}")
+        invalid = [name for name, w in weights.items() if not math.isfinite(w) or w < 0]
+        if invalid:
+            raise ValueError(f"因子权重须为有限的非负数: {', '.join(sorted(invalid))}")
+        if not any(w > 0 for w in weights.values()):
+            raise ValueError("因子权重至少要有一个大于 0")
+        return {name: float(weights.get(name, 0.0)) for name in self.factors}
+
+    @staticmethod
+    def parse_weights(text: Optional[str]) -> Optional[Dict[str, float]]:
+        """'ep:2,size:1' → {'ep': 2.0, 'size': 1.0}；只写因子名时权重为 1"""
+        if not text:
+            return None
+        weights = {}
+        for item in text.split(','):
+            name, _, weight = item.strip().partition(':')
+            if not name:
+                continue
+            try:
+                value = float(weight) if weight else 1.0
+            except ValueError:
+                raise ValueError(f"因子权重不是数字: {item}")
+            # float() 接受 'nan' / 'inf' / 负数，这里一并拒绝
+            if not math.isfinite(value) or value < 0:
+                raise ValueError(f"因子权重须为有限的非负数: {item}")
+            weights[name] = value
+        return weights
+
+    def compute(self, data: Mapping[str, np.ndarray], industries: Optional[Iterable[str]] = None
+                ) -> Dict[str, np.ndarray]:
+        """
+        :param data: 快照列数组（至少包含 FACTOR_INPUTS），各列等长
+        :param industries: 行业标签，缺省或为空串时归入同一组“未分类”
+        :return: {列名: 数组}，列见 columns()
+        """
+        price = np.asarray(data['current_price'], dtype='float64')
+        quoted = price > 0
+        groups = None
+        if industries is not None:
+            _, groups = np.unique(np.asarray(list(industries), dtype=object).astype(str), return_inverse=True)
+
+        out: Dict[str, np.ndarray] = {}
+        for name, factor in self.factors.items():
+            values = _transform(data[factor.column], factor.transform) * factor.direction
+            values[~quoted] = np.nan
+            out[f'{name}_z'] = zscore(values, self.winsor)
+            out[f'{name}_pct'] = group_percentile(values)
+            out[f'{name}_ind_pct'] = group_percentile(values, groups) if groups is not None else out[f'{name}_pct']
+        out.update(self.composite(out))
+        return out
+
+    def composite(self, scores: Mapping[str, np.ndarray],
+                  weights: Optional[Mapping[str, float]] = None) -> Dict[str, np.ndarray]:
+        """由各因子的 z 分数 / 行业内百分位重新计算综合分（改权重时不必重算因子）"""
+        weights = self.resolve_weights(weights) if weights else self.weights
+        names = [name for name, w in weights.items() if w > 0]
+        w = [weights[name] for name in names]
+        score = weighted_mean([scores[f'{name}_z'] for name in names], w)
+        score_ind = weighted_mean([scores[f'{name}_ind_pct'] for name in names], w)
+        return {
+            'score': score, 'score_pct': group_percentile(score),
+            'score_ind': score_ind, 'score_ind_pct': group_percentile(score_ind),
+        }
+
+    def describe(self) -> List[Tuple[str, str, float]]:
+        """[(因子名, 说明, 权重)]"""
+        return [(name, f.description, self.weights[name]) for name, f in self.factors.items()]
@@ -0,0 +1,347 @@
+"""
+向量化技术指标引擎（NumPy）
+
+输入为 K 线数组，形状 (n_bars,) 或 (n_symbols, n_bars)，沿最后一维按时间计算，
+多只股票一次批量完成；历史不足的位置为 NaN（不同股票可在开头用 NaN 补齐对齐）。
+
+支持: MA / EMA / MACD / RSI / BOLL / KDJ / ATR
+- 批量：IndicatorEngine.compute(high, low, close)
+- 增量：IndicatorEngine.init_state(...) 之后，每来一根新 K 线调用 update(state, ...)，
+  只用保存的递推状态和最近窗口计算，不回算全部历史
+
+约定（与常见行情软件一致）：
+- EMA 以第一个有效值为初值，alpha = 2 / (n + 1)
+- MACD: DIF = EMA12 - EMA26, DEA = EMA9(DIF), 柱 = 2 * (DIF - DEA)
+- RSI / ATR 使用 Wilder 平滑 (alpha = 1 / n)
+- BOLL 使用总体标准差 (ddof=0)
+- KDJ: K、D 以 50 为初值按 1/3 平滑 RSV；最高价等于最低价时 RSV 记为 50
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 指标组 → 输出列
+INDICATOR_GROUPS = ('ma', 'ema', 'macd', 'rsi', 'boll', 'kdj', 'atr')
+
+
+# ------------ 基础算子 ------------
+def _as_2d(x) -> np.ndarray:
+    arr = np.asarray(x, dtype='float64')
+    return arr[np.newaxis, :] if arr.ndim == 1 else arr
+
+
+def sma(x: np.ndarray, n: int) -> np.ndarray:
+    """简单移动平均（窗口内含 NaN 时为 NaN）"""
+    x = _as_2d(x)
+    out = np.full_like(x, np.nan)
+    if x.shape[-1] < n:
+        return out
+    nan_mask = np.isnan(x)
+    has_nan = nan_mask.any()
+    csum = np.cumsum(np.where(nan_mask, 0.0, x) if has_nan else x, axis=-1)
+    window_sum = csum[..., n - 1:]
+    window_sum[..., 1:] -= csum[..., :-n]
+    out[..., n - 1:] = window_sum / n
+    if has_nan:
+        nan_count = np.cumsum(nan_mask, axis=-1, dtype=np.int32)
+        window_nan = nan_count[..., n - 1:]
+        window_nan[..., 1:] -= nan_count[..., :-n]
+        out[..., n - 1:][window_nan > 0] = np.nan
+    return out
+
+
+def rolling_std(x: np.ndarray, n: int) -> np.ndarray:
+    """滚动总体标准差"""
+    mean = sma(x, n)
+    mean_sq = sma(np.square(_as_2d(x)), n)
+    return np.sqrt(np.clip(mean_sq - np.square(mean), 0.0, None))
+
+
+def _rolling_extreme(x: np.ndarray, n: int, fn) -> np.ndarray:
+    """滚动极值：n 次错位比较，每次都是整块向量运算"""
+    x = _as_2d(x)
+    out = np.full_like(x, np.nan)
+    if x.shape[-1] < n:
+        return out
+    length = x.shape[-1] - n + 1
+    result = x[..., n - 1:].copy()
+    for k in range(1, n):
+        fn(result, x[..., n - 1 - k:n - 1 - k + length], out=result)
+    out[..., n - 1:] = result
+    return out
+
+
+def rolling_max(x: np.ndarray, n: int) -> np.ndarray:
+    return _rolling_extreme(x, n, np.maximum)
+
+
+def rolling_min(x: np.ndarray, n: int) -> np.ndarray:
+    return _rolling_extreme(x, n, np.minimum)
+
+
+def _ewm_step(state: np.ndarray, x: np.ndarray, alpha: float, init: Optional[np.ndarray] = None) -> np.ndarray:
+    """一步指数平滑：state 为 NaN 时以 x（或 init）为初值，x 为 NaN 时保持不变"""
+    start = x if init is None else np.where(np.isnan(x), np.nan, init + alpha * (x - init))
+    return np.where(
+        np.isnan(state), start,
+        np.where(np.isnan(x), state, state + alpha * (x - state))
+    )
+
+
+def ewm(x: np.ndarray, alpha: float, init: Optional[float] = None) -> np.ndarray:
+    """沿时间的指数平滑，逐根递推、跨股票向量化"""
+    x = _as_2d(x)
+    # 转为时间优先的连续内存，每一步递推都是一段连续向量
+    series = np.ascontiguousarray(np.moveaxis(x, -1, 0))
+    out = np.empty_like(series)
+    if init is None and not np.isnan(series).any():
+        out[0] = series[0]
+        for t in range(1, len(series)):
+            np.subtract(series[t], out[t - 1], out=out[t])
+            out[t] *= alpha
+            out[t] += out[t - 1]
+    else:
+        state = np.full(series.shape[1:], np.nan)
+        init_arr = None if init is None else np.full(series.shape[1:], init)
+        for t in range(len(series)):
+            state = _ewm_step(state, series[t], alpha, init_arr)
+            out[t] = state
+    return np.ascontiguousarray(np.moveaxis(out, 0, -1))
+
+
+def ema(x: np.ndarray, n: int) -> np.ndarray:
+    return ewm(x, 2.0 / (n + 1))
+
+
+def _prev(x: np.ndarray) -> np.ndarray:
+    prev = np.full_like(x, np.nan)
+    prev[..., 1:] = x[..., :-1]
+    return prev
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = _prev(close)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.where(np.isnan(prev_close), high - low, tr)
+
+
+def _rsi_from_avgs(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where((avg_loss == 0) & ~np.isnan(avg_gain), 100.0, rsi)
+
+
+def _rsv(close: np.ndarray, hhv: np.ndarray, llv: np.ndarray) -> np.ndarray:
+    span = hhv - llv
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsv = (close - llv) / span * 100.0
+    return np.where(span == 0, 50.0, rsv)
+
+
+# ------------ 引擎 ------------
+@dataclass
+class IndicatorState:
+    """增量更新所需状态，每个数组形状为 (n_symbols,) 或 (n_symbols, window)"""
+    close_window: np.ndarray
+    high_window: np.ndarray
+    low_window: np.ndarray
+    ema: Dict[int, np.ndarray] = field(default_factory=dict)
+    macd_dea: Optional[np.ndarray] = None
+    rsi_gain: Optional[np.ndarray] = None
+    rsi_loss: Optional[np.ndarray] = None
+    atr: Optional[np.ndarray] = None
+    kdj_k: Optional[np.ndarray] = None
+    kdj_d: Optional[np.ndarray] = None
+    bars: int = 0
+
+
+class IndicatorEngine:
+    """技术指标引擎：批量计算 + 增量更新"""
+
+    def __init__(
+        self,
+        ma_periods: Sequence[int] = (5, 10, 20, 60),
+        ema_periods: Sequence[int] = (12, 26),
+        macd: Tuple[int, int, int] = (12, 26, 9),
+        rsi_period: int = 14,
+        boll: Tuple[int, float] = (20, 2.0),
+        kdj: Tuple[int, int, int] = (9, 3, 3),
+        atr_period: int = 14,
+    ):
+        self.ma_periods = tuple(ma_periods)
+        self.ema_periods = tuple(ema_periods)
+        self.macd_params = macd
+        self.rsi_period = rsi_period
+        self.boll_params = boll
+        self.kdj_params = kdj
+        self.atr_period = atr_period
+        self.close_window = max(self.ma_periods + (self.boll_params[0], 2))
+        self.hl_window = self.kdj_params[0]
+        # 递推类指标需要的全部 EMA 周期
+        self._ema_all = sorted(set(self.ema_periods) | {macd[0], macd[1]})
+
+    # ------------ 输出列 ------------
+    def columns(self, groups: Optional[Iterable[str]] = None) -> List[str]:
+        groups = self.resolve_groups(groups)
+        cols = []
+        for group in INDICATOR_GROUPS:
+            if group not in groups:
+                continue
+            if group == 'ma':
+                cols += [f'ma{n}' for n in self.ma_periods]
+            elif group == 'ema':
+                cols += [f'ema{n}' for n in self.ema_periods]
+            elif group == 'macd':
+                cols += ['macd_dif', 'macd_dea', 'macd_hist']
+            elif group == 'rsi':
+                cols += [f'rsi{self.rsi_period}']
+            elif group == 'boll':
+                cols += ['boll_mid', 'boll_upper', 'boll_lower']
+            elif group == 'kdj':
+                cols += ['kdj_k', 'kdj_d', 'kdj_j']
+            elif group == 'atr':
+                cols += [f'atr{self.atr_period}']
+        return cols
+
+    @staticmethod
+    def resolve_groups(groups: Optional[Iterable[str]] = None) -> Tuple[str, ...]:
+        if groups is None:
+            return INDICATOR_GROUPS
+        groups = tuple(g.strip().lower() for g in groups if g and g.strip())
+        unknown = set(groups) - set(INDICATOR_GROUPS)
+        if unknown:
+            raise ValueError(f"不支持的指标: {', '.join(sorted(unknown))}")
+        return groups
+
+    # ------------ 批量 ------------
+    def compute(self, high, low, close, groups: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        批量计算整段历史
+        :return: {列名: 与输入同形状的数组}
+        """
+        squeeze = np.asarray(close).ndim == 1
+        out, _ = self._run(_as_2d(high), _as_2d(low), _as_2d(close), self.resolve_groups(groups))
+        return {k: (v[0] if squeeze else v) for k, v in out.items()}
+
+    def init_state(self, high, low, close) -> Tuple[Dict[str, np.ndarray], IndicatorState]:
+        """批量计算全部指标，并返回后续增量更新所需的状态"""
+        return self._run(_as_2d(high), _as_2d(low), _as_2d(close), INDICATOR_GROUPS, keep_state=True)
+
+    def _run(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, groups: Tuple[str, ...],
+             keep_state: bool = False) -> Tuple[Dict[str, np.ndarray], Optional[IndicatorState]]:
+        out: Dict[str, np.ndarray] = {}
+        state = None
+        if keep_state:
+            state = IndicatorState(
+                close_window=self._tail_window(close, self.close_window),
+                high_window=self._tail_window(high, self.hl_window),
+                low_window=self._tail_window(low, self.hl_window),
+                bars=close.shape[-1],
+            )
+
+        need_ema = 'ema' in groups or 'macd' in groups
+        emas = {n: ema(close, n) for n in self._ema_all} if need_ema else {}
+
+        if 'ma' in groups:
+            for n in self.ma_periods:
+                out[f'ma{n}'] = sma(close, n)
+        if 'ema' in groups:
+            for n in self.ema_periods:
+                out[f'ema{n}'] = emas[n]
+        if 'macd' in groups:
+            fast, slow, signal = self.macd_params
+            dif = emas[fast] - emas[slow]
+            dea = ema(dif, signal)
+            out['macd_dif'], out['macd_dea'], out['macd_hist'] = dif, dea, 2.0 * (dif - dea)
+            if state is not None:
+                state.macd_dea = dea[..., -1].copy()
+        if 'rsi' in groups:
+            change = close - _prev(close)
+            alpha = 1.0 / self.rsi_period
+            avg_gain = ewm(np.where(np.isnan(change), np.nan, np.clip(change, 0, None)), alpha)
+            avg_loss = ewm(np.where(np.isnan(change), np.nan, np.clip(-change, 0, None)), alpha)
+            out[f'rsi{self.rsi_period}'] = _rsi_from_avgs(avg_gain, avg_loss)
+            if state is not None:
+                state.rsi_gain, state.rsi_loss = avg_gain[..., -1].copy(), avg_loss[..., -1].copy()
+        if 'boll' in groups:
+            n, k = self.boll_params
+            mid, std = sma(close, n), rolling_std(close, n)
+            out['boll_mid'], out['boll_upper'], out['boll_lower'] = mid, mid + k * std, mid - k * std
+        if 'kdj' in groups:
+            n, m1, m2 = self.kdj_params
+            rsv = _rsv(close, rolling_max(high, n), rolling_min(low, n))
+            k_line = ewm(rsv, 1.0 / m1, init=50.0)
+            d_line = ewm(k_line, 1.0 / m2, init=50.0)
+            out['kdj_k'], out['kdj_d'], out['kdj_j'] = k_line, d_line, 3.0 * k_line - 2.0 * d_line
+            if state is not None:
+                state.kdj_k, state.kdj_d = k_line[..., -1].copy(), d_line[..., -1].copy()
+        if 'atr' in groups:
+            atr_line = ewm(true_range(high, low, close), 1.0 / self.atr_period)
+            out[f'atr{self.atr_period}'] = atr_line
+            if state is not None:
+                state.atr = atr_line[..., -1].copy()
+
+        if state is not None:
+            state.ema = {n: emas[n][..., -1].copy() for n in self._ema_all}
+        return out, state
+
+    @staticmethod
+    def _tail_window(x: np.ndarray, n: int) -> np.ndarray:
+        window = np.full(x.shape[:-1] + (n,), np.nan)
+        tail = x[..., -n:]
+        window[..., n - tail.shape[-1]:] = tail
+        return window
+
+    # ------------ 增量 ------------
+    def update(self, state: IndicatorState, high, low, close) -> Dict[str, np.ndarray]:
+        """
+        每只股票追加一根新 K 线，原地更新 state
+        :param high/low/close: 形状 (n_symbols,)
+        :return: {列名: 新 K 线上的指标值，形状 (n_symbols,)}
+        """
+        high, low, close = (np.asarray(v, dtype='float64') for v in (high, low, close))
+        prev_close = state.close_window[..., -1].copy()
+
+        for window, value in ((state.close_window, close), (state.high_window, high), (state.low_window, low)):
+            window[..., :-1] = window[..., 1:]
+            window[..., -1] = value
+        state.bars += 1
+
+        out: Dict[str, np.ndarray] = {}
+        for n in self.ma_periods:
+            out[f'ma{n}'] = state.close_window[..., -n:].mean(axis=-1)
+
+        for n in self._ema_all:
+            state.ema[n] = _ewm_step(state.ema[n], close, 2.0 / (n + 1))
+        for n in self.ema_periods:
+            out[f'ema{n}'] = state.ema[n]
+
+        fast, slow, signal = self.macd_params
+        dif = state.ema[fast] - state.ema[slow]
+        state.macd_dea = _ewm_step(state.macd_dea, dif, 2.0 / (signal + 1))
+        out['macd_dif'], out['macd_dea'], out['macd_hist'] = dif, state.macd_dea, 2.0 * (dif - state.macd_dea)
+
+        change = close - prev_close
+        alpha = 1.0 / self.rsi_period
+        state.rsi_gain = _ewm_step(state.rsi_gain, np.where(np.isnan(change), np.nan, np.clip(change, 0, None)), alpha)
+        state.rsi_loss = _ewm_step(state.rsi_loss, np.where(np.isnan(change), np.nan, np.clip(-change, 0, None)), alpha)
+        out[f'rsi{self.rsi_period}'] = _rsi_from_avgs(state.rsi_gain, state.rsi_loss)
+
+        n, k = self.boll_params
+        recent = state.close_window[..., -n:]
+        mid, std = recent.mean(axis=-1), recent.std(axis=-1)
+        out['boll_mid'], out['boll_upper'], out['boll_lower'] = mid, mid + k * std, mid - k * std
+
+        n, m1, m2 = self.kdj_params
+        rsv = _rsv(close, state.high_window.max(axis=-1), state.low_window.min(axis=-1))
+        state.kdj_k = _ewm_step(state.kdj_k, rsv, 1.0 / m1, np.full_like(rsv, 50.0))
+        state.kdj_d = _ewm_step(state.kdj_d, state.kdj_k, 1.0 / m2, np.full_like(rsv, 50.0))
+        out['kdj_k'], out['kdj_d'], out['kdj_j'] = state.kdj_k, state.kdj_d, 3.0 * state.kdj_k - 2.0 * state.kdj_d
+
+        tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        tr = np.where(np.isnan(prev_close), high - low, tr)
+        state.atr = _ewm_step(state.atr, tr, 1.0 / self.atr_period)
+        out[f'atr{self.atr_period}'] = state.atr
+        return out
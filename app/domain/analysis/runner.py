@@ -0,0 +1,201 @@
+"""
+全市场分析任务：多进程分片 + 共享只读价格矩阵 + 分片级断点续跑 + 单个列式结果文件
+
+运行目录结构::
+
+    {output_dir}/{run_id}/manifest.json          # 股票列表、参数与数据指纹，续跑时校验
+    {output_dir}/{run_id}/prices.npy             # (4, n_symbols, bars) 的 high/low/close/volume
+    {output_dir}/{run_id}/shards/00000.parquet   # 每个分片完成后原子写入
+    {output_dir}/{run_id}/analysis.parquet       # 最终合并结果
+
+价格矩阵写成 .npy 后由各进程以只读 mmap 方式打开，操作系统页缓存在进程间共享，
+不需要把 DataFrame pickle 给子进程；子进程只收到 (文件路径, 行区间)。
+
+数据指纹为各股票同步水位（last_date）的摘要：同一 run_id 之后本地日线有更新时（如同一天先同步再重跑），
+已完成的分片作废并重新计算，不会返回旧结果。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.domain.analysis.indicators import IndicatorEngine
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+logger = logging.getLogger(__name__)
+
+PRICE_FIELDS = ('high', 'low', 'close', 'volume')
+
+
+# ------------ 子进程 ------------
+def analyze_shard(run_dir: str, shard: int, start: int, end: int) -> Tuple[int, int]:
+    """
+    分析 [start, end) 行的股票并写出分片结果（在子进程中执行）
+    :return: (分片号, 行数)
+    """
+    run_path = Path(run_dir)
+    manifest = json.loads((run_path / 'manifest.json').read_text(encoding='utf-8'))
+    prices = np.load(run_path / 'prices.npy', mmap_mode='r')
+    high, low, close, volume = (np.asarray(prices[i, start:end]) for i in range(len(PRICE_FIELDS)))
+
+    engine = IndicatorEngine()
+    values = engine.compute(high, low, close)
+
+    last, prev = _values_at(values, -1), _values_at(values, -2)
+    frame = pd.DataFrame({
+        'symbol': manifest['symbols'][start:end],
+        'last_date': manifest['last_dates'][start:end],
+        'close': close[:, -1],
+        'volume': volume[:, -1],
+        'bars': np.count_nonzero(~np.isnan(close), axis=-1),
+        **last,
+    })
+    frame['ma_golden_cross'] = (prev['ma5'] <= prev['ma20']) & (last['ma5'] > last['ma20'])
+    frame['ma_death_cross'] = (prev['ma5'] >= prev['ma20']) & (last['ma5'] < last['ma20'])
+    frame['macd_golden_cross'] = (prev['macd_dif'] <= prev['macd_dea']) & (last['macd_dif'] > last['macd_dea'])
+    frame['rsi_oversold'] = last['rsi14'] < 30
+    frame['rsi_overbought'] = last['rsi14'] > 70
+    frame['boll_breakout'] = close[:, -1] > last['boll_upper']
+
+    shard_dir = run_path / 'shards'
+    shard_dir.mkdir(exist_ok=True)
+    tmp = shard_dir / f'{shard:05d}.parquet.tmp'
+    frame.to_parquet(tmp, index=False)
+    os.replace(tmp, shard_dir / f'{shard:05d}.parquet')
+    return shard, len(frame)
+
+
+def _values_at(values: Dict[str, np.ndarray], t: int) -> Dict[str, np.ndarray]:
+    return {name: arr[:, t] for name, arr in values.items()}
+
+
+# ------------ 主进程 ------------
+class AnalysisRunner:
+    """
+    全市场分析
+    :param store: 本地日线存储（价格来源）
+    :param output_dir: 运行目录的父目录
+    :param workers: 进程数，默认 CPU 核数
+    :param shard_size: 每个分片的股票数
+    :param bars: 每只股票参与计算的最近 K 线根数
+    """
+
+    def __init__(self, store: KLineStore, output_dir: str, workers: Optional[int] = None,
+                 shard_size: int = 250, bars: int = 500):
+        self.store = store
+        self.output_dir = Path(output_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.bars = bars
+
+    def run(self, symbols: Sequence[str], run_id: Optional[str] = None) -> Dict[str, object]:
+        """
+        运行（或续跑）一次全市场分析
+        :param run_id: 相同 run_id 且本地日线未更新时，跳过已完成的分片
+        :return: 运行摘要
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d')
+        run_dir = self.output_dir / run_id
+        run_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+
+        manifest = self._prepare(run_dir, list(dict.fromkeys(symbols)))
+        n = len(manifest['symbols'])
+        shards = [(i, start, min(start + self.shard_size, n))
+                  for i, start in enumerate(range(0, n, self.shard_size))]
+        done = {int(p.stem) for p in (run_dir / 'shards').glob('*.parquet')} if (run_dir / 'shards').exists() else set()
+        pending = [s for s in shards if s[0] not in done]
+        logger.info(f"分析任务 {run_id}: {n} 只股票, {len(shards)} 个分片, 待计算 {len(pending)}")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [pool.submit(analyze_shard, str(run_dir), *spec) for spec in pending]
+                for future in as_completed(futures):
+                    shard, rows = future.result()
+                    logger.info(f"分片 {shard} 完成，{rows} 只")
+
+        output = run_dir / 'analysis.parquet'
+        shard_files = sorted((run_dir / 'shards').glob('*.parquet')) if shards else []
+        result = pd.concat([pd.read_parquet(p) for p in shard_files], ignore_index=True) if shard_files \
+            else pd.DataFrame(columns=['symbol'])
+        tmp = run_dir / 'analysis.parquet.tmp'
+        result.to_parquet(tmp, index=False)
+        os.replace(tmp, output)
+
+        return {
+            'run_id': run_id,
+            'output': str(output),
+            'symbols': n,
+            'shards': len(shards),
+            'computed_shards': len(pending),
+            'seconds': round(time.perf_counter() - started, 3),
+        }
+
+    # ------------ 准备共享价格矩阵 ------------
+    def _prepare(self, run_dir: Path, symbols: List[str]) -> dict:
+        manifest_path = run_dir / 'manifest.json'
+        prices_path = run_dir / 'prices.npy'
+        fingerprint = self._fingerprint(symbols)
+        if manifest_path.exists() and prices_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if manifest['requested'] != symbols or manifest['bars'] != self.bars \
+                    or manifest['shard_size'] != self.shard_size:
+                raise ValueError(f"运行目录 {run_dir} 已存在且参数不同，请更换 run_id")
+            if manifest.get('fingerprint') == fingerprint:
+                return manifest
+            logger.warning(f"运行目录 {run_dir} 创建后本地日线已更新，丢弃已完成的分片并重新计算")
+            shutil.rmtree(run_dir / 'shards', ignore_errors=True)
+            (run_dir / 'analysis.parquet').unlink(missing_ok=True)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            frames = list(pool.map(self._load_tail, symbols))
+        loaded = [(s, f) for s, f in zip(symbols, frames) if not f.empty]
+
+        prices = np.lib.format.open_memmap(
+            str(run_dir / 'prices.npy.tmp'), mode='w+', dtype='float64',
+            shape=(len(PRICE_FIELDS), len(loaded), self.bars)
+        )
+        prices[:] = np.nan
+        last_dates = []
+        for row, (_, frame) in enumerate(loaded):
+            k = len(frame)
+            for i, field in enumerate(PRICE_FIELDS):
+                prices[i, row, self.bars - k:] = frame[field].to_numpy(dtype='float64')
+            last_dates.append(pd.Timestamp(frame['date'].iloc[-1]).strftime('%Y-%m-%d'))
+        prices.flush()
+        del prices
+        os.replace(run_dir / 'prices.npy.tmp', prices_path)
+
+        manifest = {
+            'requested': symbols,
+            'symbols': [s for s, _ in loaded],
+            'last_dates': last_dates,
+            'bars': self.bars,
+            'shard_size': self.shard_size,
+            'fingerprint': fingerprint,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        tmp = run_dir / 'manifest.json.tmp'
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, manifest_path)
+        return manifest
+
+    def _fingerprint(self, symbols: List[str]) -> str:
+        """本地日线的数据指纹：各股票同步水位 last_date 的摘要"""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            watermarks = list(pool.map(self.store.get_watermark, symbols))
+        text = '|'.join(f"{s}:{w['last_date'] if w else ''}" for s, w in zip(symbols, watermarks))
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def _load_tail(self, symbol: str) -> pd.DataFrame:
+        return self.store.read(symbol).tail(self.bars)
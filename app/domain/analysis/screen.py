@@ -0,0 +1,121 @@
+"""
+横截面选股：股票池 + 实时快照 + 财务合并为一张全市场宽表，所有条件整列向量化求值
+
+    filters = parse_filters({'pe_ratio_lt': '15', 'roe_gt': '0.1'}, SCREEN_FIELDS)
+    page, total = screen(frame, filters, industry=['银行'], sort='roe', limit=50)
+
+- 条件写法 {字段}_{lt|le|gt|ge}=数值，多个条件取交集；pe / pb 为 pe_ratio / pb_ratio 的简写
+- 比例字段（roe、毛利率、同比增长）为小数：roe_gt=0.1 即 ROE > 10%
+- 财务字段为年初至今累计值，所有股票取同一报告期：默认为披露较全的最近一期（latest_covered_period），
+  避免一只股票的一季报 ROE 与另一只的年报 ROE 相比
+- 缺失值（NaN）不满足任何数值条件；市盈率 / 市净率 ≤ 0（亏损或缺失）记为 NaN
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.storage.financial_store import latest_covered_period
+
+UNIVERSE_FIELDS = ['symbol', 'name', 'exchange', 'industry', 'market_type']
+SNAPSHOT_FIELDS = ['current_price', 'change_percent', 'turnover_rate', 'pe_ratio', 'pb_ratio',
+                   'market_cap', 'circulating_market_cap']
+FINANCIAL_FIELDS = ['eps', 'revenue', 'revenue_yoy', 'net_profit', 'net_profit_yoy', 'bvps', 'roe', 'ocfps',
+                    'gross_margin']
+SCREEN_FIELDS = SNAPSHOT_FIELDS + FINANCIAL_FIELDS
+SCREEN_COLUMNS = UNIVERSE_FIELDS + SNAPSHOT_FIELDS + ['report_date'] + FINANCIAL_FIELDS
+
+SCREEN_OPERATORS = {'lt': np.less, 'le': np.less_equal, 'gt': np.greater, 'ge': np.greater_equal}
+FIELD_ALIASES = {'pe': 'pe_ratio', 'pb': 'pb_ratio'}
+
+
+@dataclass(frozen=True)
+class ScreenFilter:
+    """单个数值条件：field op value"""
+    field: str
+    op: str
+    value: float
+
+    def mask(self, frame: pd.DataFrame) -> np.ndarray:
+        values = frame[self.field].to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            return SCREEN_OPERATORS[self.op](values, self.value)
+
+
+def parse_filters(params: Mapping[str, str], fields: Iterable[str] = SCREEN_FIELDS) -> List[ScreenFilter]:
+    """
+    从查询参数中取出 {字段}_{op} 形式的条件；其它参数忽略
+    字段不支持或数值无法解析时抛 ValueError
+    """
+    fields = set(fields)
+    filters = []
+    for key, value in params.items():
+        name, _, op = key.rpartition('_')
+        if not name or op not in SCREEN_OPERATORS:
+            continue
+        name = FIELD_ALIASES.get(name, name)
+        if name not in fields:
+            raise ValueError(f"不支持的筛选字段: {key}")
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"筛选条件 {key} 的值不是数字: {value}")
+        filters.append(ScreenFilter(name, op, number))
+    return filters
+
+
+def build_screen_frame(universe: pd.DataFrame, snapshot: pd.DataFrame, financials: pd.DataFrame,
+                       period: Optional[str] = None) -> pd.DataFrame:
+    """
+    合并为选股宽表（每只股票一行，列为 SCREEN_COLUMNS）
+    :param financials: FinancialStore.read() 的全部报告期；只取 period 这一期，为空时取披露较全的最近一期
+    """
+    if universe.empty:
+        return pd.DataFrame(columns=SCREEN_COLUMNS)
+    frame = universe[UNIVERSE_FIELDS].reset_index(drop=True)
+
+    if not snapshot.empty:
+        quotes = snapshot[['symbol'] + [c for c in SNAPSHOT_FIELDS if c in snapshot.columns]]
+        frame = frame.merge(quotes, on='symbol', how='left')
+    for column in ('pe_ratio', 'pb_ratio'):
+        if column in frame.columns:
+            frame[column] = frame[column].where(frame[column] > 0)
+
+    if not financials.empty:
+        period = period or latest_covered_period(financials)
+        reports = financials[financials['report_date'] == pd.Timestamp(period)]
+        frame = frame.merge(reports[['symbol', 'report_date'] + FINANCIAL_FIELDS], on='symbol', how='left')
+
+    return frame.reindex(columns=SCREEN_COLUMNS)
+
+
+def screen(
+    frame: pd.DataFrame,
+    filters: Sequence[ScreenFilter] = (),
+    industry: Optional[Sequence[str]] = None,
+    exchange: Optional[str] = None,
+    market_type: Optional[str] = None,
+    sort: Optional[str] = None,
+    ascending: bool = False,
+    limit: int = 100,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    按条件筛选宽表
+    :return: (排序后的前 limit 行, 满足条件的总数)；sort 为空时按股票代码排序，排序字段缺失的排在最后
+    """
+    mask = np.ones(len(frame), dtype=bool)
+    for f in filters:
+        mask &= f.mask(frame)
+    if industry:
+        mask &= frame['industry'].isin(industry).to_numpy()
+    if exchange:
+        mask &= (frame['exchange'] == exchange).to_numpy()
+    if market_type:
+        mask &= (frame['market_type'] == market_type).to_numpy()
+
+    matched = frame[mask]
+    if sort:
+        matched = matched.sort_values(sort, ascending=ascending, na_position='last', kind='mergesort')
+    return matched.head(limit).reset_index(drop=True), int(mask.sum())
@@ -0,0 +1,4 @@
+from app.domain.models.orm.base import Base
+from app.domain.models.orm.stock import DailyBar, DailyBarSync, FinancialIndicator, StockBasic
+
+__all__ = ['Base', 'StockBasic', 'DailyBar', 'DailyBarSync', 'FinancialIndicator']
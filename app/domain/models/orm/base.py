@@ -0,0 +1,9 @@
+"""
+ORM 声明基类
+"""
+
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    pass
@@ -0,0 +1,68 @@
+"""
+股票相关 ORM 模型：基础信息、日线、日线同步记录、财务指标
+
+日线和财务指标使用 (symbol, 日期) 复合主键，批量 upsert 直接以主键判重
+"""
+
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Date, DateTime, Float, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.domain.models.orm.base import Base
+
+
+class StockBasic(Base):
+    """股票基础信息"""
+    __tablename__ = 'stock_basic'
+
+    symbol: Mapped[str] = mapped_column(String(10), primary_key=True, comment='股票代码')
+    name: Mapped[str] = mapped_column(String(32), comment='股票名称')
+    exchange: Mapped[Optional[str]] = mapped_column(String(8), comment='交易所')
+    industry: Mapped[Optional[str]] = mapped_column(String(64), comment='所属行业')
+    market_type: Mapped[Optional[str]] = mapped_column(String(16), comment='板块')
+    list_date: Mapped[Optional[date]] = mapped_column(Date, comment='上市日期')
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class DailyBar(Base):
+    """不复权日线"""
+    __tablename__ = 'daily_bar'
+
+    symbol: Mapped[str] = mapped_column(String(10), primary_key=True, comment='股票代码')
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True, comment='交易日')
+    open: Mapped[Optional[float]] = mapped_column(Float)
+    high: Mapped[Optional[float]] = mapped_column(Float)
+    low: Mapped[Optional[float]] = mapped_column(Float)
+    close: Mapped[Optional[float]] = mapped_column(Float)
+    volume: Mapped[Optional[float]] = mapped_column(Float, comment='成交量（手）')
+    amount: Mapped[Optional[float]] = mapped_column(Float, comment='成交额（元）')
+
+
+class DailyBarSync(Base):
+    """按日期同步过全市场日线的交易日（逐只写入的日线不算，避免一只股票的数据掩盖整日缺失）"""
+    __tablename__ = 'daily_bar_sync'
+
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True, comment='交易日')
+    rows: Mapped[int] = mapped_column(Integer, comment='写入行数')
+    synced_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class FinancialIndicator(Base):
+    """按报告期的主要财务指标"""
+    __tablename__ = 'financial_indicator'
+
+    symbol: Mapped[str] = mapped_column(String(10), primary_key=True, comment='股票代码')
+    report_date: Mapped[date] = mapped_column(Date, primary_key=True, comment='报告期')
+    announce_date: Mapped[Optional[date]] = mapped_column(Date, comment='公告日期')
+    eps: Mapped[Optional[float]] = mapped_column(Float, comment='每股收益')
+    bvps: Mapped[Optional[float]] = mapped_column(Float, comment='每股净资产')
+    roe: Mapped[Optional[float]] = mapped_column(Float, comment='净资产收益率（小数）')
+    revenue: Mapped[Optional[float]] = mapped_column(Float, comment='营业总收入')
+    revenue_yoy: Mapped[Optional[float]] = mapped_column(Float, comment='营业总收入同比（小数）')
+    net_profit: Mapped[Optional[float]] = mapped_column(Float, comment='净利润')
+    net_profit_yoy: Mapped[Optional[float]] = mapped_column(Float, comment='净利润同比（小数）')
+    gross_margin: Mapped[Optional[float]] = mapped_column(Float, comment='销售毛利率（小数）')
+    ocfps: Mapped[Optional[float]] = mapped_column(Float, comment='每股经营现金流')
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Optional, List, Dict
 from datetime import datetime, date
 
 
@@ -38,4 +38,33 @@ class StockKLineOut(BaseModel):
     low: float
     close: float
     volume_str: str
-    amount_str: str
\ No newline at end of file
+    amount_str: str
+    indicators: Optional[Dict[str, Optional[float]]] = Field(None, description="技术指标（请求 indicators 参数时返回）")
+
+
+class KLineBatchRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=500, description="股票代码列表（自动去重）")
+    freq: str = Field("daily", pattern="^(daily|weekly|monthly)$", description="K线周期")
+    limit: int = Field(30, ge=1, le=1000, description="每只股票返回条数")
+    indicators: Optional[List[str]] = Field(None, description="附带的技术指标组：ma/ema/macd/rsi/boll/kdj/atr")
+    adjust: str = Field("", pattern="^(|qfq|hfq)$", description="复权方式：空为不复权，qfq 前复权，hfq 后复权")
+
+
+class KLineBatchResponse(BaseModel):
+    data: Dict[str, List[StockKLineOut]] = Field(default_factory=dict, description="成功的股票 → K线")
+    errors: Dict[str, str] = Field(default_factory=dict, description="失败的股票 → 错误信息")
+
+
+class FactorRankResponse(BaseModel):
+    as_of: datetime = Field(..., description="计算所用快照的时间")
+    total: int = Field(..., description="参与排名的股票数")
+    count: int = Field(..., description="本次返回的股票数")
+    data: List[Dict[str, Any]] = Field(default_factory=list, description="行情字段与各因子 z 分数 / 百分位 / 综合分")
+
+
+class ScreenResponse(BaseModel):
+    period: Optional[str] = Field(None, description="所用财务报告期（YYYYMMDD）；没有财务数据时为 null")
+    total: int = Field(..., description="满足条件的股票数")
+    count: int = Field(..., description="本次返回的股票数")
+    data: List[Dict[str, Any]] = Field(default_factory=list,
+                                       description="股票池 / 行情 / 财务字段；缺失为 null，比例字段为小数")
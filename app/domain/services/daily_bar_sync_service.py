@@ -0,0 +1,65 @@
+"""
+按交易日切片的全市场日线同步
+
+一个交易日一次 pro.daily(trade_date=...) 调用拿到全市场日线，批量 upsert 到 daily_bar，
+写入成功后在 daily_bar_sync 中记下该交易日；只补没有同步记录的交易日，日常刷新只需一次调用。
+（按是否存在日线行判断会被逐只写入的个别股票掩盖，整日缺失永远补不上）
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.infrastructure.data.sources.tushare import TushareDataSource
+from app.infrastructure.db import StockRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DailyBarSyncService:
+    """
+    按日期同步日线
+    :param source: Tushare 数据源（调用经过共享令牌桶限流）
+    :param repository: 日线写入的仓储
+    :param concurrency: 同时拉取的交易日数
+    """
+
+    def __init__(self, source: TushareDataSource, repository: StockRepository, concurrency: int = 4):
+        self.source = source
+        self.repository = repository
+        self.concurrency = concurrency
+
+    async def missing_dates(self, start: date, end: date) -> List[str]:
+        """[start, end] 内还没有按日期同步过全市场日线的交易日（YYYYMMDD）"""
+        trade_dates = await self.source.get_trade_dates(start.strftime('%Y%m%d'), end.strftime('%Y%m%d'))
+        existing = await asyncio.to_thread(self.repository.get_synced_bar_dates, start, end)
+        have = {d.strftime('%Y%m%d') for d in existing}
+        return [d for d in trade_dates if d not in have]
+
+    async def backfill(self, start: date, end: Optional[date] = None) -> Dict[str, int]:
+        """
+        补齐缺失交易日的全市场日线
+        :return: 交易日 → 写入行数
+        """
+        end = end or datetime.now().date()
+        dates = await self.missing_dates(start, end)
+        logger.info(f"日线按日期同步: {start} ~ {end} 需拉取 {len(dates)} 个交易日")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def sync_one(trade_date: str) -> int:
+            async with semaphore:
+                bars = await self.source.get_daily_by_date(trade_date)
+                rows = await asyncio.to_thread(self.repository.upsert_daily_bars, bars)
+                if rows:
+                    await asyncio.to_thread(self.repository.mark_daily_bars_synced,
+                                            datetime.strptime(trade_date, '%Y%m%d').date(), rows)
+                return rows
+
+        counts = await asyncio.gather(*(sync_one(d) for d in dates))
+        return dict(zip(dates, counts))
+
+    async def sync_recent(self, days: int = 10) -> Dict[str, int]:
+        """日常刷新：补齐最近 days 个自然日内缺失的交易日"""
+        return await self.backfill(datetime.now().date() - timedelta(days=days))
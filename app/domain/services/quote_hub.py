@@ -0,0 +1,216 @@
+"""
+实时行情推送：单个后台轮询 + 按订阅分发增量
+
+- 轮询：每 QUOTE_STREAM_INTERVAL_SECONDS 读取一次全市场快照（经快照缓存，与 REST 请求共用一次上游下载），
+  没有订阅者时不回源
+- 增量：与上一帧逐列向量化比较，只推送变化的字段；每只股票的 JSON 片段每帧只编码一次，
+  各订阅者的消息由片段拼接而成，订阅者再多也不会重复序列化
+- 首帧 / 新增股票 / 消费过慢被丢弃后，发送该订阅的全量快照重新对齐
+
+消息格式（JSON 文本）::
+
+    {"type": "snapshot" | "delta", "ts": "2024-05-10 10:30:03", "data": {"000001": {"current_price": 10.5}}}
+"""
+
+import asyncio
+import json
+import logging
+import math
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+QUOTE_FIELDS = [
+    'current_price', 'change_amount', 'change_percent', 'open_price', 'high_price', 'low_price',
+    'prev_close', 'volume', 'amount', 'turnover_rate',
+]
+
+
+def _fragment(symbol: str, values: Dict[str, float]) -> str:
+    clean = {k: (None if isinstance(v, float) and math.isnan(v) else v) for k, v in values.items()}
+    return f'"{symbol}":{json.dumps(clean, separators=(",", ":"))}'
+
+
+def _message(kind: str, ts: str, fragments: Iterable[str]) -> str:
+    return f'{{"type":"{kind}","ts":"{ts}","data":{{{",".join(fragments)}}}}}'
+
+
+class QuoteSubscription:
+    """单个连接的订阅：股票集合 + 有界消息队列"""
+
+    def __init__(self, symbols: Iterable[str], queue_size: int):
+        self.symbols: Set[str] = set(symbols)
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        # 需要以全量快照重新对齐的股票（None 表示全部）
+        self.pending: Optional[Set[str]] = None
+        self.dropped = 0
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+
+class QuoteHub:
+    """
+    行情推送中心
+    :param producer: 返回全市场快照 DataFrame（含 symbol 列）的协程函数
+    :param interval: 轮询间隔秒数
+    :param queue_size: 每个订阅最多积压的消息数，超过后丢弃积压并改发全量快照
+    """
+
+    def __init__(self, producer: Callable[[], Awaitable[pd.DataFrame]], interval: float = 3.0,
+                 queue_size: int = 8, fields: Optional[List[str]] = None):
+        self.producer = producer
+        self.interval = interval
+        self.queue_size = queue_size
+        self.fields = fields or QUOTE_FIELDS
+        self._subscriptions: Set[QuoteSubscription] = set()
+        self._by_symbol: Dict[str, Set[QuoteSubscription]] = {}
+        self._last: Optional[pd.DataFrame] = None
+        self._last_ts = ''
+        self._task: Optional[asyncio.Task] = None
+        self.ticks = 0
+        self.failures = 0
+        self.messages = 0
+
+    # ------------ 订阅管理 ------------
+    def subscribe(self, symbols: Iterable[str]) -> QuoteSubscription:
+        sub = QuoteSubscription((), self.queue_size)
+        self._subscriptions.add(sub)
+        self.update(sub, add=symbols)
+        self.start()
+        return sub
+
+    def update(self, sub: QuoteSubscription, add: Iterable[str] = (), remove: Iterable[str] = ()):
+        """
+        调整订阅的股票集合；新增的股票立即（或在首帧到达时）收到快照。
+        积压被丢弃、尚待重新对齐的股票与新增的股票一起发快照，不会因为这次发送而丢掉
+        """
+        removed = set(remove) & sub.symbols
+        if sub.pending is not None:
+            sub.pending -= removed
+        for symbol in removed:
+            sub.symbols.discard(symbol)
+            subs = self._by_symbol.get(symbol)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_symbol[symbol]
+        added = set(add) - sub.symbols
+        for symbol in added:
+            sub.symbols.add(symbol)
+            self._by_symbol.setdefault(symbol, set()).add(sub)
+        if added:
+            if self._last is not None:
+                self._send_snapshot(sub, added if sub.pending is None else sub.pending | added)
+            elif sub.pending is not None:
+                sub.pending |= added
+
+    def unsubscribe(self, sub: QuoteSubscription):
+        self.update(sub, remove=list(sub.symbols))
+        self._subscriptions.discard(sub)
+        if not self._subscriptions:
+            # 无人订阅期间不轮询，旧帧作废，下一个订阅者等新帧的快照
+            self._last = None
+
+    # ------------ 生命周期 ------------
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        while True:
+            if self._subscriptions:
+                try:
+                    await self.tick()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    self.failures += 1
+                    logger.exception("行情推送轮询失败")
+            await asyncio.sleep(self.interval)
+
+    # ------------ 每帧 ------------
+    async def tick(self):
+        """拉取一帧快照，向订阅者分发增量"""
+        frame = await self.producer()
+        if frame is None or frame.empty:
+            return
+        current = (frame.drop_duplicates('symbol').set_index('symbol')
+                   .reindex(columns=self.fields).astype('float64'))
+        ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        previous, self._last, self._last_ts = self._last, current, ts
+        self.ticks += 1
+
+        # 只比较有人订阅的股票
+        watched = current.index.intersection(pd.Index(list(self._by_symbol)))
+        fragments = self._delta_fragments(current.loc[watched], previous)
+
+        parts: Dict[QuoteSubscription, List[str]] = {}
+        for symbol, fragment in fragments.items():
+            for sub in self._by_symbol.get(symbol, ()):
+                parts.setdefault(sub, []).append(fragment)
+
+        for sub in list(self._subscriptions):
+            if previous is None or sub.pending is not None:
+                self._send_snapshot(sub, sub.pending if sub.pending is not None else sub.symbols)
+            elif sub in parts:
+                self._put(sub, _message('delta', ts, parts[sub]))
+
+    def _delta_fragments(self, current: pd.DataFrame, previous: Optional[pd.DataFrame]) -> Dict[str, str]:
+        if previous is None or current.empty:
+            return {}
+        before = previous.reindex(current.index)
+        new, old = current.to_numpy(), before.to_numpy()
+        changed = (new != old) & ~(np.isnan(new) & np.isnan(old))
+        rows = np.flatnonzero(changed.any(axis=1))
+        fields = np.array(self.fields)
+        symbols = current.index
+        return {
+            symbols[i]: _fragment(symbols[i], dict(zip(fields[changed[i]], new[i, changed[i]].tolist())))
+            for i in rows
+        }
+
+    def _send_snapshot(self, sub: QuoteSubscription, symbols: Iterable[str]):
+        if self._last is None:
+            sub.pending = set(symbols) if sub.pending is None else sub.pending | set(symbols)
+            return
+        rows = self._last.reindex(self._last.index.intersection(pd.Index(list(symbols))))
+        fragments = [_fragment(symbol, dict(zip(self.fields, values)))
+                     for symbol, values in zip(rows.index, rows.to_numpy().tolist())]
+        sub.pending = None
+        self._put(sub, _message('snapshot', self._last_ts, fragments))
+
+    def _put(self, sub: QuoteSubscription, message: str):
+        try:
+            sub.queue.put_nowait(message)
+            self.messages += 1
+        except asyncio.QueueFull:
+            # 消费过慢：丢弃积压的增量，下一帧改发全量快照
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            sub.dropped += 1
+            sub.pending = set(sub.symbols)
+
+    def stats(self) -> dict:
+        return {
+            'interval': self.interval,
+            'running': self._task is not None and not self._task.done(),
+            'subscriptions': len(self._subscriptions),
+            'symbols': len(self._by_symbol),
+            'ticks': self.ticks,
+            'failures': self.failures,
+            'messages': self.messages,
+        }
@@ -1,37 +1,175 @@
-from typing import List, Optional
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
-from app.core.exceptions import DataSourceException
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.exceptions import DataSourceException, StockAnalysisException
+from app.core.metrics import instrument
+from app.domain.analysis.factors import FACTOR_INPUTS, FactorEngine
+from app.domain.analysis.indicators import IndicatorEngine
+from app.domain.analysis.screen import ScreenFilter, build_screen_frame, screen
+from app.infrastructure.data.cache.universe_index import UniverseIndex
+from app.infrastructure.data.sources.composite import create_data_source
 from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.financial_store import latest_covered_period
 from app.domain.models.schemas.stock import StockResponse, StockKLineOut
 
+logger = logging.getLogger(__name__)
+
+KLINE_COLUMNS = ["date", "open", "high", "low", "close", "volume", "amount"]
+
+
+def kline_records(frame: pd.DataFrame) -> List[dict]:
+    """get_kline_frame 的结果 → StockKLineOut 结构的记录（成交量 / 额转为可读字符串，指标收进 indicators）"""
+    df = frame[KLINE_COLUMNS[:5]].copy()
+    df["volume_str"] = (frame["volume"] / 1e4).round(2).astype(str) + " 万手"
+    df["amount_str"] = (frame["amount"] / 1e8).round(2).astype(str) + " 亿"
+    values = frame.drop(columns=KLINE_COLUMNS)
+    if not values.columns.empty:
+        df["indicators"] = values.astype(object).where(values.notna(), None).to_dict("records")
+    return df.to_dict("records")
+
+
+class ScreenFrame(NamedTuple):
+    """选股宽表缓存：请求的报告期与源数据都未变化时复用"""
+    period: Optional[str]    # 请求的报告期，None 为最新
+    sources: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]  # (股票池, 快照, 财务表)
+    frame: pd.DataFrame      # 合并后的宽表
+    used: Optional[str]      # 实际使用的报告期
+
 
 class StockService:
-    def __init__(self):
-        self.data_source = EastMoneyDataSource()
+    def __init__(self, data_source: Optional[EastMoneyDataSource] = None):
+        self.data_source = data_source or create_data_source()
+        self.universe = UniverseIndex()
+        self.indicator_engine = IndicatorEngine()
+        self.factor_engine = FactorEngine(weights=FactorEngine.parse_weights(settings.FACTOR_WEIGHTS))
+        self._universe_frame = pd.DataFrame()
+        self._industry_frame = pd.DataFrame()
+        # 选股宽表，源数据都未变化时复用
+        self._screen_frame: Optional[ScreenFrame] = None
+        # 因子表：(快照, 股票池, 快照时间, 结果)，每份快照只计算一次
+        self._factor_frame: Optional[tuple] = None
+
+    # ------------ 生命周期 ------------
+    @instrument("stock_service")
+    async def warm_up(self):
+        """启动预热：股票列表 + 全市场快照，并建立股票池索引"""
+        await self.data_source.warm_up()
+        self._universe_frame = await self.data_source.get_universe()
+        self._rebuild_universe()
+
+    @instrument("stock_service")
+    async def refresh_universe(self):
+        """后台任务：强制刷新 A 股列表并重建索引"""
+        self._universe_frame = await self.data_source.get_universe(refresh=True)
+        self._rebuild_universe()
+
+    @instrument("stock_service")
+    async def refresh_industries(self):
+        """后台任务：刷新行业板块成分并重建索引"""
+        self._industry_frame = await self.data_source.get_industry_map(refresh=True)
+        self._rebuild_universe()
+
+    @instrument("stock_service")
+    async def refresh_financials(self):
+        """后台任务：增量同步新披露的报告期"""
+        await self.data_source.get_financials(refresh=True)
+
+    def _rebuild_universe(self):
+        frame = self._universe_frame
+        if frame.empty:
+            return
+        if not self._industry_frame.empty:
+            frame = frame.drop(columns=['industry'], errors='ignore').merge(
+                self._industry_frame[['symbol', 'industry']], on='symbol', how='left'
+            )
+            frame['industry'] = frame['industry'].fillna('')
+        # 整体替换引用，读请求不加锁
+        self.universe = UniverseIndex(frame)
+
+    async def _ensure_universe(self):
+        """未经 lifespan 预热时，首个请求按需建立一次索引"""
+        if len(self.universe) == 0:
+            self._universe_frame = await self.data_source.get_universe()
+            self._rebuild_universe()
+
+    def cache_stats(self) -> dict:
+        return {**self.data_source.cache_stats(), 'universe_index': self.universe.stats()}
+
+    async def cache_max_age(self) -> int:
+        """
+        行情相关响应的缓存秒数：交易时段内 HTTP_CACHE_SESSION_MAX_AGE；
+        盘外数据不会再变，缓存到下一次开盘（不超过 HTTP_CACHE_MAX_AGE）；交易日历不可用时按交易时段处理
+        """
+        try:
+            calendar = await self.data_source.executor.run(self.data_source.calendar_store.get)
+            until_open = calendar.seconds_until_open()
+        except Exception:
+            until_open = 0.0
+        if until_open <= 0:
+            return settings.HTTP_CACHE_SESSION_MAX_AGE
+        return int(min(until_open, settings.HTTP_CACHE_MAX_AGE))
 
     # ------------ 股票列表 ------------
-    async def get_stocks(self, limit: int = 100, offset: int = 0) -> List[dict]:
-        """通过东财获取股票列表并分页"""
-        all_stocks = await self.data_source.get_stock_basic()
-        return all_stocks[offset : offset + limit]
+    @instrument("stock_service")
+    async def get_stocks_page(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        exchange: Optional[str] = None,
+        industry: Optional[str] = None,
+        market_type: Optional[str] = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """股票池索引分页：支持过滤与 keyset 游标，返回 (本页, 下一页 cursor)"""
+        await self._ensure_universe()
+        return self.universe.page(
+            limit, cursor=cursor, offset=offset,
+            exchange=exchange, industry=industry, market_type=market_type
+        )
+
+    @instrument("stock_service")
+    async def get_stocks(self, limit: int = 100, offset: int = 0, **filters) -> List[dict]:
+        """获取股票列表并分页"""
+        stocks, _ = await self.get_stocks_page(limit=limit, offset=offset, **filters)
+        return stocks
 
     # ------------ 单票基础信息 ------------
+    @instrument("stock_service")
     async def get_stock(self, symbol: str) -> Optional[dict]:
-        """通过东财获取单只股票基础信息"""
+        """优先查股票池索引，索引中没有时回退到东财单票接口"""
+        await self._ensure_universe()
+        stock = self.universe.get(symbol)
+        if stock is not None:
+            return stock
         stock = await self.data_source.get_stock_basic(symbol)
         return stock[0] if stock else None
 
     # ------------ K 线 ------------
-    async def get_kline(
+    @instrument("stock_service")
+    async def get_kline_frame(
         self,
         symbol: str,
         freq: str = "daily",
-        limit: int = 30
-    ) -> List[dict]:
+        limit: int = 30,
+        indicators: Optional[Sequence[str]] = None,
+        adjust: str = ""
+    ) -> pd.DataFrame:
         """
-        获取东财 K 线数据，若空则抛出 503
+        获取东财 K 线数据（列式），若空则抛出 503
+        :param indicators: 需要附带的指标组，如 ['ma', 'macd']；多取 INDICATOR_WARMUP_BARS 根用于预热
+        :param adjust: '' 不复权 / 'qfq' 前复权 / 'hfq' 后复权；指标按复权后的价格计算
+        :return: 最近 limit 根，列 date/open/high/low/close/volume/amount，其后为各指标列（保留 4 位小数）
         """
-        df = await self.data_source.get_stock_kline(symbol, freq, limit)
+        groups = IndicatorEngine.resolve_groups(indicators) if indicators else ()
+        fetch_limit = limit + settings.INDICATOR_WARMUP_BARS if groups else limit
+        df = await self.data_source.get_stock_kline(symbol, freq, fetch_limit, adjust)
 
         if df.empty:
             raise DataSourceException("东财接口暂时不可用", status_code=503)
@@ -47,12 +185,205 @@ class StockService:
                 "成交量": "volume",
                 "成交额": "amount",
             }
-        )
+        )[KLINE_COLUMNS]
+
+        if groups:
+            values = pd.DataFrame(self.indicator_engine.compute(
+                df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), groups=groups
+            ), index=df.index).round(4)
+            df = pd.concat([df, values], axis=1)
+
+        return df.tail(limit).reset_index(drop=True)
+
+    @instrument("stock_service")
+    async def get_kline(
+        self,
+        symbol: str,
+        freq: str = "daily",
+        limit: int = 30,
+        indicators: Optional[Sequence[str]] = None,
+        adjust: str = ""
+    ) -> List[dict]:
+        """获取 K 线记录（StockKLineOut 结构），参数同 get_kline_frame"""
+        return kline_records(await self.get_kline_frame(symbol, freq, limit, indicators, adjust))
+
+    # ------------ 批量 K 线 ------------
+    @instrument("stock_service")
+    async def get_kline_many(
+        self,
+        symbols: Iterable[str],
+        freq: str = "daily",
+        limit: int = 30,
+        concurrency: Optional[int] = None,
+        indicators: Optional[Sequence[str]] = None,
+        adjust: str = ""
+    ) -> Dict[str, dict]:
+        """
+        批量获取 K 线：去重后以有限并发扇出，单只失败不影响其他股票
+        :return: {"data": {symbol: [...]}, "errors": {symbol: message}}
+        """
+        unique = list(dict.fromkeys(s.strip() for s in symbols if s and s.strip()))
+        semaphore = asyncio.Semaphore(concurrency or settings.KLINE_BATCH_CONCURRENCY)
+
+        async def fetch(symbol: str):
+            async with semaphore:
+                try:
+                    return symbol, await self.get_kline(symbol, freq, limit, indicators, adjust), None
+                except StockAnalysisException as e:
+                    return symbol, None, e.message
+                except Exception as e:
+                    return symbol, None, str(e) or e.__class__.__name__
 
-        # 可读化字段
-        df["volume_str"] = (df["volume"] / 1e4).round(2).astype(str) + " 万手"
-        df["amount_str"] = (df["amount"] / 1e8).round(2).astype(str) + " 亿"
+        data, errors = {}, {}
+        for symbol, rows, error in await asyncio.gather(*(fetch(s) for s in unique)):
+            if error is None:
+                data[symbol] = rows
+            else:
+                errors[symbol] = error
+        return {"data": data, "errors": errors}
+
+    # ------------ 批量导出 ------------
+    async def get_universe_frame(self) -> pd.DataFrame:
+        """股票池（列式，含行业）"""
+        await self._ensure_universe()
+        return self.universe.frame
+
+    async def get_snapshot_frame(self) -> pd.DataFrame:
+        """全市场实时快照（列式）"""
+        return await self.data_source.get_market_snapshot()
+
+    async def iter_kline_frames(
+        self,
+        symbols: Sequence[str],
+        freq: str = "daily",
+        limit: int = 250,
+        adjust: str = "",
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, pd.DataFrame]]:
+        """
+        按 symbols 顺序逐只产出 (symbol, K 线)：最多 concurrency 只同时在取，先取完的等待前面的产出；
+        获取失败的股票跳过。调用方提前停止迭代时取消未完成的请求
+        """
+        window = concurrency or settings.KLINE_BATCH_CONCURRENCY
+        remaining = iter(dict.fromkeys(symbols))
+        pending = deque()
 
-        # 只保留需要的列
-        keep = ["date", "open", "high", "low", "close", "volume_str", "amount_str"]
-        return df[keep].to_dict("records")
+        def launch():
+            symbol = next(remaining, None)
+            if symbol is not None:
+                pending.append((symbol, asyncio.ensure_future(self.get_kline_frame(symbol, freq, limit, None, adjust))))
+
+        for _ in range(window):
+            launch()
+        try:
+            while pending:
+                symbol, task = pending.popleft()
+                launch()
+                try:
+                    frame = await task
+                except Exception as e:
+                    logger.warning(f"导出 {symbol} K 线失败，跳过: {e}")
+                    continue
+                yield symbol, frame
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    # ------------ 选股 ------------
+    async def get_screen_frame(self, period: Optional[str] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+        """
+        选股宽表：股票池 + 全市场快照 + 同一报告期的财务（period 为空时取披露较全的最近一期），以及所用报告期；
+        股票池、快照与财务数据都没有更新时直接复用上次的合并结果
+        """
+        await self._ensure_universe()
+        try:
+            snapshot = await self.data_source.get_market_snapshot()
+        except Exception as e:
+            # 没有快照时仍可按财务字段筛选
+            logger.warning(f"选股获取全市场快照失败: {e}")
+            snapshot = pd.DataFrame()
+        sources = (self.universe.frame, snapshot, await self.data_source.get_financials())
+        cached = self._screen_frame
+        if cached is not None and cached.period == period and all(a is b for a, b in zip(cached.sources, sources)):
+            return cached.frame, cached.used
+        used = period or latest_covered_period(sources[2])
+        frame = build_screen_frame(*sources, period=used)
+        self._screen_frame = ScreenFrame(period, sources, frame, used)
+        return frame, used
+
+    @instrument("stock_service")
+    async def screen(
+        self,
+        filters: Sequence[ScreenFilter] = (),
+        industry: Optional[Sequence[str]] = None,
+        exchange: Optional[str] = None,
+        market_type: Optional[str] = None,
+        sort: Optional[str] = None,
+        ascending: bool = False,
+        limit: int = 100,
+        period: Optional[str] = None
+    ) -> Tuple[pd.DataFrame, int, Optional[str]]:
+        """全市场横截面选股，返回 (前 limit 行, 满足条件的总数, 所用报告期)"""
+        frame, used = await self.get_screen_frame(period)
+        page, total = screen(frame, filters, industry=industry, exchange=exchange, market_type=market_type,
+                             sort=sort, ascending=ascending, limit=limit)
+        return page, total, used
+
+    # ------------ 横截面因子 ------------
+    async def get_factor_frame(self) -> Tuple[pd.DataFrame, datetime]:
+        """
+        当前全市场快照上的因子表：行情字段 + 行业 + FactorEngine.columns()，以及该快照的回源时间；
+        快照刷新后的第一次调用重新计算，之后复用
+        """
+        await self._ensure_universe()
+        snapshot = await self.data_source.get_market_snapshot()
+        if snapshot.empty:
+            raise DataSourceException("全市场快照暂时不可用", status_code=503)
+        universe = self.universe.frame
+        cached = self._factor_frame
+        if cached is not None and cached[0] is snapshot and cached[1] is universe:
+            return cached[3], cached[2]
+
+        if 'industry' in universe.columns:
+            industries = universe.set_index('symbol')['industry'].reindex(snapshot['symbol']).fillna('').to_numpy()
+        else:
+            industries = np.full(len(snapshot), '', dtype=object)
+        scores = self.factor_engine.compute({c: snapshot[c].to_numpy() for c in FACTOR_INPUTS}, industries)
+        frame = snapshot[['symbol', 'name', *FACTOR_INPUTS]].reset_index(drop=True)
+        frame.insert(2, 'industry', industries)
+        frame = pd.concat([frame, pd.DataFrame(scores)], axis=1)
+        # 数据源没有记录快照时间时退回计算时间
+        fetched_at = snapshot.attrs.get('fetched_at')
+        as_of = datetime.fromisoformat(fetched_at) if fetched_at else datetime.now()
+        self._factor_frame = (snapshot, universe, as_of, frame)
+        return frame, as_of
+
+    @instrument("stock_service")
+    async def rank_factors(
+        self,
+        by: str = "score",
+        n: int = 50,
+        bottom: bool = False,
+        industry: Optional[Sequence[str]] = None,
+        weights: Optional[Dict[str, float]] = None
+    ) -> Tuple[pd.DataFrame, int, datetime]:
+        """
+        按因子列排名取前 / 后 n 只（该列为 NaN 的股票不参与）
+        :param by: 'score' / 'score_ind' 或 FactorEngine.columns() 中的列；因子名（如 'ep'）等同于其 z 分数列
+        :param weights: 临时的综合分权重，只重算综合分列
+        :return: (结果, 参与排名的股票数, 快照时间)
+        """
+        frame, as_of = await self.get_factor_frame()
+        if by in self.factor_engine.factors:
+            by = f"{by}_z"
+        if by not in self.factor_engine.columns():
+            raise ValueError(f"不支持的排名字段: {by}")
+        if weights:
+            frame = frame.assign(**self.factor_engine.composite(frame, weights))
+        if industry:
+            frame = frame[frame['industry'].isin(industry)]
+        values = frame[by].to_numpy(dtype='float64')
+        ranked = np.flatnonzero(~np.isnan(values))
+        # 稳定排序：同分时保持快照中的先后顺序
+        order = ranked[np.argsort(values[ranked] if bottom else -values[ranked], kind='stable')][:n]
+        return frame.iloc[order].reset_index(drop=True), len(ranked), as_of
@@ -0,0 +1,85 @@
+"""
+本地复权：不复权日线 + 后复权因子（hfq_factor）在请求时向量化计算
+
+- 后复权 hfq: price × f(d)
+- 前复权 qfq: price × f(d) / f(最新)
+f(d) 为 d 当天或之前最近一次变动的后复权因子（因子表只记录变动日）。
+
+新的除权除息事件通过交易所“前收盘价”识别：除权日的前收盘价是按除权规则调整过的，
+与本地上一根收盘价不一致。
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.normalize import EXCHANGE_SUFFIXES, exchange_of
+
+ADJUST_MODES = ('', 'qfq', 'hfq')
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+FACTOR_COLUMNS = ['date', 'hfq_factor']
+
+# 收盘价两位小数，差异超过一分钱才认为是除权
+_EX_RIGHTS_TOLERANCE = 0.011
+
+
+def sina_symbol(symbol: str) -> str:
+    """新浪接口的带交易所前缀代码：sh600000 / sz000001 / bj830799"""
+    return f'{EXCHANGE_SUFFIXES.get(exchange_of(symbol), "SZ").lower()}{symbol}'
+
+
+def normalize_factors(raw: pd.DataFrame) -> pd.DataFrame:
+    """新浪 hfq-factor 返回（倒序、字符串因子）整理为按日期升序的 date/hfq_factor"""
+    if raw is None or raw.empty:
+        return pd.DataFrame(columns=FACTOR_COLUMNS)
+    factors = pd.DataFrame({
+        'date': pd.to_datetime(raw['date'], errors='coerce'),
+        'hfq_factor': pd.to_numeric(raw['hfq_factor'], errors='coerce'),
+    }).dropna()
+    return factors.drop_duplicates('date', keep='last').sort_values('date').reset_index(drop=True)
+
+
+def factors_at(dates: pd.Series, factors: pd.DataFrame) -> np.ndarray:
+    """每个日期适用的后复权因子（早于第一条记录的日期使用第一条）"""
+    change_dates = pd.to_datetime(factors['date']).to_numpy(dtype='datetime64[ns]')
+    values = factors['hfq_factor'].to_numpy(dtype='float64')
+    idx = np.searchsorted(change_dates, pd.to_datetime(dates).to_numpy(dtype='datetime64[ns]'), side='right') - 1
+    return values[np.clip(idx, 0, len(values) - 1)]
+
+
+def apply_adjustment(bars: pd.DataFrame, factors: pd.DataFrame, adjust: str) -> pd.DataFrame:
+    """
+    对日线价格列复权，成交量 / 成交额保持不变
+    :param adjust: '' / 'qfq' / 'hfq'
+    """
+    if adjust not in ADJUST_MODES:
+        raise ValueError(f"不支持的复权方式: {adjust}")
+    if not adjust or bars.empty:
+        return bars
+    if factors is None or factors.empty:
+        raise ValueError("缺少复权因子")
+
+    f = factors_at(bars['date'], factors)
+    if adjust == 'qfq':
+        f = f / factors['hfq_factor'].iloc[-1]
+    adjusted = bars.copy()
+    adjusted[PRICE_COLUMNS] = bars[PRICE_COLUMNS].to_numpy(dtype='float64') * f[:, None]
+    return adjusted
+
+
+def has_ex_rights(previous_close: Optional[float], bars: pd.DataFrame, change: pd.Series) -> bool:
+    """
+    新日线中是否出现除权除息
+    :param previous_close: 新日线之前本地最后一根收盘价（没有则只比较新日线内部）
+    :param bars: 新日线（升序）
+    :param change: 与 bars 同索引的涨跌额，前收盘价 = close - change
+    """
+    if bars.empty:
+        return False
+    reported = bars['close'] - change.reindex(bars.index)
+    actual = bars['close'].shift(1)
+    if previous_close is not None:
+        actual.iloc[0] = previous_close
+    diff = (reported - actual).abs()
+    return bool((diff > _EX_RIGHTS_TOLERANCE).any())
@@ -0,0 +1,19 @@
+"""
+DataFrame → Arrow 表的公共转换：上游录制（cassette）与批量导出接口（Arrow IPC / Parquet）共用
+"""
+
+import pandas as pd
+import pyarrow as pa
+
+
+def to_arrow_table(df: pd.DataFrame) -> pa.Table:
+    """DataFrame → Arrow 表；无法推断类型的 object 列按字符串保存；不带 df.attrs（如快照时间）"""
+    if df.attrs:
+        df = df.copy(deep=False)
+        df.attrs = {}
+    try:
+        return pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # akshare 偶有混合类型的 object 列，按字符串保存
+        mixed = [c for c in df.columns if df[c].dtype == object]
+        return pa.Table.from_pandas(df.astype({c: str for c in mixed}))
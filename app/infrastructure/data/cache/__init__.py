@@ -0,0 +1,7 @@
+from .singleflight import SingleFlight
+from .snapshot_cache import MarketSnapshot, MarketSnapshotCache
+from .response_cache import CachedResponse, ResponseCache
+from .universe_index import UniverseIndex
+
+__all__ = ['SingleFlight', 'MarketSnapshot', 'MarketSnapshotCache', 'CachedResponse', 'ResponseCache',
+           'UniverseIndex']
@@ -0,0 +1,119 @@
+"""
+HTTP 响应缓存：按请求参数缓存序列化后的响应体与 ETag（内容哈希），LRU 淘汰 + 按条目过期
+
+- 命中时直接返回已序列化的字节，不再经过数据源、指标计算与 JSON 编码
+- ETag 为响应体的哈希，内容不变则 ETag 不变，客户端带 If-None-Match 时可直接回 304
+- 同一 key 的并发未命中合并为一次计算（single-flight）
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+
+def content_etag(body: bytes) -> str:
+    """强 ETag：响应体 blake2b 摘要（带引号）"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否命中（支持逗号分隔的多个值、弱校验前缀 W/ 与 *）"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+@dataclass
+class CachedResponse:
+    """一条缓存的响应"""
+    body: bytes
+    etag: str
+    max_age: int
+    expires_monotonic: float
+    created_monotonic: float = field(default_factory=time.monotonic)
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_monotonic
+
+    def remaining(self) -> int:
+        """剩余有效秒数，用作 Cache-Control max-age"""
+        return max(0, round(self.expires_monotonic - time.monotonic()))
+
+
+class ResponseCache:
+    """
+    响应缓存
+    :param max_entries: 最多缓存的响应数，超过后淘汰最久未使用的
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """未过期的缓存条目；过期条目顺带删除"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.fresh():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, body: bytes, max_age: int) -> CachedResponse:
+        now = time.monotonic()
+        entry = CachedResponse(body=body, etag=content_etag(body), max_age=max_age,
+                               expires_monotonic=now + max_age, created_monotonic=now)
+        if max_age > 0:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    async def get_or_render(self, key: Hashable, render: Callable[[], Awaitable[Tuple[bytes, int]]]
+                            ) -> Tuple[CachedResponse, bool]:
+        """
+        返回 (缓存条目, 是否命中)；未命中时调用 render() 得到 (响应体, max-age 秒) 并写入缓存
+        render 抛出的异常原样传给所有并发调用方，不写入缓存
+        """
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry, True
+        self.misses += 1
+
+        async def fill() -> CachedResponse:
+            body, max_age = await render()
+            return self.put(key, body, max_age)
+
+        return await self._flight.do(key, fill), False
+
+    def invalidate(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'not_modified': self.not_modified,
+            'bytes': sum(len(e.body) for e in self._entries.values()),
+        }
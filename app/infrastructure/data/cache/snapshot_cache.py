@@ -0,0 +1,111 @@
+"""
+全市场行情快照缓存：TTL 过期 + symbol→行号哈希索引 + single-flight 回源
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+import pandas as pd
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MarketSnapshot:
+    """一次全市场快照"""
+    frame: pd.DataFrame
+    index: Dict[str, int]
+    fetched_at: datetime
+    fetched_monotonic: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_monotonic
+
+    def row(self, symbol: str) -> Optional[pd.Series]:
+        pos = self.index.get(symbol)
+        return None if pos is None else self.frame.iloc[pos]
+
+
+class MarketSnapshotCache:
+    """
+    全市场快照缓存
+    :param loader: 拉取全市场行情表的协程函数
+    :param ttl: 过期秒数
+    :param key_column: 建索引所用的股票代码列
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[pd.DataFrame]], ttl: float, key_column: str = '代码'):
+        self.loader = loader
+        self.ttl = ttl
+        self.key_column = key_column
+        self._snapshot: Optional[MarketSnapshot] = None
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    async def get(self, max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        """
+        返回未过期的快照；过期时并发调用方合并为一次回源
+        :param max_age: 本次调用可接受的最大快照年龄（秒），小于 ttl 时按它判断是否过期
+        """
+        snapshot = self._snapshot
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        if snapshot is not None and snapshot.age() < ttl:
+            self.hits += 1
+            return snapshot
+        self.misses += 1
+        return await self._flight.do('snapshot', self._refresh)
+
+    async def lookup(self, symbol: str) -> Optional[pd.Series]:
+        snapshot = await self.get()
+        return snapshot.row(symbol) if snapshot else None
+
+    def peek(self) -> Optional[MarketSnapshot]:
+        """当前持有的快照（不论是否过期，不触发回源）"""
+        return self._snapshot
+
+    async def refresh(self) -> Optional[MarketSnapshot]:
+        """不论是否过期都立即回源（并发调用同样合并）"""
+        return await self._flight.do('snapshot', self._refresh)
+
+    def invalidate(self):
+        self._snapshot = None
+
+    async def _refresh(self) -> Optional[MarketSnapshot]:
+        self.fetches += 1
+        try:
+            df = await self.loader()
+        except Exception as e:
+            if self._snapshot is None:
+                raise
+            logger.warning(f"刷新全市场快照失败，继续使用旧快照: {e}")
+            return self._snapshot
+        if df is None or df.empty:
+            logger.warning("全市场快照为空，保留上一份快照")
+            return self._snapshot
+        df = df.reset_index(drop=True)
+        index = {code: pos for pos, code in enumerate(df[self.key_column].astype(str))}
+        fetched_at = datetime.now()
+        # 只拿到表的调用方（如 get_market_snapshot）从 attrs 读取快照时间；attrs 会随派生表传播，
+        # 存 ISO 字符串，序列化 attrs 的地方（如 pyarrow 写 pandas 元数据）不会出错
+        df.attrs['fetched_at'] = fetched_at.isoformat()
+        self._snapshot = MarketSnapshot(frame=df, index=index, fetched_at=fetched_at)
+        return self._snapshot
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'fetches': self.fetches,
+            'rows': 0 if snapshot is None else len(snapshot.frame),
+            'age_seconds': None if snapshot is None else round(snapshot.age(), 3),
+            'fetched_at': None if snapshot is None else snapshot.fetched_at.isoformat(timespec='seconds'),
+        }
@@ -0,0 +1,109 @@
+"""
+内存股票池索引
+
+- 按 symbol 查找：dict，O(1)
+- 按 exchange / industry / market_type 过滤：每个取值一条按 symbol 排序的倒排表
+- keyset 分页：cursor 为上一页最后一个 symbol，用二分定位起点，每页代价 O(page size)
+
+索引构建后只读；刷新时整体替换引用，读请求无需加锁
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+FILTER_FIELDS = ('exchange', 'industry', 'market_type')
+
+
+class UniverseIndex:
+    """只读的股票池索引"""
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        frame = frame if frame is not None else pd.DataFrame(columns=['symbol'])
+        frame = frame.drop_duplicates(subset=['symbol']).sort_values('symbol').reset_index(drop=True)
+        # 列式原表（批量导出用）
+        self.frame = frame
+
+        self.records: List[Dict[str, Any]] = frame.to_dict('records')
+        self.symbols: List[str] = [r['symbol'] for r in self.records]
+        self._positions: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        # field -> value -> 升序行号
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        for field in FILTER_FIELDS:
+            if field in frame.columns:
+                groups = frame.groupby(frame[field].fillna('').astype(str), sort=False).indices
+                self._postings[field] = {value: rows.tolist() for value, rows in groups.items()}
+        self.built_at = datetime.now()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        pos = self._positions.get(symbol)
+        return None if pos is None else self.records[pos]
+
+    def values(self, field: str) -> List[str]:
+        """某个过滤字段的全部取值"""
+        return sorted(v for v in self._postings.get(field, {}) if v)
+
+    def page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        **filters: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        分页查询
+        :param cursor: 上一页返回的 next_cursor；提供时忽略 offset
+        :param filters: exchange / industry / market_type，值为 None 表示不过滤
+        :return: (本页记录, 下一页 cursor；没有下一页时为 None)
+        """
+        active = {k: v for k, v in filters.items() if v is not None}
+        unknown = set(active) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"不支持的过滤字段: {', '.join(sorted(unknown))}")
+
+        start = bisect_right(self.symbols, cursor) if cursor is not None else 0
+
+        if not active:
+            if cursor is None:
+                start += offset
+            rows = range(start, min(start + limit + 1, len(self.records)))
+        else:
+            # 以最短的倒排表驱动，其余条件逐条校验
+            candidates = [(field, value, self._postings.get(field, {}).get(value, []))
+                          for field, value in active.items()]
+            d = min(range(len(candidates)), key=lambda k: len(candidates[k][2]))
+            driver = candidates[d][2]
+            others = [(field, value) for k, (field, value, _) in enumerate(candidates) if k != d]
+            i = bisect_left(driver, start)
+            skip = offset if cursor is None else 0
+            if not others:
+                i, skip = i + skip, 0
+            rows = []
+            for j in range(i, len(driver)):
+                pos = driver[j]
+                record = self.records[pos]
+                if all(str(record.get(field) or '') == value for field, value in others):
+                    if skip:
+                        skip -= 1
+                        continue
+                    rows.append(pos)
+                    if len(rows) > limit:
+                        break
+
+        rows = list(rows)
+        has_more = len(rows) > limit
+        items = [self.records[pos] for pos in rows[:limit]]
+        next_cursor = items[-1]['symbol'] if has_more and items else None
+        return items, next_cursor
+
+    def stats(self) -> dict:
+        return {
+            'rows': len(self.records),
+            'built_at': self.built_at.isoformat(timespec='seconds'),
+            **{f'{field}_values': len(values) for field, values in self._postings.items()},
+        }
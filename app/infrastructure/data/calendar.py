@@ -0,0 +1,220 @@
+"""
+交易日历：上交所交易日的有序数组，本地持久化并按天刷新
+
+- TradingCalendar：只读，基于升序 datetime64[D] 数组，查询均为二分 O(log n)
+- TradingCalendarStore：加载 / 持久化 / 过期刷新，进程内共享一份
+
+目录结构::
+
+    {path}                  # Parquet，单列 date（仅交易日）
+
+默认从新浪交易日历（ak.tool_trade_date_hist_sina，覆盖到当年年底）加载，不需要 token。
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.exceptions import DataSourceException
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[date, datetime, str, np.datetime64, pd.Timestamp]
+
+# 集合竞价开始；收盘后数据源完成当日日线的大致时间（本地时间）
+MARKET_OPEN = dtime(9, 15)
+MARKET_CLOSE = dtime(15, 30)
+
+
+def _day(value: DateLike) -> np.datetime64:
+    if isinstance(value, str) and len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def _to_date(value: np.datetime64) -> date:
+    return value.astype('datetime64[D]').astype(object)
+
+
+class TradingCalendar:
+    """只读交易日历"""
+
+    def __init__(self, days: Iterable[DateLike]):
+        values = np.array([_day(d) for d in days], dtype='datetime64[D]') \
+            if not isinstance(days, np.ndarray) else days.astype('datetime64[D]')
+        self.days = np.unique(values)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    @property
+    def first(self) -> date:
+        return _to_date(self.days[0])
+
+    @property
+    def last(self) -> date:
+        return _to_date(self.days[-1])
+
+    def is_trading_day(self, day: DateLike) -> bool:
+        d = _day(day)
+        i = np.searchsorted(self.days, d)
+        return bool(i < len(self.days) and self.days[i] == d)
+
+    def latest(self, on: Optional[DateLike] = None) -> date:
+        """on（默认今天）当天或之前最近的交易日"""
+        return self.previous(on if on is not None else date.today(), 0)
+
+    def previous(self, day: DateLike, n: int = 1) -> date:
+        """
+        day 之前第 n 个交易日；n=0 表示 day 当天或之前最近的交易日
+        """
+        i = np.searchsorted(self.days, _day(day), side='right') - 1
+        if n > 0 and self.is_trading_day(day):
+            i -= n
+        elif n > 0:
+            i -= n - 1
+        if i < 0:
+            raise IndexError(f"{day} 之前没有第 {n} 个交易日")
+        return _to_date(self.days[i])
+
+    def next(self, day: DateLike, n: int = 1) -> date:
+        """
+        day 之后第 n 个交易日；n=0 表示 day 当天或之后最近的交易日
+        """
+        i = np.searchsorted(self.days, _day(day), side='left')
+        if n > 0 and self.is_trading_day(day):
+            i += n
+        elif n > 0:
+            i += n - 1
+        if i >= len(self.days):
+            raise IndexError(f"{day} 之后没有第 {n} 个交易日（日历截止 {self.last}）")
+        return _to_date(self.days[i])
+
+    def seconds_until_open(self, now: Optional[datetime] = None) -> float:
+        """
+        距下一次开盘（MARKET_OPEN）的秒数；交易时段内（至 MARKET_CLOSE）返回 0，
+        日历已无后续交易日时同样返回 0（无法判断何时开盘）
+        """
+        now = now or datetime.now()
+        today = now.date()
+        if self.is_trading_day(today):
+            if now.time() < MARKET_OPEN:
+                return (datetime.combine(today, MARKET_OPEN) - now).total_seconds()
+            if now.time() < MARKET_CLOSE:
+                return 0.0
+        try:
+            upcoming = self.next(today, 1)
+        except IndexError:
+            return 0.0
+        return (datetime.combine(upcoming, MARKET_OPEN) - now).total_seconds()
+
+    def between(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """[start, end] 内的交易日（datetime64[D] 数组视图）"""
+        lo = np.searchsorted(self.days, _day(start), side='left')
+        hi = np.searchsorted(self.days, _day(end), side='right')
+        return self.days[lo:hi]
+
+    def count(self, start: DateLike, end: DateLike) -> int:
+        return len(self.between(start, end))
+
+
+def load_sse_calendar() -> pd.DataFrame:
+    """从新浪加载上交所交易日历"""
+    import akshare as ak
+    return ak.tool_trade_date_hist_sina()
+
+
+class TradingCalendarStore:
+    """
+    交易日历的加载与缓存
+    :param path: 本地 Parquet 文件
+    :param loader: 返回含 trade_date 列 DataFrame 的阻塞函数
+    :param refresh_seconds: 本地文件超过该时长后回源刷新，刷新失败继续使用旧日历
+    """
+
+    def __init__(self, path: str, loader: Callable[[], pd.DataFrame] = load_sse_calendar,
+                 refresh_seconds: float = 86400):
+        self.path = Path(path)
+        self.loader = loader
+        self.refresh_seconds = refresh_seconds
+        self._calendar: Optional[TradingCalendar] = None
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> TradingCalendar:
+        """返回日历；需要回源时在调用线程中阻塞加载（异步代码请放到线程池中调用）"""
+        calendar = self._calendar
+        if calendar is not None and time.time() - self._loaded_at < self.refresh_seconds:
+            return calendar
+        with self._lock:
+            if self._calendar is None:
+                self._load_local()
+            if self._calendar is None or time.time() - self._loaded_at >= self.refresh_seconds:
+                self._refresh()
+            if self._calendar is None:
+                raise DataSourceException("交易日历不可用", status_code=503)
+            return self._calendar
+
+    def _load_local(self):
+        if not self.path.exists():
+            return
+        try:
+            days = pd.read_parquet(self.path)['date'].to_numpy(dtype='datetime64[D]')
+            self._calendar = TradingCalendar(days)
+            self._loaded_at = self.path.stat().st_mtime
+        except Exception as e:
+            logger.warning(f"读取本地交易日历失败: {e}")
+
+    def _refresh(self):
+        # 回源失败后一分钟内不再重试，期间沿用旧日历
+        if time.time() - self._failed_at < 60:
+            return
+        try:
+            raw = self.loader()
+            days = pd.to_datetime(raw['trade_date']).to_numpy(dtype='datetime64[D]')
+            if len(days) == 0:
+                raise ValueError("返回空日历")
+        except Exception as e:
+            self._failed_at = time.time()
+            logger.warning(f"刷新交易日历失败: {e}")
+            return
+        self._calendar = TradingCalendar(days)
+        self._loaded_at = time.time()
+        self._save()
+        logger.info(f"交易日历已刷新: {self._calendar.first} ~ {self._calendar.last}, {len(self._calendar)} 天")
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix('.tmp')
+        pd.DataFrame({'date': self._calendar.days}).to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict:
+        calendar = self._calendar
+        return {
+            'days': 0 if calendar is None else len(calendar),
+            'last': None if calendar is None else calendar.last.isoformat(),
+            'loaded_at': datetime.fromtimestamp(self._loaded_at).isoformat(timespec='seconds') if calendar else None,
+        }
+
+
+_store: Optional[TradingCalendarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_calendar_store() -> TradingCalendarStore:
+    """进程内共享的上交所交易日历"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TradingCalendarStore(settings.CALENDAR_PATH, refresh_seconds=settings.CALENDAR_REFRESH_SECONDS)
+        return _store
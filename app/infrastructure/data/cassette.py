@@ -0,0 +1,235 @@
+"""
+上游调用录制 / 回放（cassette）
+
+录制时把每次 akshare / tushare 调用（接口名、参数、返回的 DataFrame、耗时）追加到磁盘；
+回放时按 接口名 + 参数 查找并返回录制的 DataFrame，可叠加人工延迟，完全不访问网络。
+
+目录结构::
+
+    {path}/
+        index.jsonl     # 每次调用一行：key / api / args / offset / length / elapsed / error
+        data.arrow      # 依次追加的 Arrow IPC stream 片段，每次调用一个
+
+- 回放时 data.arrow 以内存映射打开，index 只在打开时读一次；DataFrame 在被请求时才从映射区解码，
+  因此一整个交易日的全市场录制也能瞬间打开
+- 同一 key 多次录制时以最后一次为准（index 只追加，不改写）
+- 上游抛出的异常同样录制，回放时以 RecordedUpstreamError 抛出
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from app.core.config import settings
+from app.infrastructure.data.arrow import to_arrow_table
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ('record', 'replay', 'auto')
+
+# 每次调用单独压缩：日期 / 代码等重复字符串列压缩比很高，解压只在回放该调用时发生
+_WRITE_OPTIONS = pa.ipc.IpcWriteOptions(compression='zstd')
+
+
+class CassetteMissError(LookupError):
+    """回放模式下没有录制过的调用"""
+
+
+class RecordedUpstreamError(RuntimeError):
+    """录制时上游抛出的异常"""
+
+
+def call_key(api: str, args: tuple, kwargs: dict) -> str:
+    payload = json.dumps({'api': api, 'args': list(args), 'kwargs': kwargs},
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class Cassette:
+    """
+    :param path: cassette 目录
+    :param mode: record 总是调用上游并录制 / replay 只回放，未录制的调用抛 CassetteMissError /
+                 auto 有录制则回放，否则调用上游并录制
+    :param latency: 回放时每次调用固定附加的延迟（秒）
+    :param latency_scale: 回放时附加 录制耗时 × latency_scale 的延迟，1.0 即按原始耗时重放
+    """
+
+    def __init__(self, path: str, mode: str = 'replay', latency: float = 0.0, latency_scale: float = 0.0):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"不支持的 cassette 模式: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self._index: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._mmap: Optional[pa.MemoryMappedFile] = None
+        self._mapped_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._load_index()
+
+    @property
+    def index_path(self) -> Path:
+        return self.path / 'index.jsonl'
+
+    @property
+    def data_path(self) -> Path:
+        return self.path / 'data.arrow'
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    self._index[entry['key']] = entry
+
+    # ------------ 调用 ------------
+    def call(self, api: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """按模式回放或调用上游 fn(*args, **kwargs)；api 为 'akshare.stock_zh_a_hist' 形式的接口名"""
+        key = call_key(api, args, kwargs)
+        entry = self._index.get(key) if self.mode != 'record' else None
+        if entry is not None:
+            self.hits += 1
+            return self._replay(entry)
+        if self.mode == 'replay':
+            self.misses += 1
+            raise CassetteMissError(f"cassette {self.path} 中没有录制 {api}({args}, {kwargs})")
+        return self._record(key, api, fn, args, kwargs)
+
+    def _replay(self, entry: dict) -> pd.DataFrame:
+        delay = self.latency + entry['elapsed'] * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        if entry.get('error'):
+            raise RecordedUpstreamError(entry['error'])
+        return self._read(entry['offset'], entry['length'])
+
+    def _read(self, offset: int, length: int) -> pd.DataFrame:
+        with self._lock:
+            if self._mmap is None or offset + length > self._mapped_size:
+                # 录制过程中文件在增长，重新映射
+                self._mmap = pa.memory_map(str(self.data_path), 'r')
+                self._mapped_size = self._mmap.size()
+            buffer = self._mmap.read_at(length, offset)
+        return pa.ipc.open_stream(buffer).read_all().to_pandas()
+
+    def _record(self, key: str, api: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        started = time.perf_counter()
+        error = None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            result, error = None, e
+        elapsed = time.perf_counter() - started
+
+        entry = {'key': key, 'api': api, 'args': json.loads(json.dumps(list(args), default=str)),
+                 'kwargs': json.loads(json.dumps(kwargs, default=str)), 'elapsed': round(elapsed, 6)}
+        if error is not None:
+            entry['error'] = f"{error.__class__.__name__}: {error}"
+            payload = None
+        elif isinstance(result, pd.DataFrame):
+            sink = pa.BufferOutputStream()
+            table = to_arrow_table(result)
+            with pa.ipc.new_stream(sink, table.schema, options=_WRITE_OPTIONS) as writer:
+                writer.write_table(table)
+            payload = sink.getvalue()
+        else:
+            logger.warning(f"{api} 返回 {type(result).__name__}，不是 DataFrame，不录制")
+            return result
+
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.data_path, 'ab') as f:
+                entry['offset'] = f.tell()
+                if payload is not None:
+                    f.write(payload)
+                entry['length'] = 0 if payload is None else payload.size
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._index[key] = entry
+            self.recorded += 1
+
+        if error is not None:
+            raise error
+        return result
+
+    def stats(self) -> dict:
+        return {
+            'path': str(self.path),
+            'mode': self.mode,
+            'calls': len(self._index),
+            'hits': self.hits,
+            'misses': self.misses,
+            'recorded': self.recorded,
+            'size_bytes': self.data_path.stat().st_size if self.data_path.exists() else 0,
+        }
+
+
+class CassetteProxy:
+    """
+    包装 akshare 模块 / tushare pro 客户端：属性访问照常，函数调用经过 cassette
+    proxy.stock_zh_a_hist(...) → cassette.call('akshare.stock_zh_a_hist', ak.stock_zh_a_hist, ...)
+    """
+
+    def __init__(self, target: Any, cassette: Cassette, namespace: str):
+        self._target = target
+        self._cassette = cassette
+        self._namespace = namespace
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        api = f"{self._namespace}.{name}"
+        cassette = self._cassette
+
+        def call(*args, **kwargs):
+            return cassette.call(api, attr, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+def use_cassette(source, cassette: Cassette):
+    """让数据源的上游调用（EastMoney 的 ak、Tushare 的 pro / ts）经过 cassette"""
+    for attr, namespace in (('ak', 'akshare'), ('pro', 'tushare.pro'), ('ts', 'tushare')):
+        if hasattr(source, attr):
+            setattr(source, attr, CassetteProxy(getattr(source, attr), cassette, namespace))
+    source.cassette = cassette
+    return source
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """按 CASSETTE_* 配置返回进程内共享的 cassette；CASSETTE_MODE 为空时返回 None"""
+    if not settings.CASSETTE_MODE:
+        return None
+    path = os.path.abspath(settings.CASSETTE_PATH)
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(
+                path, mode=settings.CASSETTE_MODE,
+                latency=settings.CASSETTE_LATENCY_SECONDS, latency_scale=settings.CASSETTE_LATENCY_SCALE,
+            )
+            logger.info(f"上游调用 cassette: {path} ({settings.CASSETTE_MODE}, 已录制 {len(cassette)} 次调用)")
+        return cassette
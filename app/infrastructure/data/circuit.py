@@ -0,0 +1,76 @@
+"""
+数据源熔断器：连续失败达到阈值后熔断一段时间，期间不再向该数据源发请求
+
+状态::
+
+    closed ──连续失败 ≥ failure_threshold──▶ open ──reset_seconds 后──▶ half_open
+       ▲                                       ▲                          │
+       └────────────── 试探成功 ───────────────┼──────── 试探失败 ────────┘
+
+half_open 期间只放行一个试探请求；试探请求迟迟没有结果（如被取消）时，每 reset_seconds 再放行一个。
+"""
+
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    熔断器
+    :param name: 数据源名称（日志 / 统计用）
+    :param failure_threshold: 连续失败多少次后熔断
+    :param reset_seconds: 熔断多久后放行试探请求
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """是否放行一次请求"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN and now - self._opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._trial_at = 0.0
+            if self.state == HALF_OPEN and now - self._trial_at >= self.reset_seconds:
+                self._trial_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'trips': self.trips,
+            'rejected': self.rejected,
+        }
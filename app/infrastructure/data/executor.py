@@ -0,0 +1,135 @@
+"""
+数据源执行层：akshare / tushare 都是阻塞调用，统一放到各数据源专属的线程池里执行，
+避免一次慢请求卡住整个事件循环
+
+- 每个数据源一个线程池（按名称注册，进程内共享）
+- 在途调用数上限：超过上限的调用在事件循环上排队等待，不占线程
+- 超时：超时后立即向调用方返回 504；尚未开始执行的调用会被取消，
+  已在执行的线程跑完后才释放名额，保证在途数不超过上限
+- 取消：调用方协程被取消（如客户端断开）时同样取消排队中的调用
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.exceptions import DataSourceException
+
+logger = logging.getLogger(__name__)
+
+
+class SourceExecutor:
+    """单个数据源的线程池 + 在途上限 + 超时"""
+
+    def __init__(self, name: str, max_in_flight: int, timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=f"source-{name}")
+        # asyncio.Semaphore 绑定事件循环，按 loop 分别维护
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[loop] = sem
+        return sem
+
+    async def run(self, fn: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """在线程池中执行阻塞函数 fn(*args, **kwargs)"""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self._submit(fn, *args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            fn_name = getattr(fn, '__name__', repr(fn))
+            logger.warning(f"数据源 {self.name} 调用 {fn_name} 超时 ({timeout}s)")
+            raise DataSourceException(f"数据源 {self.name} 调用超时: {fn_name}", status_code=504)
+
+    async def _submit(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphore(loop)
+        await sem.acquire()
+        try:
+            future = self._pool.submit(self._invoke, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            sem.release()
+            raise
+        future.add_done_callback(lambda _: self._release(loop, sem))
+        return await asyncio.wrap_future(future)
+
+    def _invoke(self, call: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+        try:
+            return call()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, sem: asyncio.Semaphore):
+        try:
+            loop.call_soon_threadsafe(sem.release)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            'max_in_flight': self.max_in_flight,
+            'timeout': self.timeout,
+            'in_flight': self.in_flight,
+            'calls': self.calls,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+        }
+
+
+_executors: Dict[str, SourceExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def get_executor(name: str, max_in_flight: Optional[int] = None, timeout: Optional[float] = None) -> SourceExecutor:
+    """按数据源名称获取（首次调用时创建）进程内共享的执行器"""
+    with _registry_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = SourceExecutor(
+                name,
+                max_in_flight=max_in_flight or settings.SOURCE_MAX_IN_FLIGHT,
+                timeout=timeout or settings.SOURCE_TIMEOUT_SECONDS,
+            )
+            _executors[name] = executor
+        return executor
+
+
+def executor_stats() -> Dict[str, dict]:
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors(wait: bool = False):
+    with _registry_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait)
+        _executors.clear()
@@ -0,0 +1,43 @@
+"""
+上游库的延迟导入：akshare / tushare 连同依赖导入一次要数百毫秒，放到第一次真正调用上游时再导入
+
+    ak = LazyModule('akshare')      # 模块级占位，不触发导入
+    ak.stock_zh_a_hist(...)         # 第一次访问属性时才 import akshare
+
+- 启动（uvicorn worker、CLI 任务）不再为没用到的数据源付导入开销
+- 数据源的上游调用都在执行器线程池里进行，首次导入也发生在线程池里，不阻塞事件循环
+- 单元测试照常 patch('...eastmoney.ak')：替换的是模块级占位本身
+"""
+
+import importlib
+import sys
+import threading
+from types import ModuleType
+
+
+class LazyModule:
+    """模块占位：第一次访问属性时导入目标模块，之后直接转发"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        """导入并返回目标模块（已导入时直接返回）"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None or self._name in sys.modules
+
+    def __getattr__(self, name: str):
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"<LazyModule {self._name!r} ({state})>"
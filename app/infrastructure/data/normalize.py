@@ -0,0 +1,174 @@
+"""
+行情表向量化规整：整列转换为 float64，替代逐行 iterrows + 逐格 _parse_number
+
+数值规则与 EastMoneyDataSource._parse_number 保持一致：
+'万亿'/'亿'/'万' 后缀换算（见 NUMBER_UNITS）、去千分位逗号、'-'/空串/NaN/无法解析 一律记为 0.0
+"""
+
+import numpy as np
+import pandas as pd
+
+# 东财全市场行情表 → 统一字段
+SPOT_COLUMNS = {
+    '代码': 'symbol',
+    '名称': 'name',
+    '最新价': 'current_price',
+    '涨跌额': 'change_amount',
+    '涨跌幅': 'change_percent',
+    '开盘': 'open_price',
+    '最高': 'high_price',
+    '最低': 'low_price',
+    '昨收': 'prev_close',
+    '成交量': 'volume',
+    '成交额': 'amount',
+    '换手率': 'turnover_rate',
+    '市盈率': 'pe_ratio',
+    '市净率': 'pb_ratio',
+    '总市值': 'market_cap',
+    '流通市值': 'circulating_market_cap',
+}
+
+SPOT_NUMERIC_COLUMNS = [v for v in SPOT_COLUMNS.values() if v not in ('symbol', 'name')]
+
+# 数值单位后缀，按顺序取第一个匹配：'万亿' 要先于 '亿' / '万'
+NUMBER_UNITS = (('万亿', 1e12), ('亿', 1e8), ('万', 1e4))
+
+# 代码前缀 → 交易所，按顺序取第一个匹配：北交所新号段 92 要先于沪市 B 股 9
+EXCHANGE_PREFIXES = (
+    ('92', 'BSE'), ('4', 'BSE'), ('8', 'BSE'),
+    ('6', 'SSE'), ('9', 'SSE'),
+    ('0', 'SZSE'), ('2', 'SZSE'), ('3', 'SZSE'),
+)
+# 交易所 → Tushare ts_code 后缀（小写即新浪代码前缀）
+EXCHANGE_SUFFIXES = {'SSE': 'SH', 'SZSE': 'SZ', 'BSE': 'BJ'}
+
+
+def parse_number_series(values: pd.Series) -> pd.Series:
+    """整列解析数值，返回 float64；只有无法直接转数值的少数格子才走字符串处理"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64').fillna(0.0)
+
+    raw = values.to_numpy(dtype=object)
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', copy=True)
+    pending = np.flatnonzero(np.isnan(numbers) & pd.notna(raw))
+    if pending.size:
+        text = pd.Series(raw[pending]).astype(str).str.replace(',', '', regex=False)
+        scale = np.select(
+            [text.str.contains(unit, regex=False) for unit, _ in NUMBER_UNITS],
+            [factor for _, factor in NUMBER_UNITS],
+            default=1.0
+        )
+        text = text.str.replace('[万亿]', '', regex=True)
+        numbers[pending] = pd.to_numeric(text, errors='coerce').to_numpy() * scale
+    numbers[np.isnan(numbers)] = 0.0
+    return pd.Series(numbers, index=values.index)
+
+
+def exchange_of(symbol: str) -> str:
+    """六位代码所属交易所：SSE / SZSE / BSE，无法识别时为 UNKNOWN"""
+    symbol = str(symbol)
+    for prefix, exchange in EXCHANGE_PREFIXES:
+        if symbol.startswith(prefix):
+            return exchange
+    return 'UNKNOWN'
+
+
+def exchange_by_symbol(symbols: pd.Series) -> np.ndarray:
+    """向量化版 exchange_of"""
+    symbols = symbols.astype(str)
+    return np.select(
+        [symbols.str.startswith(prefix) for prefix, _ in EXCHANGE_PREFIXES],
+        [exchange for _, exchange in EXCHANGE_PREFIXES],
+        default='UNKNOWN'
+    )
+
+
+def board_by_symbol(symbols: pd.Series) -> np.ndarray:
+    """按代码前缀划分板块：科创板 / 创业板 / 北交所 / 主板"""
+    symbols = symbols.astype(str)
+    return np.select(
+        [symbols.str.startswith('688'), symbols.str.startswith(('300', '301')),
+         symbols.str.startswith(('4', '8', '92'))],
+        ['科创板', '创业板', '北交所'],
+        default='主板'
+    )
+
+
+def normalize_spot_table(df: pd.DataFrame) -> pd.DataFrame:
+    """ak.stock_zh_a_spot_em() → symbol/name + float64 数值列"""
+    out = pd.DataFrame({
+        'symbol': df['代码'].astype(str).to_numpy(),
+        'name': df['名称'].astype(str).to_numpy(),
+    })
+    for cn, en in SPOT_COLUMNS.items():
+        if en in ('symbol', 'name'):
+            continue
+        out[en] = parse_number_series(df[cn]).to_numpy() if cn in df.columns else 0.0
+    return out
+
+
+def normalize_stock_list(df: pd.DataFrame) -> pd.DataFrame:
+    """ak.stock_info_a_code_name() → 股票基础信息表"""
+    symbols = df['code'].astype(str)
+    n = len(df)
+    return pd.DataFrame({
+        'symbol': symbols.to_numpy(),
+        'name': df['name'].astype(str).to_numpy(),
+        'exchange': exchange_by_symbol(symbols),
+        'industry': [''] * n,
+        'market_type': board_by_symbol(symbols),
+        'listing_date': [''] * n,
+        'total_shares': np.zeros(n),
+        'circulating_shares': np.zeros(n),
+        'pe_ratio': np.zeros(n),
+        'pb_ratio': np.zeros(n),
+        'market_cap': np.zeros(n),
+        'circulating_market_cap': np.zeros(n),
+    })
+
+
+def to_ts_code(symbol: str) -> str:
+    """六位代码 → Tushare ts_code：600000 → 600000.SH，000001 → 000001.SZ，830799 → 830799.BJ"""
+    symbol = str(symbol)
+    if '.' in symbol:
+        return symbol.upper()
+    return f'{symbol}.{EXCHANGE_SUFFIXES.get(exchange_of(symbol), "SZ")}'
+
+
+def from_ts_code(ts_code: str) -> str:
+    """Tushare ts_code → 六位代码：000001.SZ → 000001"""
+    return str(ts_code).split('.')[0]
+
+
+# 东财业绩报表（ak.stock_yjbb_em，一个报告期一张全市场表）→ 统一字段
+FINANCIAL_COLUMNS = {
+    '每股收益': 'eps',
+    '营业总收入-营业总收入': 'revenue',
+    '营业总收入-同比增长': 'revenue_yoy',
+    '净利润-净利润': 'net_profit',
+    '净利润-同比增长': 'net_profit_yoy',
+    '每股净资产': 'bvps',
+    '净资产收益率': 'roe',
+    '每股经营现金流量': 'ocfps',
+    '销售毛利率': 'gross_margin',
+}
+
+# 上游以百分数给出的字段，规整为比例（12.5 → 0.125）
+FINANCIAL_PERCENT_COLUMNS = ('revenue_yoy', 'net_profit_yoy', 'roe', 'gross_margin')
+
+
+def normalize_financial_report(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    ak.stock_yjbb_em(date=period) → symbol/report_date/announce_date + float64 财务字段
+    与行情表不同，缺失值保留为 NaN（筛选时不满足任何条件），不记为 0
+    """
+    announced = df['最新公告日期'] if '最新公告日期' in df.columns else pd.Series(pd.NaT, index=df.index)
+    out = pd.DataFrame({
+        'symbol': df['股票代码'].astype(str).str.zfill(6).to_numpy(),
+        'report_date': pd.Timestamp(period).as_unit('ns'),
+        'announce_date': pd.to_datetime(announced, errors='coerce').to_numpy(),
+    })
+    for cn, en in FINANCIAL_COLUMNS.items():
+        values = pd.to_numeric(df[cn], errors='coerce').to_numpy(dtype='float64') if cn in df.columns else np.nan
+        out[en] = values / 100 if en in FINANCIAL_PERCENT_COLUMNS else values
+    return out.drop_duplicates(subset=['symbol'], keep='last').reset_index(drop=True)
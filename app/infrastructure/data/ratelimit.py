@@ -0,0 +1,92 @@
+"""
+数据源限流：令牌桶（按“积分/分钟”配额）+ 配额超限时的重试退避
+
+令牌桶采用预约方式：acquire 在锁内扣减令牌（可透支），算出需要等待的时间后在锁外 sleep，
+因此可在多个事件循环 / 线程之间共享同一个桶，排队顺序即预约顺序。
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    令牌桶
+    :param rate_per_minute: 每分钟补充的令牌（积分）数
+    :param capacity: 桶容量（允许的突发量），默认等于 rate_per_minute
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, cost: float = 1.0) -> float:
+        """扣减 cost 个令牌，返回调用方需要等待的秒数（0 表示立即可用）"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= cost
+            self.acquired += 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.waited_seconds += wait
+            return wait
+
+    async def acquire(self, cost: float = 1.0):
+        wait = self.reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def drain(self):
+        """上游明确返回配额超限时清空令牌，后续调用重新按速率排队"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_minute': self.rate * 60,
+                'capacity': self.capacity,
+                'tokens': round(self._tokens, 2),
+                'acquired': self.acquired,
+                'waited_seconds': round(self.waited_seconds, 3),
+            }
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 60.0) -> float:
+    """第 attempt 次重试（从 0 开始）的退避时间：指数增长 + 抖动"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate_per_minute: float) -> TokenBucket:
+    """按数据源名称获取（首次调用时创建）进程内共享的令牌桶"""
+    with _registry_lock:
+        bucket = _buckets.get(name)
+        if bucket is None:
+            bucket = TokenBucket(rate_per_minute)
+            _buckets[name] = bucket
+        return bucket
+
+
+def rate_limiter_stats() -> Dict[str, dict]:
+    return {name: bucket.stats() for name, bucket in _buckets.items()}
@@ -1,4 +1,25 @@
-from .tushare import TushareDataSource
-from .eastmoney import EastMoneyDataSource
+"""
+数据源适配器；类按需导入（PEP 562），导入本包不会加载任何数据源模块
+"""
+import importlib
 
-__all__ = ['TushareDataSource', 'EastMoneyDataSource']
+from .registry import available_sources, create_source, get_source_class, register_source
+
+_LAZY_EXPORTS = {
+    'TushareDataSource': '.tushare',
+    'EastMoneyDataSource': '.eastmoney',
+    'SyntheticDataSource': '.synthetic',
+    'CompositeDataSource': '.composite',
+    'create_data_source': '.composite',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+__all__ = ['TushareDataSource', 'EastMoneyDataSource', 'SyntheticDataSource', 'CompositeDataSource',
+           'create_data_source', 'available_sources', 'create_source', 'get_source_class', 'register_source']
@@ -0,0 +1,202 @@
+"""
+主备组合数据源：东财为主、Tushare 为备，K 线请求对冲（hedged request）+ 按数据源熔断
+
+- 对冲：先请求主源；主源在“近期耗时的 p95”内没有返回（或抛出异常）时，向备源发出同样的请求，
+  先拿到结果的一方胜出，另一方被取消。慢请求只占少数，备源的额外调用量约为 (100 - p95)%
+- 空表表示“没有数据”（无效 / 退市 / 停牌代码），不算失败：直接返回，不切换备源，也不计入熔断
+- 熔断：每个数据源一个熔断器，连续异常 / 超时后在冷却期内直接跳过该数据源
+- 耗时样本包括失败和被取消的请求（被对冲取消的主源请求至少按对冲延迟计），避免 p95 只统计快请求而偏低
+- 两个数据源的 K 线统一为 date/open/high/low/close/volume(手)/amount(元)，代码统一为六位代码
+  （Tushare 一侧由 TushareDataSource.get_kline_frame 完成 000001 ↔ 000001.SZ 的转换与规整）
+
+K 线之外的接口全部委托给主源。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.infrastructure.data.circuit import CircuitBreaker
+from app.infrastructure.data.sources.registry import create_source
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """最近 window 次调用的耗时，用于计算对冲延迟"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype='float64'), q))
+
+
+class CompositeDataSource:
+    """
+    主备组合数据源
+    :param primary: 主源（EastMoneyDataSource 或其子类）
+    :param secondary: 备源（TushareDataSource）
+    两者的 get_kline_frame 都在失败时抛出异常、没有数据时返回空表
+    :param percentile: 以主源耗时的第几百分位作为对冲延迟
+    :param min_delay / max_delay: 对冲延迟的上下限（秒）
+    :param default_delay: 样本不足 min_samples 时使用的对冲延迟（秒）
+    """
+
+    def __init__(self, primary, secondary, percentile: Optional[float] = None,
+                 min_delay: Optional[float] = None, max_delay: Optional[float] = None,
+                 default_delay: Optional[float] = None, min_samples: int = 20,
+                 failure_threshold: Optional[int] = None, reset_seconds: Optional[float] = None):
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile if percentile is not None else settings.KLINE_HEDGE_PERCENTILE
+        self.min_delay = min_delay if min_delay is not None else settings.KLINE_HEDGE_MIN_DELAY_SECONDS
+        self.max_delay = max_delay if max_delay is not None else settings.KLINE_HEDGE_MAX_DELAY_SECONDS
+        self.default_delay = (default_delay if default_delay is not None
+                              else settings.KLINE_HEDGE_DEFAULT_DELAY_SECONDS)
+        self.min_samples = min_samples
+        threshold = failure_threshold if failure_threshold is not None else settings.CIRCUIT_FAILURE_THRESHOLD
+        reset = reset_seconds if reset_seconds is not None else settings.CIRCUIT_RESET_SECONDS
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(name, threshold, reset) for name in ('primary', 'secondary')
+        }
+        self.latency: Dict[str, LatencyTracker] = {'primary': LatencyTracker(), 'secondary': LatencyTracker()}
+        self.requests = 0
+        self.hedged = 0
+        self.wins = {'primary': 0, 'secondary': 0}
+        self.failures = {'primary': 0, 'secondary': 0}
+
+    def __getattr__(self, name: str):
+        # 只在自身没有该属性时调用：K 线之外的接口委托给主源
+        if name == 'primary':
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    def hedge_delay(self) -> float:
+        """主源多久没返回就向备源发出对冲请求"""
+        tracker = self.latency['primary']
+        if len(tracker) < self.min_samples:
+            return self.default_delay
+        return min(max(tracker.percentile(self.percentile), self.min_delay), self.max_delay)
+
+    # ------------ K 线 ------------
+    async def get_stock_kline(self, symbol: str, freq: str = 'daily', limit: int = 30,
+                              adjust: str = '') -> pd.DataFrame:
+        """
+        获取单只股票 K 线：主源超时 / 失败时由备源补位；没有数据或两者都失败时返回空表
+        返回结构与 EastMoneyDataSource.get_stock_kline 相同
+        """
+        self.requests += 1
+        attempts = [
+            ('primary', lambda: self.primary.get_kline_frame(symbol, freq, limit, adjust)),
+            ('secondary', lambda: self.secondary.get_kline_frame(symbol, freq, limit, adjust)),
+        ]
+        candidates = [(name, fn) for name, fn in attempts if self.breakers[name].allow()]
+        if not candidates:
+            logger.warning(f"K 线数据源均已熔断，仍尝试主源 {symbol}")
+            candidates = attempts[:1]
+
+        pending: Dict[asyncio.Task, str] = {}
+        empty: Optional[pd.DataFrame] = None
+
+        def launch():
+            name, fn = candidates.pop(0)
+            pending[asyncio.ensure_future(self._attempt(name, fn, symbol))] = name
+
+        launch()
+        try:
+            while pending:
+                timeout = self.hedge_delay() if candidates else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # 主源超过对冲延迟仍未返回
+                    self.hedged += 1
+                    launch()
+                    continue
+                for task in done:
+                    name = pending.pop(task)
+                    df = task.result()
+                    if df is None:
+                        continue
+                    if not df.empty:
+                        self.wins[name] += 1
+                        return df
+                    # 没有数据：不再发起新的请求，只等已在途的另一方
+                    empty = df
+                    candidates.clear()
+                if candidates and not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if empty is not None:
+            return empty
+        logger.error(f"K 线主备数据源均失败 {symbol}")
+        return pd.DataFrame()
+
+    async def _attempt(self, name: str, fn: Callable[[], Awaitable[pd.DataFrame]],
+                       symbol: str) -> Optional[pd.DataFrame]:
+        """执行一次请求并记录耗时与熔断状态；异常 / 超时返回 None，空表原样返回（不算失败）"""
+        breaker = self.breakers[name]
+        started = time.perf_counter()
+        try:
+            df = await fn()
+        except asyncio.CancelledError:
+            # 被对冲取消：真实耗时未知，至少已经超过对冲延迟
+            elapsed = time.perf_counter() - started
+            self.latency[name].record(max(elapsed, self.hedge_delay()) if name == 'primary' else elapsed)
+            raise
+        except Exception as e:
+            self.latency[name].record(time.perf_counter() - started)
+            logger.warning(f"K 线数据源 {name} 失败 {symbol}: {e}")
+            self.failures[name] += 1
+            breaker.record_failure()
+            return None
+        self.latency[name].record(time.perf_counter() - started)
+        breaker.record_success()
+        return df if df is not None else pd.DataFrame()
+
+    # ------------ 统计 ------------
+    def stats(self) -> dict:
+        return {
+            'requests': self.requests,
+            'hedged': self.hedged,
+            'hedge_delay': round(self.hedge_delay(), 4),
+            'wins': dict(self.wins),
+            'failures': dict(self.failures),
+            'breakers': {name: b.stats() for name, b in self.breakers.items()},
+        }
+
+    def cache_stats(self) -> dict:
+        return {**self.primary.cache_stats(), 'kline_hedge': self.stats()}
+
+
+def create_data_source():
+    """
+    按配置创建默认数据源（DATA_SOURCE，默认东财）；主源为东财、KLINE_HEDGE_ENABLED 且配置了
+    TU_SHARE_TOKEN 时为东财 + Tushare 主备组合。只导入实际用到的数据源模块
+    """
+    primary = create_source(settings.DATA_SOURCE)
+    if settings.DATA_SOURCE != 'eastmoney' or not settings.KLINE_HEDGE_ENABLED or not settings.TU_SHARE_TOKEN:
+        return primary
+    try:
+        secondary = create_source('tushare', token=settings.TU_SHARE_TOKEN)
+    except Exception as e:
+        logger.warning(f"Tushare 备源初始化失败，K 线只使用东财: {e}")
+        return primary
+    return CompositeDataSource(primary, secondary)
@@ -3,21 +3,108 @@
 EastMoney 数据源（整合版，支持自定义 K 线数量 limit）
 """
 
-import akshare as ak
 import pandas as pd
 import asyncio
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import date, datetime
 import logging
 
+from app.core.config import settings
+from app.core.metrics import instrument, timer
+from app.infrastructure.data.adjust import apply_adjustment, has_ex_rights, normalize_factors, sina_symbol
+from app.infrastructure.data.calendar import MARKET_CLOSE, TradingCalendarStore, get_calendar_store
+from app.infrastructure.data.cassette import get_cassette, use_cassette
+from app.infrastructure.data.cache.snapshot_cache import MarketSnapshotCache
+from app.infrastructure.data.executor import SourceExecutor, get_executor
+from app.infrastructure.data.lazy import LazyModule
+from app.infrastructure.data.normalize import (
+    NUMBER_UNITS, exchange_of, normalize_financial_report, normalize_spot_table, normalize_stock_list
+)
+from app.infrastructure.data.storage.financial_store import FinancialStore
+from app.infrastructure.data.storage.kline_store import KLineStore, BAR_COLUMNS, aggregate_bars, period_labels
+
+# akshare 导入较慢，第一次调用上游时才导入
+ak = LazyModule('akshare')
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 class EastMoneyDataSource:
-    def __init__(self):
-        pass
+    def __init__(self, kline_store: Optional[KLineStore] = None,
+                 snapshot_cache: Optional[MarketSnapshotCache] = None,
+                 executor: Optional[SourceExecutor] = None,
+                 calendar_store: Optional[TradingCalendarStore] = None,
+                 financial_store: Optional[FinancialStore] = None,
+                 bulk_executor: Optional[SourceExecutor] = None):
+        self._ak = None
+        self.cassette = None
+        self.executor = executor or get_executor('eastmoney', settings.EASTMONEY_MAX_IN_FLIGHT)
+        # 后台批量回源（行业板块成分、财务报告期同步）单独排队，不挤占请求路径
+        self.bulk_executor = bulk_executor or get_executor('eastmoney-bulk', settings.EASTMONEY_BULK_MAX_IN_FLIGHT)
+        self.kline_store = kline_store or KLineStore(settings.KLINE_STORE_DIR)
+        self.calendar_store = calendar_store or get_calendar_store()
+        self.snapshot_cache = snapshot_cache or MarketSnapshotCache(
+            loader=self._load_spot_table, ttl=settings.SNAPSHOT_TTL_SECONDS, key_column='symbol'
+        )
+        # A 股列表一天内基本不变，与行情快照共用同一套缓存实现
+        self.universe_cache = MarketSnapshotCache(
+            loader=self._load_stock_list, ttl=settings.UNIVERSE_TTL_SECONDS, key_column='symbol'
+        )
+        self.industry_cache = MarketSnapshotCache(
+            loader=self._load_industry_map, ttl=settings.INDUSTRY_REFRESH_SECONDS, key_column='symbol'
+        )
+        # 财务数据：本地按报告期存储，回源只补新披露的报告期；按 symbol 建的索引指向该股最近一期
+        self.financial_store = financial_store or FinancialStore(settings.FINANCIAL_STORE_DIR)
+        # 平时由后台任务按 FINANCIAL_REFRESH_SECONDS 刷新，TTL 放宽一倍，避免请求路径上回源
+        self.financial_cache = MarketSnapshotCache(
+            loader=self._load_financials, ttl=settings.FINANCIAL_REFRESH_SECONDS * 2, key_column='symbol'
+        )
+        # CASSETTE_MODE 开启时上游调用走录制 / 回放
+        cassette = get_cassette()
+        if cassette is not None:
+            use_cassette(self, cassette)
+
+    @property
+    def ak(self):
+        """上游 akshare 模块；可替换为录制 / 回放代理（见 cassette.use_cassette）"""
+        return self._ak if self._ak is not None else ak
+
+    @ak.setter
+    def ak(self, module):
+        self._ak = module
+
+    def _call(self, api: str, *args, **kwargs):
+        """在线程池中调用 akshare 接口 api；属性在这里才取，首次导入 akshare 不会落在事件循环上"""
+        with timer('eastmoney', api):
+            return getattr(self.ak, api)(*args, **kwargs)
 
+    @instrument("eastmoney")
+    async def warm_up(self):
+        """预热股票列表、全市场快照与交易日历，失败只记日志"""
+        results = await asyncio.gather(self.universe_cache.get(), self.snapshot_cache.get(),
+                                       self.executor.run(self.calendar_store.get),
+                                       return_exceptions=True)
+        for name, result in zip(('universe', 'snapshot', 'calendar'), results):
+            if isinstance(result, Exception):
+                logger.warning(f"预热 {name} 失败: {result}")
+            else:
+                rows = 0 if result is None else len(getattr(result, 'frame', result))
+                logger.info(f"预热 {name} 完成，{rows} 条")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            'universe': self.universe_cache.stats(),
+            'industry': self.industry_cache.stats(),
+            'snapshot': self.snapshot_cache.stats(),
+            'financial': self.financial_cache.stats(),
+            'financial_store': self.financial_store.stats(),
+            'kline_store': {'root': str(self.kline_store.root)},
+            'calendar': self.calendar_store.stats(),
+            **({'cassette': self.cassette.stats()} if self.cassette is not None else {}),
+        }
+
+    @instrument("eastmoney")
     async def get_stock_basic(self, symbol: str = None) -> Optional[List[Dict[str, Any]]]:
         try:
             result = []
@@ -35,7 +122,7 @@ class EastMoneyDataSource:
 
     async def _fetch_single_stock(self, symbol: str) -> List[Dict[str, Any]]:
         try:
-            stock_info = ak.stock_individual_info_em(symbol)
+            stock_info = await self.executor.run(self._call, 'stock_individual_info_em', symbol)
             if not stock_info.empty:
                 data = stock_info.to_dict('records')[0]
                 return [{
@@ -58,119 +145,294 @@ class EastMoneyDataSource:
 
     async def _fetch_all_stocks(self) -> List[Dict[str, Any]]:
         try:
-            stock_list = ak.stock_info_a_code_name()
-            if not stock_list.empty:
-                result = []
-                for _, row in stock_list.iterrows():
-                    result.append({
-                        'symbol': row['code'],
-                        'name': row['name'],
-                        'exchange': self._get_exchange_by_symbol(row['code']),
-                        'industry': '',
-                        'market_type': '',
-                        'listing_date': '',
-                        'total_shares': 0,
-                        'circulating_shares': 0,
-                        'pe_ratio': 0,
-                        'pb_ratio': 0,
-                        'market_cap': 0,
-                        'circulating_market_cap': 0
-                    })
-                return result
+            universe = await self.universe_cache.get()
+            if universe is not None:
+                return universe.frame.to_dict('records')
         except Exception as e:
             logger.error(f"获取全部A股列表失败: {e}")
         return []
 
+    @instrument("eastmoney")
+    async def _load_stock_list(self) -> pd.DataFrame:
+        return await self.executor.run(self._fetch_stock_list)
+
+    def _fetch_stock_list(self) -> pd.DataFrame:
+        with timer('eastmoney', 'stock_info_a_code_name'):
+            stock_list = self.ak.stock_info_a_code_name()
+        return normalize_stock_list(stock_list) if not stock_list.empty else stock_list
+
+    @instrument("eastmoney")
+    async def get_universe(self, refresh: bool = False) -> pd.DataFrame:
+        """A 股列表（列式），refresh=True 时忽略 TTL 立即回源"""
+        try:
+            universe = await (self.universe_cache.refresh() if refresh else self.universe_cache.get())
+            return universe.frame if universe is not None else pd.DataFrame()
+        except Exception as e:
+            logger.error(f"获取全部A股列表失败: {e}")
+            return pd.DataFrame()
+
+    @instrument("eastmoney")
+    async def get_industry_map(self, refresh: bool = False) -> pd.DataFrame:
+        """东财行业板块成分：symbol → industry"""
+        try:
+            industries = await (self.industry_cache.refresh() if refresh else self.industry_cache.get())
+            if industries is not None:
+                return industries.frame
+        except Exception as e:
+            logger.error(f"获取行业板块成分失败: {e}")
+        return pd.DataFrame(columns=['symbol', 'industry'])
+
+    @instrument("eastmoney")
+    async def _load_industry_map(self) -> pd.DataFrame:
+        boards = await self.bulk_executor.run(self._call, 'stock_board_industry_name_em')
+        if boards is None or boards.empty:
+            return pd.DataFrame(columns=['symbol', 'industry'])
+
+        async def members(board: str) -> Optional[pd.DataFrame]:
+            try:
+                cons = await self.bulk_executor.run(self._call, 'stock_board_industry_cons_em', symbol=board)
+                return pd.DataFrame({'symbol': cons['代码'].astype(str), 'industry': board})
+            except Exception as e:
+                logger.warning(f"获取行业板块 {board} 成分失败: {e}")
+                return None
+
+        frames = await asyncio.gather(*(members(board) for board in boards['板块名称']))
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'industry'])
+        return pd.concat(frames, ignore_index=True).drop_duplicates(subset=['symbol'])
+
+    @instrument("eastmoney")
     async def get_stock_realtime_quote(self, symbol: str = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        实时行情：读取共享的全市场快照（TTL 内不回源，并发未命中合并为一次下载），
+        单票查询走 symbol→行号索引；只在这里把列式快照物化为 records
+        """
         try:
-            price_info = ak.stock_zh_a_spot_em()
-            if not price_info.empty:
-                result = []
-                for _, row in price_info.iterrows():
-                    stock_data = {
-                        'symbol': row['代码'],
-                        'name': row['名称'],
-                        'current_price': self._parse_number(row['最新价']),
-                        'change_amount': self._parse_number(row['涨跌额']),
-                        'change_percent': self._parse_number(row['涨跌幅']),
-                        'open_price': self._parse_number(row['开盘']),
-                        'high_price': self._parse_number(row['最高']),
-                        'low_price': self._parse_number(row['最低']),
-                        'prev_close': self._parse_number(row['昨收']),
-                        'volume': self._parse_number(row['成交量']),
-                        'amount': self._parse_number(row['成交额']),
-                        'turnover_rate': self._parse_number(row['换手率']),
-                        'pe_ratio': self._parse_number(row['市盈率']),
-                        'pb_ratio': self._parse_number(row['市净率']),
-                        'market_cap': self._parse_number(row['总市值']),
-                        'circulating_market_cap': self._parse_number(row['流通市值']),
-                        'quote_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                    if symbol and row['代码'] == symbol:
-                        return [stock_data]
-                    result.append(stock_data)
-                return result
-            return []
+            snapshot = await self.snapshot_cache.get()
+            if snapshot is None:
+                return []
+            quote_time = snapshot.fetched_at.strftime('%Y-%m-%d %H:%M:%S')
+            if symbol:
+                pos = snapshot.index.get(symbol)
+                if pos is None:
+                    return []
+                frame = snapshot.frame.iloc[[pos]]
+            else:
+                frame = snapshot.frame
+            return frame.assign(quote_time=quote_time).to_dict('records')
         except Exception as e:
             logger.error(f"东方财富网获取实时行情失败: {e}")
             return []
 
+    @instrument("eastmoney")
+    async def get_market_snapshot(self, max_age: Optional[float] = None) -> pd.DataFrame:
+        """
+        全市场快照（列式，float64 数值列），供进程内批量计算使用
+        :param max_age: 可接受的最大快照年龄（秒），默认按 SNAPSHOT_TTL_SECONDS
+        """
+        snapshot = await self.snapshot_cache.get(max_age)
+        return snapshot.frame if snapshot is not None else pd.DataFrame()
+
+    @instrument("eastmoney")
+    async def _load_spot_table(self) -> pd.DataFrame:
+        return await self.executor.run(self._fetch_spot_table)
+
+    def _fetch_spot_table(self) -> pd.DataFrame:
+        with timer('eastmoney', 'stock_zh_a_spot_em'):
+            raw = self.ak.stock_zh_a_spot_em()
+        return normalize_spot_table(raw)
+
     # ===== 新增 limit 参数 =====
-    async def get_stock_kline(self, symbol: str, freq: str = 'daily', limit: int = 30) -> pd.DataFrame:
+    @instrument("eastmoney")
+    async def get_stock_kline(self, symbol: str, freq: str = 'daily', limit: int = 30,
+                              adjust: str = '') -> pd.DataFrame:
         """
-        获取单只股票 K 线数据
+        获取单只股票 K 线数据（本地日线库 + 水位之后的增量同步）
         :param symbol: 股票代码
         :param freq: 'daily', 'weekly', 'monthly'
         :param limit: 返回条数
-        :return: DataFrame
+        :param adjust: '' 不复权 / 'qfq' 前复权 / 'hfq' 后复权（本地用缓存的复权因子计算）
+        :return: DataFrame；失败时返回空表
         """
         try:
-            # === Step 1: 获取日线数据（东财源）
-            df = ak.stock_zh_a_hist(symbol=symbol, period="daily", start_date="19700101", adjust="")
-
-            if df.empty:
-                logger.warning(f"{symbol} 日线接口返回空表")
-                return pd.DataFrame()
-
-            # === Step 2: 列名统一
-            rename_map = {
-                '日期': 'date', '开盘': 'open', '收盘': 'close', '最高': 'high',
-                '最低': 'low', '成交量': 'volume', '成交额': 'amount'
-            }
-            df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
-
-            if 'date' not in df.columns:
-                logger.error(f"{symbol} 返回的K线数据缺少日期列")
-                return pd.DataFrame()
-
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-            df = df.dropna(subset=['date']).sort_values('date')
-
-            # === Step 3: 周/月份重采样
-            if freq in ['weekly', 'monthly']:
-                df = df.set_index('date')
-                agg_dict = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
-                if 'amount' in df.columns:
-                    agg_dict['amount'] = 'sum'
-                if freq == 'weekly':
-                    df = df.resample('W-MON').agg(agg_dict)
-                else:
-                    df = df.resample('M').agg(agg_dict)
-                df = df.reset_index()
-
-            # === Step 4: 返回最近 limit 条
-            df = df.dropna().tail(limit).reset_index(drop=True)
-
-            return df
-
+            return await self.get_kline_frame(symbol, freq, limit, adjust)
         except Exception:
             logger.exception(f"获取K线数据失败 {symbol}")
             return pd.DataFrame()
 
+    async def get_kline_frame(self, symbol: str, freq: str = 'daily', limit: int = 30,
+                              adjust: str = '') -> pd.DataFrame:
+        """
+        同 get_stock_kline，但失败时抛出异常，空表只表示没有数据（无效 / 退市 / 停牌），供主备切换区分两者
+        """
+        return await self.executor.run(self._load_kline, symbol, freq, limit, adjust)
+
+    @instrument("eastmoney")
+    def _load_kline(self, symbol: str, freq: str, limit: int, adjust: str = '') -> pd.DataFrame:
+        # === Step 1: 本地日线 + 增量同步（东财源）
+        df = self._sync_daily_bars(symbol)
+
+        if df.empty:
+            logger.warning(f"{symbol} 日线接口返回空表")
+            return pd.DataFrame()
+
+        # === Step 2: 复权在本地计算；不复权的周/月线直接读取随日线增量维护的聚合
+        #             （与 resample('W-MON') / resample('M') 等价）
+        if adjust:
+            df = self._adjusted_bars(symbol, df, freq, limit, adjust)
+        elif freq in ['weekly', 'monthly']:
+            df = self.kline_store.read(symbol, freq)
+
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df.dropna(subset=['date']).sort_values('date')
+
+        # === Step 3: 返回最近 limit 条
+        return df.dropna().tail(limit).reset_index(drop=True)
+
+    def _sync_daily_bars(self, symbol: str) -> pd.DataFrame:
+        """
+        读取本地日线；距上次同步超过 KLINE_SYNC_INTERVAL_SECONDS 时，
+        只从水位日（含当日，覆盖可能未收盘的最后一根）开始向上游拉取增量。
+        已在最近交易日收盘后同步过的（如周末、节假日）不再回源
+        """
+        history = self.kline_store.read(symbol)
+        watermark = self.kline_store.get_watermark(symbol)
+
+        if watermark and not history.empty:
+            if self._synced_after_last_close(watermark):
+                return history
+            age = (datetime.now() - watermark['synced_at']).total_seconds()
+            if age < settings.KLINE_SYNC_INTERVAL_SECONDS:
+                return history
+            start_date = watermark['last_date'].strftime('%Y%m%d')
+        else:
+            start_date = "19700101"
+
+        try:
+            raw = self._fetch_daily_history(symbol, start_date)
+        except Exception as e:
+            if history.empty:
+                raise
+            logger.warning(f"{symbol} 增量同步失败，使用本地日线: {e}")
+            return history
+
+        bars = self._normalize_kline(raw)
+        if not history.empty and not bars.empty and '涨跌额' in raw.columns:
+            before = history[pd.to_datetime(history['date']) < bars['date'].iloc[0]]
+            previous_close = before['close'].iloc[-1] if not before.empty else None
+            if has_ex_rights(previous_close, bars, pd.to_numeric(raw['涨跌额'], errors='coerce')):
+                self.kline_store.invalidate_factors(symbol)
+        return self.kline_store.upsert(symbol, bars)
+
+    def _fetch_daily_history(self, symbol: str, start_date: str) -> pd.DataFrame:
+        """上游不复权日线（东财原始列名，含 涨跌额）"""
+        with timer('eastmoney', 'stock_zh_a_hist'):
+            return self.ak.stock_zh_a_hist(symbol=symbol, period="daily", start_date=start_date, adjust="")
+
+    # ------------ 复权 ------------
+    def _adjusted_bars(self, symbol: str, daily: pd.DataFrame, freq: str, limit: int, adjust: str) -> pd.DataFrame:
+        """日线复权后再聚合；周/月线只取覆盖最近 limit 个周期的日线参与计算"""
+        if freq in ['weekly', 'monthly']:
+            periods = self.kline_store.read(symbol, freq)
+            if len(periods) > limit:
+                first_label = pd.to_datetime(periods['date']).iloc[-limit]
+                daily = daily[period_labels(daily['date'], freq) >= first_label]
+        adjusted = apply_adjustment(daily, self._get_adj_factors(symbol), adjust)
+        return aggregate_bars(adjusted, freq) if freq in ['weekly', 'monthly'] else adjusted
+
+    @instrument("eastmoney")
+    def _get_adj_factors(self, symbol: str) -> pd.DataFrame:
+        """本地缓存的后复权因子，缺失（首次 / 除权后失效）时从新浪拉取一次"""
+        factors = self.kline_store.read_factors(symbol)
+        if factors is not None and not factors.empty:
+            return factors
+        factors = normalize_factors(self._fetch_factor_table(symbol))
+        if factors.empty:
+            raise ValueError(f"{symbol} 复权因子为空")
+        self.kline_store.write_factors(symbol, factors)
+        return factors
+
+    def _fetch_factor_table(self, symbol: str) -> pd.DataFrame:
+        """上游后复权因子表（新浪，倒序，date/hfq_factor）"""
+        with timer('eastmoney', 'stock_zh_a_daily'):
+            return self.ak.stock_zh_a_daily(symbol=sina_symbol(symbol), adjust='hfq-factor')
+
+    def _synced_after_last_close(self, watermark: Dict[str, Any]) -> bool:
+        try:
+            latest = self.calendar_store.get().latest()
+        except Exception:
+            return False
+        closed_at = datetime.combine(latest, MARKET_CLOSE)
+        return watermark['last_date'] >= latest and watermark['synced_at'] >= closed_at
+
+    @staticmethod
+    def _normalize_kline(df: pd.DataFrame) -> pd.DataFrame:
+        """东财日线列名统一为 date/open/high/low/close/volume/amount"""
+        if df is None or df.empty:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+
+        rename_map = {
+            '日期': 'date', '开盘': 'open', '收盘': 'close', '最高': 'high',
+            '最低': 'low', '成交量': 'volume', '成交额': 'amount'
+        }
+        df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
+
+        if 'date' not in df.columns:
+            logger.error("返回的K线数据缺少日期列")
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        if 'amount' not in df.columns:
+            df['amount'] = 0.0
+
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df.dropna(subset=['date'])
+        for col in BAR_COLUMNS[1:]:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+        return df[BAR_COLUMNS]
+
+    @instrument("eastmoney")
+    async def get_financials(self, refresh: bool = False) -> pd.DataFrame:
+        """
+        全市场各报告期财务数据（列式，按 symbol、report_date 排序）；
+        refresh=True 时立即增量回源，否则 FINANCIAL_REFRESH_SECONDS 内直接读本地
+        """
+        try:
+            financials = await (self.financial_cache.refresh() if refresh else self.financial_cache.get())
+            if financials is not None:
+                return financials.frame
+        except Exception as e:
+            logger.error(f"获取财务数据失败: {e}")
+        return self.financial_store.read()
+
+    async def _load_financials(self) -> pd.DataFrame:
+        # 可能连续下载多个报告期，走后台批量线程池，不长时间占用请求路径的名额
+        return await self.bulk_executor.run(self._sync_financials)
+
+    def _sync_financials(self) -> pd.DataFrame:
+        """补齐 FINANCIAL_HISTORY_YEARS 年内缺失或仍在披露期的报告期，单期失败只记日志"""
+        today = date.today()
+        start = today.replace(year=today.year - settings.FINANCIAL_HISTORY_YEARS, month=1, day=1)
+        for period in self.financial_store.pending_periods(start, today):
+            try:
+                raw = self._fetch_financial_report(period)
+            except Exception as e:
+                logger.warning(f"获取 {period} 业绩报表失败: {e}")
+                continue
+            if raw is None or raw.empty:
+                continue
+            self.financial_store.write_period(period, normalize_financial_report(raw, period), today)
+            logger.info(f"{period} 业绩报表已更新: {len(raw)} 行")
+        return self.financial_store.read()
+
+    def _fetch_financial_report(self, period: str) -> pd.DataFrame:
+        with timer('eastmoney', 'stock_yjbb_em'):
+            return self.ak.stock_yjbb_em(date=period)
+
+    @instrument("eastmoney")
     async def get_financial_data(self, symbol: str) -> Dict[str, pd.DataFrame]:
         try:
-            loop = asyncio.get_event_loop()
-            indicator = await loop.run_in_executor(None, ak.stock_financial_report_sina, symbol)
+            indicator = await self.executor.run(self._call, 'stock_financial_report_sina', symbol)
             if indicator.empty:
                 logger.warning(f"{symbol} 没有财务指标数据")
                 indicator = pd.DataFrame()
@@ -179,6 +441,7 @@ class EastMoneyDataSource:
             logger.error(f"获取财务数据失败 {symbol}: {e}")
             return {}
 
+    @instrument("eastmoney")
     async def test_connection(self) -> dict:
         try:
             result = await self.get_stock_basic('000001')
@@ -190,12 +453,7 @@ class EastMoneyDataSource:
             return {'success': False, 'error_msg': str(e)}
 
     def _get_exchange_by_symbol(self, symbol: str) -> str:
-        if symbol.startswith('6'):
-            return 'SSE'
-        elif symbol.startswith(('0', '3')):
-            return 'SZSE'
-        else:
-            return 'UNKNOWN'
+        return exchange_of(symbol)
 
     def _parse_number(self, value) -> float:
         if pd.isna(value) or value in ['', '-']:
@@ -205,10 +463,9 @@ class EastMoneyDataSource:
         if isinstance(value, str):
             value = value.replace(',', '')
             try:
-                if '万' in value:
-                    return float(value.replace('万', '')) * 1e4
-                if '亿' in value:
-                    return float(value.replace('亿', '')) * 1e8
+                for unit, scale in NUMBER_UNITS:
+                    if unit in value:
+                        return float(value.replace(unit, '')) * scale
                 return float(value)
             except ValueError:
                 return 0.0
@@ -0,0 +1,40 @@
+"""
+数据源注册表：名字 → "模块:类"，按名字创建数据源时才导入对应模块，没用到的数据源不会被导入
+
+    create_source('eastmoney')
+    create_source('synthetic', n_symbols=500)
+    register_source('mysource', 'mypackage.sources:MyDataSource')   # 接入新的数据源
+"""
+
+import importlib
+from typing import Dict, List, Type, Union
+
+_SOURCES: Dict[str, Union[str, type]] = {
+    'eastmoney': 'app.infrastructure.data.sources.eastmoney:EastMoneyDataSource',
+    'tushare': 'app.infrastructure.data.sources.tushare:TushareDataSource',
+    'synthetic': 'app.infrastructure.data.sources.synthetic:SyntheticDataSource',
+}
+
+
+def register_source(name: str, target: Union[str, type]):
+    """注册数据源：target 为类本身或 "模块路径:类名"（后者在第一次创建时才导入）"""
+    _SOURCES[name] = target
+
+
+def available_sources() -> List[str]:
+    return sorted(_SOURCES)
+
+
+def get_source_class(name: str) -> Type:
+    target = _SOURCES.get(name)
+    if target is None:
+        raise ValueError(f"未知数据源: {name}（可选 {', '.join(available_sources())}）")
+    if isinstance(target, str):
+        module_name, _, class_name = target.partition(':')
+        target = _SOURCES[name] = getattr(importlib.import_module(module_name), class_name)
+    return target
+
+
+def create_source(name: str, **kwargs):
+    """按名字创建数据源实例"""
+    return get_source_class(name)(**kwargs)
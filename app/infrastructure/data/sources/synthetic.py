@@ -0,0 +1,230 @@
+"""
+合成行情数据源：与 EastMoneyDataSource 接口一致、完全离线且可复现，供基准测试与本地演示使用
+
+只替换最底层的上游调用（股票列表 / 全市场行情表 / 不复权日线 / 复权因子 / 行业成分 / 业绩报表），
+返回与 akshare 相同形状（中文列名）的原始表，之后的规整、缓存、本地日线库、增量同步与复权
+都走 EastMoneyDataSource 的真实代码路径。
+
+- 股票池：按真实板块比例生成沪深北代码、行业、上市日期
+- 日线：每只股票以 (seed, symbol) 为种子的几何布朗运动，从“最新收盘价”向前倒推生成，
+  最长覆盖 years 年；同一参数下每次生成完全相同
+- 快照：昨收等于日线最后一根收盘价，每次回源在其上叠加一次小幅随机变动（按回源次数播种）
+"""
+
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.calendar import TradingCalendarStore
+from app.infrastructure.data.executor import SourceExecutor, get_executor
+from app.infrastructure.data.normalize import normalize_spot_table, normalize_stock_list
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.financial_store import FinancialStore
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+# (代码前缀, 号段起点, 号段长度, 占比)；号段互不重叠，否则不同板块会抽到同一代码
+BOARDS = [
+    ('600', 600000, 1000, 0.18), ('601', 601000, 1000, 0.05), ('603', 603000, 1000, 0.10),
+    ('688', 688000, 1000, 0.11), ('000', 0, 1000, 0.08), ('002', 2000, 1000, 0.17),
+    ('300', 300000, 1000, 0.20), ('301', 301000, 600, 0.06), ('83', 830000, 10000, 0.05),
+]
+
+INDUSTRIES = [
+    '银行', '证券', '保险', '房地产开发', '白酒', '食品加工', '医疗器械', '化学制药', '中药', '半导体',
+    '消费电子', '通信设备', '软件开发', 'IT服务', '光伏设备', '电池', '电网设备', '汽车整车', '汽车零部件',
+    '工程机械', '通用设备', '专用设备', '化学原料', '化学制品', '钢铁', '有色金属', '煤炭开采', '电力',
+    '建筑装饰', '交运设备', '物流', '航运港口', '家电', '纺织服饰', '传媒', '游戏', '农牧饲渔',
+]
+
+_NAME_HEAD = '华中东南北新国天金宏长恒海安瑞鼎兴泰信达嘉永正明'
+_NAME_TAIL = ['科技', '股份', '电子', '医药', '实业', '控股', '集团', '智能', '材料', '能源', '环境', '制造']
+
+
+def _seed(*parts) -> int:
+    return zlib.crc32('|'.join(str(p) for p in parts).encode())
+
+
+def synthetic_trading_days(start: str = '1990-12-19', end: Optional[str] = None) -> pd.DatetimeIndex:
+    """合成交易日：工作日去掉元旦与春节附近一周（足以模拟节假日缺口）"""
+    end = end or f"{date.today().year}-12-31"
+    days = pd.bdate_range(start, end)
+    holiday = ((days.month == 1) & (days.day == 1)) | ((days.month == 2) & (days.day >= 10) & (days.day <= 16))
+    return days[~holiday]
+
+
+class SyntheticDataSource(EastMoneyDataSource):
+    """
+    离线合成数据源
+    :param n_symbols: 股票数量
+    :param years: 日线最长年数（上市更晚的股票从上市日开始）
+    :param seed: 随机种子，相同参数生成完全相同的数据
+    :param root: 本地日线库与交易日历目录，默认 data/synthetic
+    """
+
+    def __init__(self, n_symbols: int = 5000, years: int = 30, seed: int = 0,
+                 root: Optional[str] = None, executor: Optional[SourceExecutor] = None, **kwargs):
+        self.n_symbols = n_symbols
+        self.years = years
+        self.seed = seed
+        self.spot_fetches = 0
+        # 与真实日线库分开存放，避免合成数据混入
+        root = Path(root or 'data/synthetic')
+        kline_store = kwargs.pop('kline_store', None) or KLineStore(str(root / 'kline'))
+        calendar_store = kwargs.pop('calendar_store', None) or TradingCalendarStore(
+            str(root / 'calendar.parquet'),
+            loader=lambda: pd.DataFrame({'trade_date': synthetic_trading_days()}),
+        )
+        financial_store = kwargs.pop('financial_store', None) or FinancialStore(str(root / 'financial'))
+        super().__init__(kline_store=kline_store, calendar_store=calendar_store, financial_store=financial_store,
+                         executor=executor or get_executor('synthetic'), **kwargs)
+        self._universe = self._build_universe()
+
+    # ------------ 股票池 ------------
+    def _build_universe(self) -> pd.DataFrame:
+        rng = np.random.default_rng(_seed(self.seed, 'universe'))
+        weights = np.array([b[3] for b in BOARDS])
+        counts = np.floor(weights / weights.sum() * self.n_symbols).astype(int)
+        counts[0] += self.n_symbols - counts.sum()
+
+        codes = []
+        for (prefix, start, size, _), count in zip(BOARDS, counts):
+            picked = np.sort(rng.choice(size, min(count, size), replace=False)) + start
+            codes.extend(f"{c:06d}" for c in picked)
+
+        n = len(codes)
+        names = [_NAME_HEAD[i % len(_NAME_HEAD)] + _NAME_HEAD[(i * 7 + 3) % len(_NAME_HEAD)]
+                 + _NAME_TAIL[(i * 5) % len(_NAME_TAIL)] for i in range(n)]
+        today = pd.Timestamp.today().normalize()
+        list_dates = today - pd.to_timedelta(rng.integers(120, 365 * 34, n), unit='D')
+        frame = normalize_stock_list(pd.DataFrame({'code': codes, 'name': names}))
+        frame['industry'] = rng.choice(INDUSTRIES, n)
+        frame['listing_date'] = list_dates.strftime('%Y%m%d')
+        # 最新收盘价（日线倒推的锚点）与股本
+        frame['last_close'] = np.round(np.exp(rng.normal(2.6, 0.8, n)), 2).clip(1.0, 2000.0)
+        frame['total_shares'] = np.round(np.exp(rng.normal(20.5, 1.2, n)), -4)
+        frame['circulating_shares'] = np.round(frame['total_shares'] * rng.uniform(0.3, 1.0, n), -4)
+        return frame.sort_values('symbol').reset_index(drop=True)
+
+    def _fetch_stock_list(self) -> pd.DataFrame:
+        return self._universe.drop(columns=['last_close']).copy()
+
+    async def _load_industry_map(self) -> pd.DataFrame:
+        return self._universe[['symbol', 'industry']].copy()
+
+    async def _fetch_single_stock(self, symbol: str) -> List[Dict[str, Any]]:
+        row = self._universe[self._universe['symbol'] == symbol]
+        return row.drop(columns=['last_close']).to_dict('records')
+
+    # ------------ 全市场快照 ------------
+    def _fetch_spot_table(self) -> pd.DataFrame:
+        """东财 stock_zh_a_spot_em 形状的行情表（中文列名），经真实规整函数转换"""
+        self.spot_fetches += 1
+        u = self._universe
+        n = len(u)
+        rng = np.random.default_rng(_seed(self.seed, 'spot', self.spot_fetches))
+        prev_close = u['last_close'].to_numpy()
+        pct = np.clip(rng.normal(0, 0.02, n), -0.1, 0.1)
+        price = np.round(prev_close * (1 + pct), 2)
+        open_ = np.round(prev_close * (1 + np.clip(rng.normal(0, 0.01, n), -0.1, 0.1)), 2)
+        high = np.maximum.reduce([price, open_, np.round(price * (1 + rng.uniform(0, 0.02, n)), 2)])
+        low = np.minimum.reduce([price, open_, np.round(price * (1 - rng.uniform(0, 0.02, n)), 2)])
+        volume = np.round(np.exp(rng.normal(11, 1.2, n)))
+        raw = pd.DataFrame({
+            '代码': u['symbol'], '名称': u['name'],
+            '最新价': price, '涨跌额': np.round(price - prev_close, 2), '涨跌幅': np.round(pct * 100, 2),
+            '开盘': open_, '最高': high, '最低': low, '昨收': prev_close,
+            '成交量': volume, '成交额': np.round(volume * 100 * price, 2),
+            '换手率': np.round(volume * 100 / u['circulating_shares'].to_numpy() * 100, 2),
+            '市盈率': np.round(rng.normal(30, 20, n), 2), '市净率': np.round(np.abs(rng.normal(3, 2, n)), 2),
+            '总市值': np.round(price * u['total_shares'].to_numpy()),
+            '流通市值': np.round(price * u['circulating_shares'].to_numpy()),
+        })
+        return normalize_spot_table(raw)
+
+    # ------------ 日线 ------------
+    def history(self, symbol: str) -> pd.DataFrame:
+        """某只股票的完整合成日线（东财 stock_zh_a_hist 原始列名）"""
+        row = self._universe[self._universe['symbol'] == symbol]
+        if row.empty:
+            return pd.DataFrame()
+        row = row.iloc[0]
+        first = max(pd.Timestamp(row['listing_date']), pd.Timestamp.today() - pd.DateOffset(years=self.years))
+        days = self.calendar_store.get().between(first, date.today())
+        n = len(days)
+        if n == 0:
+            return pd.DataFrame()
+
+        rng = np.random.default_rng(_seed(self.seed, 'hist', symbol))
+        returns = rng.normal(0.0002, 0.022, n)
+        # 从最后一根收盘价向前倒推：close[i] = last * exp(-sum(returns[i+1:]))
+        tail = np.concatenate([np.cumsum(returns[::-1])[::-1][1:], [0.0]])
+        close = np.round(row['last_close'] * np.exp(-tail), 2).clip(0.01)
+        prev = np.concatenate([[close[0]], close[:-1]])
+        open_ = np.round(prev * np.exp(rng.normal(0, 0.006, n)), 2).clip(0.01)
+        high = np.round(np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, n)), 2)
+        low = np.round(np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, n)), 2).clip(0.01)
+        volume = np.round(np.exp(rng.normal(11, 0.8, n)))
+        return pd.DataFrame({
+            '日期': pd.DatetimeIndex(days).strftime('%Y-%m-%d'),
+            '股票代码': symbol,
+            '开盘': open_, '收盘': close, '最高': high, '最低': low,
+            '成交量': volume, '成交额': np.round(volume * 100 * close, 2),
+            '涨跌额': np.round(close - prev, 2),
+        })
+
+    def _fetch_daily_history(self, symbol: str, start_date: str) -> pd.DataFrame:
+        hist = self.history(symbol)
+        if hist.empty:
+            return hist
+        return hist[hist['日期'] >= pd.Timestamp(start_date).strftime('%Y-%m-%d')].reset_index(drop=True)
+
+    def _fetch_factor_table(self, symbol: str) -> pd.DataFrame:
+        # 合成日线没有除权除息，复权因子恒为 1
+        row = self._universe[self._universe['symbol'] == symbol]
+        listed = pd.Timestamp(row['listing_date'].iloc[0]) if not row.empty else pd.Timestamp('1990-12-19')
+        return pd.DataFrame({'date': [listed.strftime('%Y-%m-%d')], 'hfq_factor': ['1.0']})
+
+    # ------------ 财务 ------------
+    def _fetch_financial_report(self, period: str) -> pd.DataFrame:
+        """东财 stock_yjbb_em 形状的业绩报表（中文列名，百分比字段为百分数），只含报告期前上市的股票"""
+        u = self._universe[self._universe['listing_date'] <= period]
+        n = len(u)
+        rng = np.random.default_rng(_seed(self.seed, 'yjbb', period))
+        # 累计口径：一季报约为全年的 1/4
+        ytd = pd.Timestamp(period).quarter / 4
+        bvps = np.round(np.exp(rng.normal(1.6, 0.5, n)), 2)
+        roe = np.round(rng.normal(9, 7, n) * ytd, 2)
+        shares = u['total_shares'].to_numpy()
+        eps = np.round(bvps * roe / 100, 3)
+        revenue = np.round(np.exp(rng.normal(21.5, 1.5, n)) * ytd, -2)
+        return pd.DataFrame({
+            '序号': np.arange(1, n + 1), '股票代码': u['symbol'].to_numpy(), '股票简称': u['name'].to_numpy(),
+            '每股收益': eps,
+            '营业总收入-营业总收入': revenue,
+            '营业总收入-同比增长': np.round(rng.normal(8, 20, n), 2),
+            '营业总收入-季度环比增长': np.round(rng.normal(2, 15, n), 2),
+            '净利润-净利润': np.round(eps * shares, -2),
+            '净利润-同比增长': np.round(rng.normal(5, 40, n), 2),
+            '净利润-季度环比增长': np.round(rng.normal(2, 30, n), 2),
+            '每股净资产': bvps, '净资产收益率': roe,
+            '每股经营现金流量': np.round(rng.normal(0.6, 0.8, n) * ytd, 3),
+            '销售毛利率': np.round(rng.uniform(5, 60, n), 2),
+            '所处行业': u['industry'].to_numpy(),
+            '最新公告日期': (pd.Timestamp(period) + pd.Timedelta(days=30)).strftime('%Y-%m-%d'),
+        })
+
+    async def get_financial_data(self, symbol: str) -> Dict[str, pd.DataFrame]:
+        rng = np.random.default_rng(_seed(self.seed, 'financial', symbol))
+        periods = pd.date_range(end=pd.Timestamp.today(), periods=12, freq='QE')
+        return {'indicator': pd.DataFrame({
+            '报告日': periods.strftime('%Y%m%d'),
+            '每股收益': np.round(rng.normal(0.5, 0.4, len(periods)), 3),
+            '净资产收益率': np.round(rng.normal(8, 6, len(periods)), 2),
+        })}
+
+    async def test_connection(self) -> dict:
+        return {'success': True, 'error_msg': ''}
@@ -1,24 +1,67 @@
+import asyncio
 import os
-import tushare as ts
 import pandas as pd
 from typing import Dict, Any, Optional, List
-import asyncio
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
 
+from app.core.config import settings
+from app.core.exceptions import DataSourceException
+from app.core.metrics import instrument, upstream
+from app.infrastructure.data.adjust import apply_adjustment, normalize_factors
+from app.infrastructure.data.calendar import TradingCalendarStore, get_calendar_store
+from app.infrastructure.data.cassette import get_cassette, use_cassette
+from app.infrastructure.data.executor import SourceExecutor, get_executor
+from app.infrastructure.data.lazy import LazyModule
+from app.infrastructure.data.normalize import from_ts_code, to_ts_code
+from app.infrastructure.data.ratelimit import TokenBucket, backoff_delay, get_rate_limiter
+from app.infrastructure.data.storage.kline_store import BAR_COLUMNS, aggregate_bars
+
+# tushare 导入较慢，创建 TushareDataSource 时才导入
+ts = LazyModule('tushare')
+
 logger = logging.getLogger(__name__)
 
+# pro.daily 字段 → 本地日线列（与东财日线同单位：成交量 手，成交额 元）
+DAILY_FIELDS = 'ts_code,trade_date,open,high,low,close,vol,amount'
+
+# 每个周期大约包含的交易日数，用于估算 limit 根周/月线需要的日线区间
+_BARS_PER_PERIOD = {'daily': 1, 'weekly': 5, 'monthly': 23}
+
+
+def daily_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """pro.daily 返回 → symbol/date/open/high/low/close/volume/amount（成交量 手，成交额 元）"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=['symbol'] + BAR_COLUMNS)
+    return pd.DataFrame({
+        'symbol': df['ts_code'].map(from_ts_code),
+        'date': pd.to_datetime(df['trade_date'], format='%Y%m%d').dt.date,
+        'open': df['open'], 'high': df['high'], 'low': df['low'], 'close': df['close'],
+        'volume': df['vol'],
+        'amount': df['amount'] * 1000,  # 千元 → 元
+    })
+
+
+def is_quota_exceeded(error: Exception) -> bool:
+    """Tushare 分钟/小时级配额超限（“抱歉，您每分钟最多访问该接口500次”）；每日配额用尽不重试"""
+    message = str(error)
+    return '最多访问' in message and '每天' not in message
+
 
 class TushareDataSource:
     """Tushare数据源适配器"""
 
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, executor: Optional[SourceExecutor] = None,
+                 rate_limiter: Optional[TokenBucket] = None, calendar_store: Optional[TradingCalendarStore] = None):
         """
         初始化Tushare数据源
 
         Args:
             token: Tushare API token，可选。如果不传则自动从 .env 或环境变量读取 TU_SHARE_TOKEN
+            executor: 执行阻塞调用的线程池，默认使用进程内共享的 'tushare' 执行器
+            rate_limiter: 积分令牌桶，默认使用进程内共享的 'tushare' 令牌桶（TUSHARE_POINTS_PER_MINUTE）
+            calendar_store: 交易日历，默认使用进程内共享的上交所日历
         """
         if not token:
             load_dotenv()
@@ -30,11 +73,47 @@ class TushareDataSource:
         self.token = token
         ts.set_token(token)
         self.pro = ts.pro_api()
+        self.executor = executor or get_executor('tushare', settings.TUSHARE_MAX_IN_FLIGHT)
+        self.rate_limiter = rate_limiter or get_rate_limiter('tushare', settings.TUSHARE_POINTS_PER_MINUTE)
+        self.calendar_store = calendar_store or get_calendar_store()
+        self._ts = None
+        # CASSETTE_MODE 开启时上游调用走录制 / 回放
+        cassette = get_cassette()
+        if cassette is not None:
+            use_cassette(self, cassette)
+
+    @property
+    def ts(self):
+        """tushare 模块（实时行情等非 pro 接口）；可替换为录制 / 回放代理"""
+        return self._ts if self._ts is not None else ts
+
+    @ts.setter
+    def ts(self, module):
+        self._ts = module
+
+    async def _call(self, api, cost: float = 1.0, **kwargs) -> pd.DataFrame:
+        """
+        调用 pro 接口：先从令牌桶取积分，再进线程池执行；
+        配额超限时清空令牌桶并指数退避重试，最多 TUSHARE_MAX_RETRIES 次
+        """
+        for attempt in range(settings.TUSHARE_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire(cost)
+            try:
+                return await self.executor.run(upstream('tushare', api), **kwargs)
+            except Exception as e:
+                if not is_quota_exceeded(e) or attempt >= settings.TUSHARE_MAX_RETRIES:
+                    raise
+                self.rate_limiter.drain()
+                delay = backoff_delay(attempt, settings.TUSHARE_RETRY_BACKOFF_SECONDS)
+                logger.warning(f"Tushare 配额超限，{delay:.1f}s 后第 {attempt + 1} 次重试: {e}")
+                await asyncio.sleep(delay)
 
+    @instrument("tushare")
     async def get_stock_basic(self, exchange: str = None, list_status: str = 'L') -> Optional[List[Dict[str, Any]]]:
         """获取股票基本信息"""
         try:
-            df = self.pro.stock_basic(
+            df = await self._call(
+                self.pro.stock_basic,
                 exchange=exchange,
                 list_status=list_status,
                 fields='ts_code,symbol,name,area,industry,market,list_date,delist_date,is_hs'
@@ -44,13 +123,15 @@ class TushareDataSource:
             logger.error(f"Tushare获取股票基本信息失败: {e}")
             return []
 
+    @instrument("tushare")
     async def get_stock_quote(self, ts_code: str, trade_date: str = None) -> Optional[Dict[str, Any]]:
         """获取股票行情数据"""
         try:
             if trade_date is None:
-                trade_date = self._get_latest_trade_date()
+                trade_date = await self._get_latest_trade_date()
 
-            df = self.pro.daily(
+            df = await self._call(
+                self.pro.daily,
                 ts_code=ts_code,
                 trade_date=trade_date,
                 fields='ts_code,trade_date,open,high,low,close,pre_close,change,pct_chg,vol,amount'
@@ -60,10 +141,11 @@ class TushareDataSource:
             logger.error(f"Tushare获取股票行情失败: {e}")
             return None
 
+    @instrument("tushare")
     async def get_stock_realtime_quote(self, ts_code: str) -> Optional[Dict[str, Any]]:
         """获取股票实时行情（当日）"""
         try:
-            df = ts.get_realtime_quotes(ts_code)
+            df = await self.executor.run(upstream('tushare', self.ts.get_realtime_quotes), ts_code)
             if df is not None and not df.empty:
                 data = df.to_dict('records')[0]
                 return {
@@ -86,6 +168,7 @@ class TushareDataSource:
             logger.error(f"Tushare获取实时行情失败: {e}")
             return None
 
+    @instrument("tushare")
     async def get_stock_kline(self, ts_code: str, period: str = 'daily',
                               start_date: str = None, end_date: str = None) -> Optional[List[Dict[str, Any]]]:
         """获取股票K线数据"""
@@ -96,47 +179,109 @@ class TushareDataSource:
                 end_date = datetime.now().strftime('%Y%m%d')
 
             if period == 'daily':
-                df = self.pro.daily(ts_code=ts_code, start_date=start_date, end_date=end_date)
+                api = self.pro.daily
             elif period == 'weekly':
-                df = self.pro.weekly(ts_code=ts_code, start_date=start_date, end_date=end_date)
+                api = self.pro.weekly
             elif period == 'monthly':
-                df = self.pro.monthly(ts_code=ts_code, start_date=start_date, end_date=end_date)
+                api = self.pro.monthly
             else:
                 logger.error(f"不支持的周期: {period}")
                 return []
+            df = await self._call(api, ts_code=ts_code, start_date=start_date, end_date=end_date)
 
             return df.to_dict('records') if df is not None and not df.empty else []
         except Exception as e:
             logger.error(f"Tushare获取K线数据失败: {e}")
             return []
 
+    @instrument("tushare")
     async def get_stock_financial(self, ts_code: str, period: str = '20231231') -> Optional[List[Dict[str, Any]]]:
         """获取股票财务指标"""
         try:
-            df = self.pro.income(ts_code=ts_code, period=period)
+            df = await self._call(self.pro.income, ts_code=ts_code, period=period)
             return df.to_dict('records') if df is not None and not df.empty else []
         except Exception as e:
             logger.error(f"Tushare获取财务数据失败: {e}")
             return []
 
-    def _get_latest_trade_date(self) -> str:
-        """获取最新交易日期"""
+    @instrument("tushare")
+    async def get_trade_dates(self, start_date: str, end_date: str) -> List[str]:
+        """[start_date, end_date] 内的交易日（YYYYMMDD，升序）；本地日历不可用时回退 trade_cal"""
         try:
-            df = self.pro.trade_cal(exchange='SSE',
-                                    start_date='20240101',
-                                    end_date=datetime.now().strftime('%Y%m%d'))
-            if df is not None and not df.empty:
-                return df[df['is_open'] == 1]['cal_date'].iloc[-1]
+            calendar = await self.executor.run(self.calendar_store.get)
+            return [d.strftime('%Y%m%d') for d in calendar.between(start_date, end_date).astype(object)]
+        except DataSourceException as e:
+            logger.warning(f"本地交易日历不可用，改用 trade_cal: {e.message}")
+        df = await self._call(self.pro.trade_cal, exchange='SSE', start_date=start_date, end_date=end_date)
+        if df is None or df.empty:
+            return []
+        return sorted(df.loc[df['is_open'].astype(int) == 1, 'cal_date'].astype(str))
+
+    @instrument("tushare")
+    async def get_daily_by_date(self, trade_date: str) -> pd.DataFrame:
+        """
+        全市场某一交易日的日线（一次调用）
+        :return: 列 symbol/date/open/high/low/close/volume/amount，停牌股票不在其中
+        """
+        df = await self._call(self.pro.daily, trade_date=trade_date, fields=DAILY_FIELDS)
+        return daily_frame(df)
+
+    @instrument("tushare")
+    async def get_kline_frame(self, symbol: str, freq: str = 'daily', limit: int = 30,
+                              adjust: str = '') -> pd.DataFrame:
+        """
+        与 EastMoneyDataSource.get_stock_kline 同结构的 K 线，供主备切换使用
+        :param symbol: 六位代码或 ts_code
+        :return: DataFrame，列 date(datetime64)/open/high/low/close/volume(手)/amount(元)，最近 limit 条；
+                 失败时抛出异常（由调用方决定是否切换数据源）
+        """
+        if freq not in _BARS_PER_PERIOD:
+            raise ValueError(f"不支持的周期: {freq}")
+        ts_code = to_ts_code(symbol)
+        calendar = await self.executor.run(self.calendar_store.get)
+        end = calendar.latest()
+        # 多取一个周期，保证最早的周/月线是完整的
+        span = (limit + 1) * _BARS_PER_PERIOD[freq]
+        try:
+            start = calendar.previous(end, span)
+        except IndexError:
+            start = calendar.first
+        start_date, end_date = start.strftime('%Y%m%d'), end.strftime('%Y%m%d')
+
+        raw = await self._call(self.pro.daily, ts_code=ts_code, start_date=start_date, end_date=end_date,
+                               fields=DAILY_FIELDS)
+        bars = daily_frame(raw)[BAR_COLUMNS].sort_values('date').reset_index(drop=True)
+        if bars.empty:
+            return pd.DataFrame()
+
+        if adjust:
+            # tushare 的 adj_factor 即后复权因子；区间截止到最新交易日，前复权以区间最后一个因子为基准
+            factors = await self._call(self.pro.adj_factor, ts_code=ts_code,
+                                       start_date=start_date, end_date=end_date)
+            bars = apply_adjustment(bars, normalize_factors(
+                factors.rename(columns={'trade_date': 'date', 'adj_factor': 'hfq_factor'})), adjust)
+        if freq != 'daily':
+            bars = aggregate_bars(bars, freq)
+
+        bars['date'] = pd.to_datetime(bars['date'])
+        return bars.tail(limit).reset_index(drop=True)
+
+    async def _get_latest_trade_date(self) -> str:
+        """获取最新交易日期（本地交易日历，不回源）"""
+        try:
+            calendar = await self.executor.run(self.calendar_store.get)
+            return calendar.latest().strftime('%Y%m%d')
         except Exception as e:
             logger.error(f"获取最新交易日期失败: {e}")
         return (datetime.now() - timedelta(days=1)).strftime('%Y%m%d')
 
+    @instrument("tushare")
     async def test_connection(self) -> dict:
         """测试Tushare连接，返回详细信息及一条示例股票数据（含 daily fallback）"""
         sample_stock = None
         try:
             # 尝试 stock_basic
-            df = self.pro.stock_basic(exchange='SSE', list_status='L', limit=1)
+            df = await self._call(self.pro.stock_basic, exchange='SSE', list_status='L', limit=1)
             if df is not None and not df.empty:
                 sample_stock = df.to_dict('records')[0]
                 return {"success": True, "error_msg": "", "sample_stock": sample_stock}
@@ -147,7 +292,8 @@ class TushareDataSource:
         try:
             # 使用一只示例股票代码（上交所前10只股票之一）
             ts_code = "600000.SH"
-            df_daily = self.pro.daily(ts_code=ts_code, start_date="20240101", end_date="20240131")
+            df_daily = await self._call(self.pro.daily, ts_code=ts_code,
+                                        start_date="20240101", end_date="20240131")
             if df_daily is not None and not df_daily.empty:
                 sample_stock = {
                     "ts_code": ts_code,
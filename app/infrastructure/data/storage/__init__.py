@@ -0,0 +1,4 @@
+from .kline_store import KLineStore
+from .financial_store import FinancialStore
+
+__all__ = ['KLineStore', 'FinancialStore']
@@ -0,0 +1,155 @@
+"""
+本地财务数据存储：按报告期分区的 Parquet 列式表，键为 (symbol, report_date)
+
+目录结构::
+
+    {root}/period=20231231.parquet     # 该报告期全市场的业绩报表（每只股票一行）
+    {root}/_meta.json                  # {"20231231": {"rows": 5100, "fetched_at": "...", "final": true}}
+
+增量刷新：只回源本地没有的报告期，以及披露截止日之前抓取、可能还有公司未披露的报告期
+（一季报 4/30、半年报 8/31、三季报 10/31、年报次年 4/30）；披露期结束后抓取的报告期不再回源。
+读取时各报告期合并为一张按 (symbol, report_date) 排序的列式表，写入后失效重建。
+
+业绩报表的利润、ROE 等字段是年初至今累计值，不同报告期之间不可直接比较；
+“最新”指披露较全的最近一个报告期（见 latest_covered_period），而不是每只股票各自的最近一期。
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 报告期 → 披露截止日（月, 日, 跨年）
+_DISCLOSURE_DEADLINES = {3: (4, 30, 0), 6: (8, 31, 0), 9: (10, 31, 0), 12: (4, 30, 1)}
+
+# 报告期的披露股票数达到覆盖最广报告期的这一比例，才算“披露较全”
+MIN_PERIOD_COVERAGE = 0.8
+
+
+def report_periods(start: date, end: date) -> List[str]:
+    """[start, end] 内已结束的报告期（季末日，YYYYMMDD，升序）"""
+    ends = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq='QE')
+    return [d.strftime('%Y%m%d') for d in ends]
+
+
+def disclosure_deadline(period: str) -> date:
+    """报告期的法定披露截止日"""
+    day = pd.Timestamp(period)
+    month, dom, years = _DISCLOSURE_DEADLINES[day.month]
+    return date(day.year + years, month, dom)
+
+
+def latest_covered_period(frame: pd.DataFrame, min_coverage: float = MIN_PERIOD_COVERAGE) -> Optional[str]:
+    """
+    披露较全的最近报告期（YYYYMMDD）：股票数不少于覆盖最广的报告期的 min_coverage 倍；
+    披露期刚开始、只有少数公司发布的报告期不会被选中。没有数据时返回 None
+    """
+    if frame.empty:
+        return None
+    counts = frame['report_date'].value_counts()
+    covered = counts[counts >= counts.max() * min_coverage]
+    return covered.index.max().strftime('%Y%m%d')
+
+
+class FinancialStore:
+    """按报告期分区的本地财务数据"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+
+    # ------------ 路径 ------------
+    def _path(self, period: str) -> Path:
+        return self.root / f'period={period}.parquet'
+
+    # ------------ 读 ------------
+    def periods(self) -> List[str]:
+        """本地已有的报告期（升序）"""
+        return sorted(self.read_meta())
+
+    def read_meta(self) -> Dict[str, Dict[str, Any]]:
+        path = self.root / '_meta.json'
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"读取财务数据元信息失败: {e}")
+            return {}
+
+    def pending_periods(self, start: date, today: Optional[date] = None) -> List[str]:
+        """需要回源的报告期：本地没有的，以及披露期结束前抓取的"""
+        today = today or date.today()
+        meta = self.read_meta()
+        return [p for p in report_periods(start, today) if not meta.get(p, {}).get('final')]
+
+    def read(self) -> pd.DataFrame:
+        """全部报告期合并的列式表，按 (symbol, report_date) 排序；没有数据时返回空表"""
+        frame = self._frame
+        if frame is not None:
+            return frame
+        with self._lock:
+            if self._frame is None:
+                self._frame = self._load()
+            return self._frame
+
+    def _load(self) -> pd.DataFrame:
+        frames = []
+        for period in self.periods():
+            try:
+                frames.append(pd.read_parquet(self._path(period)))
+            except Exception as e:
+                logger.warning(f"读取报告期 {period} 财务数据失败: {e}")
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return (
+            pd.concat(frames, ignore_index=True)
+            .sort_values(['symbol', 'report_date'], kind='mergesort')
+            .reset_index(drop=True)
+        )
+
+    def latest(self, min_coverage: float = MIN_PERIOD_COVERAGE) -> pd.DataFrame:
+        """披露较全的最近一个报告期（所有股票同一期，见 latest_covered_period）"""
+        frame = self.read()
+        period = latest_covered_period(frame, min_coverage)
+        if period is None:
+            return frame
+        return frame[frame['report_date'] == pd.Timestamp(period)].reset_index(drop=True)
+
+    # ------------ 写 ------------
+    def write_period(self, period: str, frame: pd.DataFrame, today: Optional[date] = None):
+        """整表替换一个报告期；披露截止日之后抓取的标记为 final，之后不再回源"""
+        today = today or date.today()
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self.root / f'period={period}.parquet.tmp'
+            frame.to_parquet(tmp, index=False)
+            os.replace(tmp, self._path(period))
+            meta = self.read_meta()
+            meta[period] = {
+                'rows': len(frame),
+                'fetched_at': datetime.now().isoformat(timespec='seconds'),
+                'final': today > disclosure_deadline(period),
+            }
+            tmp = self.root / '_meta.json.tmp'
+            tmp.write_text(json.dumps(meta, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+            os.replace(tmp, self.root / '_meta.json')
+            self._frame = None
+
+    def stats(self) -> dict:
+        meta = self.read_meta()
+        return {
+            'root': str(self.root),
+            'periods': len(meta),
+            'rows': sum(m.get('rows', 0) for m in meta.values()),
+            'latest_period': max(meta) if meta else None,
+        }
@@ -0,0 +1,222 @@
+"""
+本地 K 线存储：按股票代码分区的 Parquet 日线库，附带同步水位（watermark）
+
+目录结构::
+
+    {root}/daily/symbol=000001/bars.parquet     # 不复权日线
+    {root}/daily/symbol=000001/weekly.parquet   # 周线聚合（随日线增量维护）
+    {root}/daily/symbol=000001/monthly.parquet  # 月线聚合（随日线增量维护）
+    {root}/daily/symbol=000001/adj_factor.parquet  # 后复权因子（出现除权除息时失效重取）
+    {root}/daily/symbol=000001/_meta.json       # {"last_date": "2024-05-10", "synced_at": "..."}
+
+周/月线的周期划分与标签与 DataFrame.resample 一致：
+- weekly  = resample('W-MON')：周二 ~ 周一为一周，标签为该周一
+- monthly = resample('M')：自然月，标签为月末日
+写入日线时只重算受影响（通常就是当前未结束）的那一个周期。
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount']
+AGG_FREQS = ('weekly', 'monthly')
+
+_AGG_RULES = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'amount': 'sum'}
+
+
+def period_labels(dates: pd.Series, freq: str) -> pd.Series:
+    """每根日线所属周期的标签日期（与 resample 的右闭右标签一致）"""
+    dates = pd.to_datetime(dates).dt.normalize()
+    if freq == 'weekly':
+        return dates + pd.to_timedelta((-dates.dt.weekday) % 7, unit='D')
+    if freq == 'monthly':
+        return dates + pd.offsets.MonthEnd(0)
+    raise ValueError(f"不支持的聚合周期: {freq}")
+
+
+def aggregate_bars(bars: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """日线聚合为周/月线，只输出有日线的周期"""
+    if bars.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    labels = period_labels(bars['date'], freq).rename('date')
+    agg = bars[BAR_COLUMNS[1:]].groupby(labels.values, sort=True).agg(_AGG_RULES)
+    agg.index.name = 'date'
+    return agg.reset_index()[BAR_COLUMNS]
+
+
+class KLineStore:
+    """按 symbol 分区的本地日线存储"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------ 路径 ------------
+    def _partition(self, symbol: str) -> Path:
+        return self.root / 'daily' / f'symbol={symbol}'
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            if symbol not in self._locks:
+                self._locks[symbol] = threading.Lock()
+            return self._locks[symbol]
+
+    @staticmethod
+    def _file(freq: str) -> str:
+        return 'bars.parquet' if freq == 'daily' else f'{freq}.parquet'
+
+    # ------------ 读 ------------
+    def read(self, symbol: str, freq: str = 'daily') -> pd.DataFrame:
+        """
+        读取本地全部 K 线，不存在时返回空表
+        :param freq: 'daily' / 'weekly' / 'monthly'
+        """
+        if freq != 'daily':
+            return self._read_aggregate(symbol, freq)
+        return self._read_file(symbol, 'bars.parquet')
+
+    def _read_file(self, symbol: str, name: str) -> pd.DataFrame:
+        path = self._partition(symbol) / name
+        if not path.exists():
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"读取本地K线失败 {symbol}/{name}: {e}")
+            return pd.DataFrame(columns=BAR_COLUMNS)
+
+    def _read_aggregate(self, symbol: str, freq: str) -> pd.DataFrame:
+        if freq not in AGG_FREQS:
+            raise ValueError(f"不支持的聚合周期: {freq}")
+        if not (self._partition(symbol) / 'bars.parquet').exists():
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        # 聚合文件缺失或落后于日线（旧数据 / 写入中途退出）时整体重建一次
+        if not self._aggregate_fresh(symbol, freq):
+            with self._lock(symbol):
+                if not self._aggregate_fresh(symbol, freq):
+                    agg = aggregate_bars(self.read(symbol), freq)
+                    self._write_file(symbol, self._file(freq), agg)
+                    return agg
+        return self._read_file(symbol, self._file(freq))
+
+    def read_factors(self, symbol: str) -> Optional[pd.DataFrame]:
+        """后复权因子 date/hfq_factor；未缓存或已失效时返回 None"""
+        path = self._partition(symbol) / 'adj_factor.parquet'
+        if not path.exists():
+            return None
+        return self._read_file(symbol, 'adj_factor.parquet')
+
+    def write_factors(self, symbol: str, factors: pd.DataFrame):
+        with self._lock(symbol):
+            self._write_file(symbol, 'adj_factor.parquet', factors)
+
+    def invalidate_factors(self, symbol: str):
+        """该股票出现新的除权除息，删除缓存的复权因子，下次复权请求时重取"""
+        path = self._partition(symbol) / 'adj_factor.parquet'
+        # 与 write_factors 使用同一把锁，删除不会与写入交错
+        with self._lock(symbol):
+            if path.exists():
+                path.unlink(missing_ok=True)
+                logger.info(f"{symbol} 出现除权除息，复权因子已失效")
+
+    def symbols(self) -> List[str]:
+        """本地已有日线的股票代码（升序）"""
+        daily = self.root / 'daily'
+        if not daily.exists():
+            return []
+        return sorted(p.name.split('=', 1)[1] for p in daily.glob('symbol=*') if (p / 'bars.parquet').exists())
+
+    def get_watermark(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """返回同步水位 {'last_date': date, 'synced_at': datetime}，未同步过则为 None"""
+        path = self._partition(symbol) / '_meta.json'
+        if not path.exists():
+            return None
+        try:
+            meta = json.loads(path.read_text(encoding='utf-8'))
+            return {
+                'last_date': pd.Timestamp(meta['last_date']).date() if meta.get('last_date') else None,
+                'synced_at': datetime.fromisoformat(meta['synced_at']),
+            }
+        except Exception as e:
+            logger.warning(f"读取同步水位失败 {symbol}: {e}")
+            return None
+
+    # ------------ 写 ------------
+    def upsert(self, symbol: str, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        合并新增日线并推进水位，同一日期以新数据为准
+        :param bars: 至少包含 BAR_COLUMNS 的 DataFrame，可为空（仅刷新 synced_at）
+        :return: 合并后的全部日线
+        """
+        with self._lock(symbol):
+            history = self.read(symbol)
+            if bars is not None and not bars.empty:
+                bars = bars[BAR_COLUMNS]
+                merged = bars if history.empty else pd.concat([history, bars], ignore_index=True)
+                merged = (
+                    merged.drop_duplicates(subset=['date'], keep='last')
+                    .sort_values('date')
+                    .reset_index(drop=True)
+                )
+                fresh = {freq: self._aggregate_fresh(symbol, freq) for freq in AGG_FREQS}
+                self._write_file(symbol, 'bars.parquet', merged)
+                changed_from = pd.to_datetime(bars['date']).min()
+                for freq in AGG_FREQS:
+                    self._update_aggregate(symbol, freq, merged, changed_from if fresh[freq] else None)
+            else:
+                merged = history
+
+            if merged.empty:
+                return merged
+
+            self._write_meta(symbol, {
+                'last_date': pd.Timestamp(merged['date'].iloc[-1]).strftime('%Y-%m-%d'),
+                'synced_at': datetime.now().isoformat(timespec='seconds'),
+            })
+            return merged
+
+    def _aggregate_fresh(self, symbol: str, freq: str) -> bool:
+        """聚合文件存在且不早于日线文件"""
+        part = self._partition(symbol)
+        daily_path, agg_path = part / 'bars.parquet', part / self._file(freq)
+        return daily_path.exists() and agg_path.exists() \
+            and agg_path.stat().st_mtime_ns >= daily_path.stat().st_mtime_ns
+
+    def _update_aggregate(self, symbol: str, freq: str, daily: pd.DataFrame, changed_from: Optional[pd.Timestamp]):
+        """
+        只重算 changed_from 所在及之后的周期，之前已结束的周期原样保留；
+        changed_from 为 None 时（聚合文件缺失或过期）整体重建
+        """
+        existing = self._read_file(symbol, self._file(freq)) if changed_from is not None else None
+        if existing is None or existing.empty:
+            agg = aggregate_bars(daily, freq)
+        else:
+            first_label = period_labels(pd.Series([changed_from]), freq).iloc[0]
+            kept = existing[pd.to_datetime(existing['date']) < first_label]
+            tail = daily[period_labels(daily['date'], freq) >= first_label]
+            agg = pd.concat([kept, aggregate_bars(tail, freq)], ignore_index=True)
+        self._write_file(symbol, self._file(freq), agg)
+
+    def _write_file(self, symbol: str, name: str, df: pd.DataFrame):
+        part = self._partition(symbol)
+        part.mkdir(parents=True, exist_ok=True)
+        tmp = part / f'{name}.tmp'
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, part / name)
+
+    def _write_meta(self, symbol: str, meta: Dict[str, Any]):
+        part = self._partition(symbol)
+        part.mkdir(parents=True, exist_ok=True)
+        tmp = part / '_meta.json.tmp'
+        tmp.write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, part / '_meta.json')
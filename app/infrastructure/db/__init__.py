@@ -0,0 +1,3 @@
+from app.infrastructure.db.stock_repository import StockRepository
+
+__all__ = ['StockRepository']
@@ -0,0 +1,221 @@
+"""
+股票数据仓储：批量 upsert 与流式读取
+
+写入按 DB_BATCH_SIZE 分批，每批一次 executemany：
+- MySQL: INSERT ... ON DUPLICATE KEY UPDATE（pymysql 会把 executemany 改写成多行 VALUES）
+- SQLite / PostgreSQL: INSERT ... ON CONFLICT (主键) DO UPDATE
+- 其他方言：按主键查出已存在的行，已存在的 UPDATE、其余 INSERT（两次 executemany）
+每批一个事务，不逐行提交。
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+from sqlalchemy import Table, and_, bindparam, select
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import get_engine
+from app.domain.models.orm import DailyBar, DailyBarSync, FinancialIndicator, StockBasic
+
+logger = logging.getLogger(__name__)
+
+BASIC_COLUMNS = ['symbol', 'name', 'exchange', 'industry', 'market_type', 'list_date']
+DAILY_BAR_COLUMNS = ['symbol', 'trade_date', 'open', 'high', 'low', 'close', 'volume', 'amount']
+FINANCIAL_COLUMNS = [
+    'symbol', 'report_date', 'announce_date', 'eps', 'bvps', 'roe', 'revenue', 'revenue_yoy',
+    'net_profit', 'net_profit_yoy', 'gross_margin', 'ocfps',
+]
+
+
+def _records(frame: pd.DataFrame, columns: Sequence[str]) -> List[Dict[str, Any]]:
+    """DataFrame → 行字典；只取 frame 中存在的列，NaN/NaT 转 None"""
+    frame = frame[[c for c in columns if c in frame.columns]]
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict('records')
+
+
+def _to_date(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors='coerce').dt.date
+
+
+class StockRepository:
+    """stock_basic / daily_bar / financial_indicator 的读写"""
+
+    def __init__(self, engine: Optional[Engine] = None, batch_size: Optional[int] = None):
+        self.engine = engine or get_engine()
+        self.batch_size = batch_size or settings.DB_BATCH_SIZE
+
+    # ------------ 写 ------------
+    def upsert_stock_basics(self, frame: pd.DataFrame) -> int:
+        """frame 至少包含 symbol、name；按 symbol 覆盖"""
+        frame = frame.copy()
+        if 'list_date' in frame.columns:
+            frame['list_date'] = _to_date(frame['list_date'])
+        return self._upsert(StockBasic.__table__, _records(frame, BASIC_COLUMNS))
+
+    def upsert_daily_bars(self, frame: pd.DataFrame, symbol: Optional[str] = None) -> int:
+        """
+        写入日线（KLineStore 的列格式：date/open/high/low/close/volume/amount）
+        :param symbol: frame 不含 symbol 列时指定
+        """
+        if frame.empty:
+            return 0
+        frame = frame.rename(columns={'date': 'trade_date'})
+        if symbol is not None:
+            frame = frame.assign(symbol=symbol)
+        frame['trade_date'] = _to_date(frame['trade_date'])
+        return self._upsert(DailyBar.__table__, _records(frame, DAILY_BAR_COLUMNS))
+
+    def mark_daily_bars_synced(self, trade_date: date, rows: int):
+        """记录一个交易日的全市场日线已同步完成"""
+        self._upsert(DailyBarSync.__table__, [{'trade_date': trade_date, 'rows': rows}])
+
+    def upsert_financials(self, frame: pd.DataFrame) -> int:
+        """
+        frame 至少包含 symbol、report_date；按 (symbol, report_date) 覆盖
+        比率列（roe、同比、毛利率）为小数（0.1 即 10%），与 normalize_financial_report 一致
+        """
+        if frame.empty:
+            return 0
+        frame = frame.copy()
+        for column in ('report_date', 'announce_date'):
+            if column in frame.columns:
+                frame[column] = _to_date(frame[column])
+        return self._upsert(FinancialIndicator.__table__, _records(frame, FINANCIAL_COLUMNS))
+
+    def _upsert(self, table: Table, rows: List[Dict[str, Any]]) -> int:
+        if not rows:
+            return 0
+        stmt = self._upsert_statement(table, list(rows[0]))
+        with self.engine.connect() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                batch = rows[start:start + self.batch_size]
+                if stmt is None:
+                    self._update_or_insert(conn, table, batch)
+                else:
+                    conn.execute(stmt, batch)
+                conn.commit()
+        logger.debug(f"{table.name} upsert {len(rows)} 行")
+        return len(rows)
+
+    def _upsert_statement(self, table: Table, columns: List[str]):
+        """只更新本次提供的列，未提供的列保留库中原值；没有原生 upsert 的方言返回 None，走 _update_or_insert"""
+        keys = [c.name for c in table.primary_key.columns]
+        missing = set(keys) - set(columns)
+        if missing:
+            raise ValueError(f"{table.name} 缺少主键列: {', '.join(sorted(missing))}")
+        updates = [c for c in columns if c not in keys]
+        dialect = self.engine.dialect.name
+
+        if dialect == 'mysql':
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(table)
+            set_ = {c: stmt.inserted[c] for c in updates}
+            if 'updated_at' in table.columns:
+                set_['updated_at'] = table.c.updated_at.onupdate.arg
+            return stmt.on_duplicate_key_update(set_) if set_ else stmt.prefix_with('IGNORE')
+
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(table)
+            set_ = {c: stmt.excluded[c] for c in updates}
+            if 'updated_at' in table.columns:
+                set_['updated_at'] = table.c.updated_at.onupdate.arg
+            if not set_:
+                return stmt.on_conflict_do_nothing(index_elements=keys)
+            return stmt.on_conflict_do_update(index_elements=keys, set_=set_)
+
+        return None
+
+    @staticmethod
+    def _update_or_insert(conn, table: Table, rows: List[Dict[str, Any]]):
+        """
+        通用 upsert：按主键查出本批已存在的行，已存在的 UPDATE 本次提供的列，其余 INSERT；
+        由调用方提交，与原生 upsert 一样每批一个事务。同一批内主键重复时以最后一行为准
+        """
+        keys = [c.name for c in table.primary_key.columns]
+        rows = list({tuple(r[k] for k in keys): r for r in rows}.values())
+        query = select(*(table.c[k] for k in keys)).where(
+            and_(*(table.c[k].in_({r[k] for r in rows}) for k in keys))
+        )
+        existing = {tuple(r) for r in conn.execute(query)}
+        updates = [r for r in rows if tuple(r[k] for k in keys) in existing]
+        inserts = [r for r in rows if tuple(r[k] for k in keys) not in existing]
+
+        values = [c for c in rows[0] if c not in keys]
+        if updates and values:
+            # 绑定参数名不能与列名相同
+            stmt = table.update().where(and_(*(table.c[k] == bindparam(f'key_{k}') for k in keys))).values(
+                {c: bindparam(f'value_{c}') for c in values}
+            )
+            conn.execute(stmt, [{**{f'key_{k}': r[k] for k in keys}, **{f'value_{c}': r[c] for c in values}}
+                                for r in updates])
+        if inserts:
+            conn.execute(table.insert(), inserts)
+
+    # ------------ 读 ------------
+    def get_stock_basics(self) -> pd.DataFrame:
+        with self.engine.connect() as conn:
+            result = conn.execute(select(StockBasic.__table__).order_by(StockBasic.symbol))
+            return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+
+    def get_daily_bar_dates(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        """库中已有日线的交易日（升序）"""
+        table = DailyBar.__table__
+        query = select(table.c.trade_date).distinct().order_by(table.c.trade_date)
+        if start is not None:
+            query = query.where(table.c.trade_date >= start)
+        if end is not None:
+            query = query.where(table.c.trade_date <= end)
+        with self.engine.connect() as conn:
+            return list(conn.execute(query).scalars())
+
+    def get_synced_bar_dates(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        """已按日期同步过全市场日线的交易日（升序），见 mark_daily_bars_synced"""
+        table = DailyBarSync.__table__
+        query = select(table.c.trade_date).order_by(table.c.trade_date)
+        if start is not None:
+            query = query.where(table.c.trade_date >= start)
+        if end is not None:
+            query = query.where(table.c.trade_date <= end)
+        with self.engine.connect() as conn:
+            return list(conn.execute(query).scalars())
+
+    def read_daily_bars(self, symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+        """单只股票的日线，列格式与 KLineStore 一致"""
+        chunks = list(self.iter_daily_bars([symbol], start, end))
+        if not chunks:
+            return pd.DataFrame(columns=['date'] + DAILY_BAR_COLUMNS[2:])
+        return pd.concat(chunks, ignore_index=True).drop(columns='symbol').rename(columns={'trade_date': 'date'})
+
+    def iter_daily_bars(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        chunk_size: int = 50000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        流式读取日线，按 (symbol, trade_date) 排序，每次产出最多 chunk_size 行的 DataFrame；
+        使用服务端游标，全市场读取时内存只与 chunk_size 有关
+        """
+        table = DailyBar.__table__
+        query = select(table).order_by(table.c.symbol, table.c.trade_date)
+        if symbols is not None:
+            query = query.where(table.c.symbol.in_(list(symbols)))
+        if start is not None:
+            query = query.where(table.c.trade_date >= start)
+        if end is not None:
+            query = query.where(table.c.trade_date <= end)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(query)
+            columns = list(result.keys())
+            for rows in result.partitions():
+                yield pd.DataFrame(rows, columns=columns)
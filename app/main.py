@@ -1,15 +1,81 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from app.core.exceptions import stock_analysis_exception_handler, StockAnalysisException
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.api.v1 import stocks
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.scheduler import PeriodicTask
+from app.api.v1 import export, factors, quotes, screen, stocks, system
+from app.domain.services.quote_hub import QuoteHub
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.cache.response_cache import ResponseCache
+from app.infrastructure.data.executor import executor_stats, shutdown_executors
+from app.infrastructure.data.ratelimit import rate_limiter_stats
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    进程级生命周期：启动时创建共享的 StockService / 数据源 / 行情推送中心并预热缓存；
+    退出时停止后台任务、回收线程池，并移除 app.state 上的共享对象（其线程池已关闭，不能再用）
+    """
+    # 启动中途出错（预热异常、任务启动失败）或运行中异常抛回 yield 时同样要回收
+    tasks = []
+    try:
+        service = StockService()
+        app.state.stock_service = service
+        app.state.response_cache = ResponseCache(settings.HTTP_CACHE_MAX_ENTRIES)
+        # 行情推送：有订阅者时才启动轮询；快照 TTL 可能长于推送间隔，每帧只复用 interval 秒内的快照
+        interval = settings.QUOTE_STREAM_INTERVAL_SECONDS
+        app.state.quote_hub = QuoteHub(partial(service.data_source.get_market_snapshot, max_age=interval),
+                                       interval=interval, queue_size=settings.QUOTE_STREAM_QUEUE_SIZE)
+        if settings.APP_WARMUP_ON_STARTUP:
+            try:
+                await asyncio.wait_for(service.warm_up(), settings.APP_WARMUP_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("启动预热超时，继续启动")
+
+        # 后台刷新，不占用请求路径
+        tasks.append(PeriodicTask("universe-refresh", settings.UNIVERSE_REFRESH_SECONDS, service.refresh_universe))
+        if settings.UNIVERSE_INDUSTRY_ENABLED:
+            # 行业成分要逐个板块回源：启动一段时间后再跑，且走单独的小线程池，不与启动时的 K 线 / 行情请求争抢
+            tasks.append(PeriodicTask("industry-refresh", settings.INDUSTRY_REFRESH_SECONDS,
+                                      service.refresh_industries,
+                                      initial_delay=settings.INDUSTRY_REFRESH_DELAY_SECONDS))
+        if settings.FINANCIAL_REFRESH_ENABLED:
+            # 冷启动时要逐期下载十余个报告期，同样延后执行
+            tasks.append(PeriodicTask("financial-refresh", settings.FINANCIAL_REFRESH_SECONDS,
+                                      service.refresh_financials,
+                                      initial_delay=settings.FINANCIAL_REFRESH_DELAY_SECONDS))
+        app.state.periodic_tasks = tasks
+        for task in tasks:
+            task.start()
+
+        yield
+    finally:
+        if hasattr(app.state, "quote_hub"):
+            await app.state.quote_hub.stop()
+        for task in tasks:
+            await task.stop()
+        shutdown_executors()
+        for name in ("stock_service", "response_cache", "quote_hub", "periodic_tasks"):
+            if hasattr(app.state, name):
+                delattr(app.state, name)
 
 app = FastAPI(
     title="股票分析系统API",
     description="提供股票数据获取和分析功能，采用DDD架构设计",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS中间件
@@ -20,9 +86,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # 注册路由
+app.include_router(export.router, prefix="/api/v1", tags=["Export"])
 app.include_router(stocks.router, prefix="/api/v1", tags=["Stocks"])
+app.include_router(quotes.router, prefix="/api/v1", tags=["Quotes"])
+app.include_router(screen.router, prefix="/api/v1", tags=["Screen"])
+app.include_router(factors.router, prefix="/api/v1", tags=["Factors"])
+app.include_router(system.router, prefix="/api/v1", tags=["System"])
 
 # 注册全局异常处理器
 app.add_exception_handler(StockAnalysisException, stock_analysis_exception_handler)
@@ -37,6 +109,49 @@ async def root():
     }
 
 
+def _runtime_metrics():
+    """抓取时把已有的缓存 / 线程池 / 限流 / 推送统计转为指标"""
+    service = getattr(app.state, "stock_service", None)
+    caches = service.data_source.cache_stats() if service is not None else {}
+    response_cache = getattr(app.state, "response_cache", None)
+    if response_cache is not None:
+        caches = {**caches, "http_response": response_cache.stats()}
+    caches = {name: stats for name, stats in caches.items() if 'hits' in stats}
+    executors = executor_stats()
+    hub = getattr(app.state, "quote_hub", None)
+    return [
+        ("stock_cache_hits_total", "counter", "缓存命中次数",
+         [({"cache": name}, s['hits']) for name, s in caches.items()]),
+        ("stock_cache_misses_total", "counter", "缓存未命中次数",
+         [({"cache": name}, s['misses']) for name, s in caches.items()]),
+        ("stock_cache_hit_ratio", "gauge", "缓存命中率",
+         [({"cache": name}, s['hits'] / (s['hits'] + s['misses']) if s['hits'] + s['misses'] else None)
+          for name, s in caches.items()]),
+        ("stock_cache_age_seconds", "gauge", "缓存数据年龄",
+         [({"cache": name}, s.get('age_seconds')) for name, s in caches.items()]),
+        ("stock_executor_in_flight", "gauge", "数据源线程池在途调用数",
+         [({"executor": name}, s['in_flight']) for name, s in executors.items()]),
+        ("stock_executor_timeouts_total", "counter", "数据源调用超时次数",
+         [({"executor": name}, s['timeouts']) for name, s in executors.items()]),
+        ("stock_executor_errors_total", "counter", "数据源调用异常次数",
+         [({"executor": name}, s['errors']) for name, s in executors.items()]),
+        ("stock_rate_limiter_waited_seconds_total", "counter", "限流等待总时长",
+         [({"limiter": name}, s['waited_seconds']) for name, s in rate_limiter_stats().items()]),
+        ("stock_quote_subscriptions", "gauge", "行情推送订阅数",
+         [({}, hub.stats()['subscriptions'] if hub is not None else None)]),
+    ]
+
+
+registry.add_collector(_runtime_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not registry.enabled:
+        raise HTTPException(status_code=404, detail="指标未开启（METRICS_ENABLED=false）")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
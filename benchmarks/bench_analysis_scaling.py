@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+全市场分析任务扩展性基准：同一批股票在不同进程数下的分片计算耗时
+
+先生成合成日线到临时本地存储，构建一次共享价格矩阵；之后每个进程数删除全部分片结果
+重新计算（走续跑路径，不重复读 Parquet），只比较分片计算 + 合并的耗时。
+
+用法: python benchmarks/bench_analysis_scaling.py --symbols 5000 --bars 500 --workers 1,2,4,8
+"""
+import argparse
+import sys
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.domain.analysis.runner import AnalysisRunner
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def make_store(root: str, n_symbols: int, n_bars: int) -> KLineStore:
+    store = KLineStore(root)
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end='2024-05-10', periods=n_bars).date
+    for i in range(n_symbols):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+        store.upsert(f"{i:06d}", pd.DataFrame({
+            'date': dates, 'open': close, 'high': close * 1.01, 'low': close * 0.99,
+            'close': close, 'volume': 1e5, 'amount': 1e8,
+        }))
+    return store
+
+
+def run(n_symbols: int, n_bars: int, workers_list, shard_size: int):
+    with tempfile.TemporaryDirectory() as root:
+        t0 = time.perf_counter()
+        store = make_store(os.path.join(root, 'kline'), n_symbols, n_bars)
+        print(f"生成合成日线: {n_symbols} 只 x {n_bars} 根, {time.perf_counter() - t0:.1f} s")
+
+        out = os.path.join(root, 'out')
+        symbols = store.symbols()
+        t0 = time.perf_counter()
+        run_dir = Path(out) / 'bench'
+        run_dir.mkdir(parents=True)
+        AnalysisRunner(store, out, workers=1, shard_size=shard_size, bars=n_bars)._prepare(run_dir, symbols)
+        print(f"构建共享价格矩阵: {time.perf_counter() - t0:.2f} s")
+        print(f"CPU 核数: {os.cpu_count()}, 分片大小: {shard_size}")
+
+        baseline = None
+        for workers in workers_list:
+            shutil.rmtree(run_dir / 'shards', ignore_errors=True)
+            runner = AnalysisRunner(store, out, workers=workers, shard_size=shard_size, bars=n_bars)
+            summary = runner.run(symbols, run_id='bench')
+            seconds = summary['seconds']
+            baseline = baseline or seconds
+            print(f"进程数 {workers:2d}: {seconds:7.2f} s  ({n_symbols / seconds:8.0f} 只/秒, "
+                  f"加速 {baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="全市场分析扩展性基准")
+    parser.add_argument('--symbols', type=int, default=2000)
+    parser.add_argument('--bars', type=int, default=500)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--shard-size', type=int, default=250)
+    args = parser.parse_args()
+    run(args.symbols, args.bars, [int(w) for w in args.workers.split(',')], args.shard_size)
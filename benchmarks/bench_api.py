@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+离线 API 基准套件：合成数据源 + 进程内 ASGI 客户端，测量并发下的吞吐与 p50/p99 延迟
+
+场景：
+- stocks_list      GET /api/v1/stocks（随机 offset 分页）
+- stock_detail     GET /api/v1/stocks/{symbol}
+- kline_cold       GET /api/v1/stocks/{symbol}/kline，本地日线库为空（全量合成历史 + 写入）
+- kline_warm       同一批股票再请求一次（本地读取 / HTTP 响应缓存命中）
+- kline_304        带 If-None-Match 的条件请求（304，不发送响应体）
+
+不访问网络，相同参数下请求序列与数据完全相同。结果写入 --output 目录下
+{时间}_{commit}.json；--compare 指定历史结果文件时逐项对比，超过 --threshold 的退化以非零退出码返回。
+
+用法: python benchmarks/bench_api.py --requests 2000 --concurrency 32 [--compare benchmarks/results/xxx.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import numpy as np
+
+from app.main import app
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 越大越好的指标；其余（延迟）越小越好
+HIGHER_IS_BETTER = {'throughput_rps'}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return 'unknown'
+
+
+def summarize(latencies: list, wall: float, errors: int, body_bytes: int) -> dict:
+    xs = np.sort(np.asarray(latencies)) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'body_bytes': body_bytes,
+        'throughput_rps': round(len(latencies) / wall, 1),
+        'p50_ms': round(float(np.percentile(xs, 50)), 3),
+        'p90_ms': round(float(np.percentile(xs, 90)), 3),
+        'p99_ms': round(float(np.percentile(xs, 99)), 3),
+        'max_ms': round(float(xs[-1]), 3),
+    }
+
+
+async def drive(client: httpx.AsyncClient, urls: list, concurrency: int, etags: dict = None) -> dict:
+    """以固定并发数跑完一组请求；给出 etags 时以条件请求发送，期望 304"""
+    latencies, errors, body_bytes = [], 0, 0
+    queue = iter(urls)
+    expected = 304 if etags else 200
+
+    async def worker():
+        nonlocal errors, body_bytes
+        for url in queue:
+            headers = {'If-None-Match': etags[url]} if etags else None
+            t0 = time.perf_counter()
+            resp = await client.get(url, headers=headers)
+            latencies.append(time.perf_counter() - t0)
+            body_bytes += len(resp.content)
+            if resp.status_code != expected:
+                errors += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - t0, errors, body_bytes)
+
+
+async def run(args) -> dict:
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as root:
+        source = SyntheticDataSource(n_symbols=args.symbols, years=args.years, seed=args.seed, root=root)
+        service = StockService(data_source=source)
+        await service.warm_up()
+        app.state.stock_service = service
+        symbols = service.universe.symbols
+
+        kline_symbols = rng.choice(symbols, min(args.kline_symbols, len(symbols)), replace=False).tolist()
+        scenarios = {
+            'stocks_list': [f"/api/v1/stocks?limit=100&offset={o}"
+                            for o in rng.integers(0, len(symbols), args.requests)],
+            'stock_detail': [f"/api/v1/stocks/{s}" for s in rng.choice(symbols, args.requests)],
+            'kline_cold': [f"/api/v1/stocks/{s}/kline?limit={args.limit}" for s in kline_symbols],
+            'kline_warm': [f"/api/v1/stocks/{s}/kline?limit={args.limit}"
+                           for s in rng.choice(kline_symbols, args.requests)],
+        }
+
+        results = {}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            # 预热路由与导入，不计入结果
+            await client.get(scenarios['stock_detail'][0])
+            for name, urls in scenarios.items():
+                results[name] = await drive(client, urls, args.concurrency)
+            # 前端已持有 ETag 时的再验证
+            etags = {url: (await client.get(url)).headers.get('ETag', '') for url in set(scenarios['kline_warm'])}
+            results['kline_304'] = await drive(client, scenarios['kline_warm'], args.concurrency, etags)
+            for name, r in results.items():
+                print(f"{name:<14} {r['requests']:>6} 次  {r['throughput_rps']:>9.1f} req/s  "
+                      f"p50={r['p50_ms']:>8.2f} ms  p99={r['p99_ms']:>8.2f} ms  "
+                      f"响应体={r['body_bytes'] / 1024:>9.1f} KB  错误={r['errors']}")
+        del app.state.stock_service
+
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'threshold')},
+        'scenarios': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """逐场景逐指标对比，返回超过阈值的退化项"""
+    if current['params'] != baseline['params']:
+        print(f"注意：参数不同，对比仅供参考（基线 {baseline['params']}）")
+    regressions = []
+    print(f"\n对比基线 {baseline['commit']} ({baseline['created_at']})")
+    for name, now in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        for metric in ('throughput_rps', 'p50_ms', 'p99_ms'):
+            old, new = before[metric], now[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = '  <-- 退化' if worse > threshold else ''
+            print(f"  {name:<14} {metric:<15} {old:>10.2f} -> {new:>10.2f} ({change:+.1%}){flag}")
+            if flag:
+                regressions.append((name, metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线 API 基准套件")
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--kline-symbols", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=120)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(ROOT, "benchmarks", "results"))
+    parser.add_argument("--compare", help="历史结果 JSON 文件")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定退化的相对变化，默认 20%%")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"{datetime.now():%Y%m%d-%H%M%S}_{result['commit']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存: {path}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 项退化超过 {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+cassette 回放基准：录制 N 只股票的全量日线（合成数据，相当于一个交易日的全市场录制），
+测量 cassette 打开耗时、单次回放耗时与文件大小
+
+用法: python benchmarks/bench_cassette.py --symbols 5000 --years 20
+"""
+import argparse
+import statistics
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.infrastructure.data.cassette import Cassette
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+
+
+def run(n_symbols: int, years: int, samples: int):
+    with tempfile.TemporaryDirectory() as root:
+        source = SyntheticDataSource(n_symbols=n_symbols, years=years, root=os.path.join(root, 'synthetic'))
+        symbols = source._universe['symbol'].tolist()
+        path = os.path.join(root, 'cassette')
+
+        recorder = Cassette(path, mode='record')
+        t0 = time.perf_counter()
+        for symbol in symbols:
+            recorder.call('akshare.stock_zh_a_hist', lambda s: source.history(s), symbol)
+        record_seconds = time.perf_counter() - t0
+        size = recorder.stats()['size_bytes']
+
+        t0 = time.perf_counter()
+        player = Cassette(path, mode='replay')
+        open_seconds = time.perf_counter() - t0
+
+        rng = np.random.default_rng(0)
+        latencies, rows = [], 0
+        for symbol in rng.choice(symbols, samples):
+            t0 = time.perf_counter()
+            df = player.call('akshare.stock_zh_a_hist', None, symbol)
+            latencies.append(time.perf_counter() - t0)
+            rows += len(df)
+
+    print(f"录制 {n_symbols} 只 × 最长 {years} 年日线：{record_seconds:.1f}s，cassette {size / 1e6:.1f} MB")
+    print(f"打开 cassette（读取索引 + 内存映射）: {open_seconds * 1000:.1f} ms")
+    print(f"单次回放: p50={statistics.median(latencies) * 1000:.2f} ms  "
+          f"max={max(latencies) * 1000:.2f} ms（平均 {rows / samples:.0f} 行）")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="cassette 回放基准")
+    parser.add_argument('--symbols', type=int, default=5000)
+    parser.add_argument('--years', type=int, default=20)
+    parser.add_argument('--samples', type=int, default=500)
+    args = parser.parse_args()
+    run(args.symbols, args.years, args.samples)
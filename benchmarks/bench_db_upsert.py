@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+数据库写入基准：全市场一日日线 逐行 ORM 提交  vs  StockRepository 批量 upsert
+
+默认写入临时 SQLite 文件；指定 --url 可对 MySQL 测试（会在该库建表并写入测试数据）。
+
+用法: python benchmarks/bench_db_upsert.py --symbols 5000 --days 1
+"""
+import argparse
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.database import get_engine, init_db
+from app.domain.models.orm import DailyBar
+from app.infrastructure.db import StockRepository
+
+
+def make_bars(n_symbols: int, days: int) -> pd.DataFrame:
+    dates = pd.bdate_range(end='2024-05-10', periods=days)
+    return pd.DataFrame({
+        'symbol': [f"{i:06d}" for i in range(n_symbols) for _ in range(days)],
+        'date': list(dates.date) * n_symbols,
+        'open': 10.0, 'high': 11.0, 'low': 9.5, 'close': 10.5, 'volume': 1e5, 'amount': 1e8,
+    })
+
+
+def run(url: str, n_symbols: int, days: int):
+    engine = get_engine(url)
+    init_db(engine)
+    bars = make_bars(n_symbols, days)
+
+    t0 = time.perf_counter()
+    with Session(engine) as session:
+        for row in bars.rename(columns={'date': 'trade_date'}).to_dict('records'):
+            session.merge(DailyBar(**row))
+            session.commit()
+    per_row = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    StockRepository(engine).upsert_daily_bars(bars)
+    batched = time.perf_counter() - t0
+
+    print(f"数据库: {engine.dialect.name}, 行数: {len(bars)} ({n_symbols} 只 x {days} 天)")
+    print(f"逐行提交 : {per_row:7.2f} s  ({len(bars) / per_row:9.0f} 行/秒)")
+    print(f"批量upsert: {batched:7.2f} s  ({len(bars) / batched:9.0f} 行/秒, {per_row / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="数据库批量写入基准")
+    parser.add_argument('--symbols', type=int, default=5000)
+    parser.add_argument('--days', type=int, default=1)
+    parser.add_argument('--url', default=None, help='数据库 URL，默认临时 SQLite')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as root:
+        run(args.url or f"sqlite:///{os.path.join(root, 'bench.db')}", args.symbols, args.days)
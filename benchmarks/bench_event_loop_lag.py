@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+事件循环延迟基准：K 线拉取进行中，事件循环的调度延迟是否保持平稳
+
+对比两种方式：
+- 直接在事件循环上执行阻塞的 K 线加载（改造前的行为）
+- 通过数据源执行层（专属线程池）执行
+
+上游 ak.stock_zh_a_hist 用 time.sleep 模拟阻塞的网络调用。
+
+用法: python benchmarks/bench_event_loop_lag.py --fetches 16 --upstream-ms 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from unittest.mock import patch
+
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def make_fake_hist(upstream_seconds: float):
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=2000)
+    full = pd.DataFrame({
+        '日期': dates.strftime('%Y-%m-%d'),
+        '开盘': 10.0, '收盘': 10.5, '最高': 11.0, '最低': 9.5,
+        '成交量': 1e5, '成交额': 1e8,
+    })
+
+    def fake_hist(symbol, **kwargs):
+        time.sleep(upstream_seconds)
+        return full.copy()
+
+    return fake_hist
+
+
+async def probe(stop: asyncio.Event, interval: float = 0.005) -> list:
+    """持续测量事件循环调度延迟（实际唤醒时间 - 期望唤醒时间）"""
+    lags = []
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - t0 - interval)
+    return lags
+
+
+async def measure(fetch, fetches: int) -> list:
+    stop = asyncio.Event()
+    prober = asyncio.ensure_future(probe(stop))
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(fetch(f"{600000 + i:06d}") for i in range(fetches)))
+    stop.set()
+    return await prober
+
+
+async def run(fetches: int, upstream_ms: float):
+    fake_hist = make_fake_hist(upstream_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as root, \
+            patch('app.infrastructure.data.sources.eastmoney.ak.stock_zh_a_hist', fake_hist):
+        source = EastMoneyDataSource(kline_store=KLineStore(os.path.join(root, 'blocking')))
+
+        async def blocking_fetch(symbol):
+            return source._load_kline(symbol, 'daily', 30)
+
+        blocking = await measure(blocking_fetch, fetches)
+
+        source = EastMoneyDataSource(kline_store=KLineStore(os.path.join(root, 'executor')))
+        offloaded = await measure(lambda symbol: source.get_stock_kline(symbol, 'daily', 30), fetches)
+
+    def fmt(xs):
+        xs = sorted(xs)
+        p99 = xs[min(len(xs) - 1, int(len(xs) * 0.99))]
+        return (f"p50={statistics.median(xs) * 1000:8.2f} ms  p99={p99 * 1000:8.2f} ms  "
+                f"max={xs[-1] * 1000:8.2f} ms")
+
+    print(f"并发K线拉取: {fetches}, 模拟上游耗时: {upstream_ms} ms")
+    print(f"阻塞在事件循环上  : {fmt(blocking)}")
+    print(f"数据源执行层      : {fmt(offloaded)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="事件循环延迟基准")
+    parser.add_argument('--fetches', type=int, default=16)
+    parser.add_argument('--upstream-ms', type=float, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.fetches, args.upstream_ms))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+批量导出基准：多只股票 K 线经 JSON 批量接口 vs Arrow IPC stream / Parquet 导出，到客户端拿到 DataFrame 的总耗时
+
+- json      POST /api/v1/stocks/kline/batch，客户端 json 解析后逐只拼 DataFrame
+- arrow     GET /api/v1/stocks/export/klines（Arrow IPC stream），客户端 open_stream 读取
+- parquet   同上 ?format=parquet
+
+合成数据源、进程内 ASGI 客户端；先预热一次让本地日线库就绪，只比较序列化与解析。
+
+用法: python benchmarks/bench_export.py --symbols 500 --limit 1000
+"""
+import argparse
+import asyncio
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.main import app
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+
+
+async def via_json(client, symbols, limit):
+    resp = await client.post("/api/v1/stocks/kline/batch", json={"symbols": symbols, "limit": limit})
+    data = resp.json()["data"]
+    frames = [pd.DataFrame(rows).assign(symbol=symbol) for symbol, rows in data.items()]
+    return pd.concat(frames, ignore_index=True), len(resp.content)
+
+
+async def via_export(client, symbols, limit, fmt):
+    resp = await client.get("/api/v1/stocks/export/klines",
+                            params={"symbols": ",".join(symbols), "limit": limit, "format": fmt})
+    buffer = pa.py_buffer(resp.content)
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(buffer).read_all()
+    else:
+        table = pq.read_table(pa.BufferReader(buffer))
+    return table.to_pandas(), len(resp.content)
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as root:
+        source = SyntheticDataSource(n_symbols=max(args.symbols, 100), years=args.years, seed=0, root=root)
+        app.state.stock_service = StockService(data_source=source)
+        symbols = source._universe['symbol'].tolist()[:args.symbols]
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            # 预热：本地日线库写入
+            await via_export(client, symbols, args.limit, "arrow")
+            cases = {
+                'json': lambda: via_json(client, symbols, args.limit),
+                'arrow': lambda: via_export(client, symbols, args.limit, "arrow"),
+                'parquet': lambda: via_export(client, symbols, args.limit, "parquet"),
+            }
+            print(f"{len(symbols)} 只股票 × {args.limit} 根")
+            for name, fn in cases.items():
+                best = None
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    frame, size = await fn()
+                    elapsed = time.perf_counter() - t0
+                    best = elapsed if best is None else min(best, elapsed)
+                print(f"  {name:<8} {best * 1000:>9.1f} ms  {len(frame):>9} 行  响应 {size / 1024 / 1024:>7.2f} MB")
+        del app.state.stock_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量导出基准")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+技术指标引擎基准：全市场批量计算（默认 5000 只 × 1000 根）与单根 K 线增量更新
+
+用法: python benchmarks/bench_indicators.py --symbols 5000 --bars 1000
+"""
+import argparse
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.domain.analysis.indicators import IndicatorEngine, INDICATOR_GROUPS
+
+
+def make_bars(n_symbols: int, n_bars: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_symbols, n_bars)), axis=1))
+    high = close * (1 + rng.uniform(0, 0.02, close.shape))
+    low = close * (1 - rng.uniform(0, 0.02, close.shape))
+    return high, low, close
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(n_symbols: int, n_bars: int):
+    engine = IndicatorEngine()
+    high, low, close = make_bars(n_symbols, n_bars)
+    cells = n_symbols * n_bars
+
+    print(f"股票数: {n_symbols}, 每只K线: {n_bars}")
+    print(f"{'指标':<8}{'批量耗时':>12}{'吞吐(百万根/秒)':>20}")
+    for group in INDICATOR_GROUPS:
+        seconds = timed(lambda: engine.compute(high, low, close, groups=[group]))
+        print(f"{group:<8}{seconds * 1000:>10.1f}ms{cells / seconds / 1e6:>18.1f}")
+    seconds = timed(lambda: engine.compute(high, low, close), repeat=1)
+    print(f"{'全部':<8}{seconds * 1000:>10.1f}ms{cells / seconds / 1e6:>18.1f}")
+
+    _, state = engine.init_state(high[:, :-1], low[:, :-1], close[:, :-1])
+    seconds = timed(lambda: engine.update(state, high[:, -1], low[:, -1], close[:, -1]), repeat=1)
+    print(f"增量更新一根新K线（全部指标, {n_symbols} 只）: {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="技术指标引擎基准")
+    parser.add_argument('--symbols', type=int, default=5000)
+    parser.add_argument('--bars', type=int, default=1000)
+    args = parser.parse_args()
+    run(args.symbols, args.bars)
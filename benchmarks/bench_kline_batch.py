@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+批量 K 线吞吐基准：200 只股票逐只 GET /stocks/{symbol}/kline  vs  一次 POST /stocks/kline/batch
+
+上游 ak.stock_zh_a_hist 用本地伪造函数替代（固定延迟），每轮使用空的本地存储，
+因此两种方式都需要实际回源。
+
+用法: python benchmarks/bench_kline_batch.py --symbols 200 --upstream-ms 50
+"""
+import argparse
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def use_store(root: str):
+    """让共享的 StockService 使用一个全新的本地存储目录"""
+    app.state.stock_service = StockService(EastMoneyDataSource(kline_store=KLineStore(root)))
+
+
+def make_fake_hist(upstream_seconds: float):
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=500)
+    full = pd.DataFrame({
+        '日期': dates.strftime('%Y-%m-%d'),
+        '开盘': 10.0, '收盘': 10.5, '最高': 11.0, '最低': 9.5,
+        '成交量': 1e5, '成交额': 1e8,
+    })
+
+    def fake_hist(symbol, **kwargs):
+        time.sleep(upstream_seconds)
+        return full.copy()
+
+    return fake_hist
+
+
+def run(n_symbols: int, upstream_ms: float, limit: int):
+    symbols = [f"{600000 + i:06d}" for i in range(n_symbols)]
+    client = TestClient(app)
+    fake_hist = make_fake_hist(upstream_ms / 1000)
+
+    with patch('app.infrastructure.data.sources.eastmoney.ak.stock_zh_a_hist', fake_hist):
+        with tempfile.TemporaryDirectory() as root:
+            use_store(root)
+            t0 = time.perf_counter()
+            for symbol in symbols:
+                resp = client.get(f"/api/v1/stocks/{symbol}/kline", params={'limit': limit})
+                assert resp.status_code == 200, resp.text
+            one_by_one = time.perf_counter() - t0
+
+        with tempfile.TemporaryDirectory() as root:
+            use_store(root)
+            t0 = time.perf_counter()
+            resp = client.post("/api/v1/stocks/kline/batch", json={'symbols': symbols, 'limit': limit})
+            batch = time.perf_counter() - t0
+            assert resp.status_code == 200, resp.text
+            assert len(resp.json()['data']) == n_symbols
+
+    print(f"股票数: {n_symbols}, 模拟上游耗时: {upstream_ms} ms, limit={limit}")
+    print(f"逐只请求 : {one_by_one:7.2f} s  ({n_symbols / one_by_one:8.1f} 只/秒)")
+    print(f"批量接口 : {batch:7.2f} s  ({n_symbols / batch:8.1f} 只/秒, {one_by_one / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="批量K线吞吐基准")
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--upstream-ms', type=float, default=50)
+    parser.add_argument('--limit', type=int, default=30)
+    args = parser.parse_args()
+    run(args.symbols, args.upstream_ms, args.limit)
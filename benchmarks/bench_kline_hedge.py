@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+K 线主备对冲基准：主源偶发卡顿（长尾）时，单源与主备对冲的 p50/p99 对比
+
+主源大部分请求 --fast-ms 左右返回，--stall-ratio 比例的请求卡顿 --stall-ms；
+备源固定 --secondary-ms。两种模式跑同一请求序列，统计延迟分布与备源额外调用量。
+
+用法: python benchmarks/bench_kline_hedge.py --requests 2000 --concurrency 32 --stall-ratio 0.03
+"""
+import argparse
+import asyncio
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.sources.composite import CompositeDataSource
+
+BARS = pd.DataFrame({'date': pd.date_range('2024-01-01', periods=120), 'open': 1.0, 'high': 1.0,
+                     'low': 1.0, 'close': 1.0, 'volume': 1.0, 'amount': 1.0})
+
+
+class SimulatedSource:
+    """按预先生成的延迟序列返回 K 线"""
+
+    def __init__(self, delays):
+        self.delays = iter(delays)
+        self.calls = 0
+
+    async def _respond(self):
+        self.calls += 1
+        await asyncio.sleep(next(self.delays))
+        return BARS
+
+    async def get_stock_kline(self, symbol, freq='daily', limit=30, adjust=''):
+        return await self._respond()
+
+    async def get_kline_frame(self, symbol, freq='daily', limit=30, adjust=''):
+        return await self._respond()
+
+    def cache_stats(self):
+        return {}
+
+
+async def drive(source, requests: int, concurrency: int) -> list:
+    latencies = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for _ in queue:
+            t0 = time.perf_counter()
+            await source.get_stock_kline('000001', 'daily', 120)
+            latencies.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def primary_delays(args, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    fast = rng.lognormal(np.log(args.fast_ms / 1000), 0.3, args.requests)
+    stalled = rng.random(args.requests) < args.stall_ratio
+    return np.where(stalled, args.stall_ms / 1000, fast)
+
+
+def report(name: str, latencies: list):
+    xs = np.asarray(latencies) * 1000
+    print(f"{name:<10} p50={np.percentile(xs, 50):>8.1f} ms  p90={np.percentile(xs, 90):>8.1f} ms  "
+          f"p99={np.percentile(xs, 99):>8.1f} ms  max={xs.max():>8.1f} ms")
+
+
+async def run(args):
+    secondary_delays = np.full(args.requests, args.secondary_ms / 1000)
+
+    single = SimulatedSource(primary_delays(args, args.seed))
+    report('单源', await drive(single, args.requests, args.concurrency))
+
+    primary = SimulatedSource(primary_delays(args, args.seed))
+    secondary = SimulatedSource(secondary_delays)
+    hedged = CompositeDataSource(primary, secondary, min_delay=args.fast_ms / 1000,
+                                 default_delay=args.stall_ms / 2000)
+    report('主备对冲', await drive(hedged, args.requests, args.concurrency))
+    stats = hedged.stats()
+    print(f"对冲请求 {stats['hedged']} 次（{stats['hedged'] / args.requests:.1%}），"
+          f"备源胜出 {stats['wins']['secondary']} 次，对冲延迟 {stats['hedge_delay'] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K 线主备对冲基准")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--fast-ms", type=float, default=40)
+    parser.add_argument("--stall-ms", type=float, default=3000)
+    parser.add_argument("--stall-ratio", type=float, default=0.03)
+    parser.add_argument("--secondary-ms", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
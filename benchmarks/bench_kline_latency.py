@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+K 线接口冷/热延迟基准测试
+
+冷启动：本地存储为空，需要从上游拉取全部历史；
+热请求：本地已有日线，只同步水位之后的增量；或在同步间隔内直接读本地。
+
+上游 ak.stock_zh_a_hist 用本地伪造函数替代（固定网络延迟 + 按行数计费），
+因此结果只反映本服务自身的开销与上游数据量的关系。
+
+用法: python benchmarks/bench_kline_latency.py --rounds 20 --years 30 [--freq weekly]
+"""
+import argparse
+import statistics
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def use_store(root: str):
+    """让共享的 StockService 使用一个全新的本地存储目录"""
+    app.state.stock_service = StockService(EastMoneyDataSource(kline_store=KLineStore(root)))
+
+
+def make_fake_hist(years: int, base_latency: float, per_row_latency: float):
+    """伪造东财日线接口：按 start_date 截取历史，并模拟网络耗时"""
+    dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 244)
+    n = len(dates)
+    full = pd.DataFrame({
+        '日期': dates.strftime('%Y-%m-%d'),
+        '开盘': 10.0, '收盘': 10.5, '最高': 11.0, '最低': 9.5,
+        '成交量': 1e5, '成交额': 1e8,
+    }, index=range(n))
+
+    def fake_hist(symbol, period='daily', start_date='19700101', end_date='20500101', adjust='', **kwargs):
+        df = full[full['日期'] >= pd.Timestamp(start_date).strftime('%Y-%m-%d')]
+        time.sleep(base_latency + per_row_latency * len(df))
+        return df.copy()
+
+    return fake_hist
+
+
+def run(rounds: int, years: int, limit: int, freq: str):
+    fake_hist = make_fake_hist(years, base_latency=0.05, per_row_latency=2e-5)
+    client = TestClient(app)
+
+    cold, warm, local = [], [], []
+    for i in range(rounds):
+        with tempfile.TemporaryDirectory() as root, \
+                patch('app.infrastructure.data.sources.eastmoney.ak.stock_zh_a_hist', fake_hist), \
+                patch('app.core.config.settings.KLINE_SYNC_INTERVAL_SECONDS', 0):
+            use_store(root)
+            symbol = f"{600000 + i:06d}"
+            t0 = time.perf_counter()
+            resp = client.get(f"/api/v1/stocks/{symbol}/kline", params={'limit': limit, 'freq': freq})
+            cold.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.text
+
+            t0 = time.perf_counter()
+            resp = client.get(f"/api/v1/stocks/{symbol}/kline", params={'limit': limit, 'freq': freq})
+            warm.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.text
+
+            with patch('app.core.config.settings.KLINE_SYNC_INTERVAL_SECONDS', 3600):
+                t0 = time.perf_counter()
+                resp = client.get(f"/api/v1/stocks/{symbol}/kline", params={'limit': limit, 'freq': freq})
+                local.append(time.perf_counter() - t0)
+                assert resp.status_code == 200, resp.text
+
+    def fmt(xs):
+        xs = sorted(xs)
+        return (f"p50={statistics.median(xs) * 1000:8.2f} ms  "
+                f"max={xs[-1] * 1000:8.2f} ms  mean={statistics.mean(xs) * 1000:8.2f} ms")
+
+    print(f"历史长度: {years} 年, freq={freq}, limit={limit}, rounds={rounds}")
+    print(f"冷启动 (全量下载): {fmt(cold)}")
+    print(f"热请求 (增量同步): {fmt(warm)}")
+    print(f"热请求 (纯本地):   {fmt(local)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="K线接口冷/热延迟基准")
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--years', type=int, default=30)
+    parser.add_argument('--limit', type=int, default=30)
+    parser.add_argument('--freq', choices=['daily', 'weekly', 'monthly'], default='daily')
+    args = parser.parse_args()
+    run(args.rounds, args.years, args.limit, args.freq)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+全市场快照规整基准测试：iterrows + 逐格 _parse_number  vs  向量化整列转换
+
+用法: python benchmarks/bench_normalize.py --rows 5000 --repeat 5
+"""
+import argparse
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.normalize import SPOT_COLUMNS, normalize_spot_table
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+
+
+def make_spot_table(rows: int, seed: int = 0) -> pd.DataFrame:
+    """构造与 ak.stock_zh_a_spot_em() 形状一致的快照：数值列混有 '-'、NaN、'万'/'亿' 后缀"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'代码': [f"{i:06d}" for i in range(rows)], '名称': [f"股票{i}" for i in range(rows)]})
+    for cn in SPOT_COLUMNS:
+        if cn in ('代码', '名称'):
+            continue
+        col = pd.Series(rng.uniform(1, 100, rows).round(2), dtype=object)
+        col[rng.random(rows) < 0.02] = '-'
+        col[rng.random(rows) < 0.02] = np.nan
+        suffixed = rng.random(rows) < 0.05
+        col[suffixed] = [f"{v:.2f}万" for v in rng.uniform(1, 100, suffixed.sum())]
+        df[cn] = col
+    return df
+
+
+def legacy_normalize(df: pd.DataFrame) -> list:
+    """改造前的实现：逐行 iterrows，每格调用 _parse_number"""
+    parser = EastMoneyDataSource.__new__(EastMoneyDataSource)
+    result = []
+    for _, row in df.iterrows():
+        item = {'symbol': row['代码'], 'name': row['名称']}
+        for cn, en in SPOT_COLUMNS.items():
+            if en not in ('symbol', 'name'):
+                item[en] = parser._parse_number(row[cn])
+        result.append(item)
+    return result
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def run(rows: int, repeat: int):
+    df = make_spot_table(rows)
+
+    legacy = best_of(lambda: legacy_normalize(df), repeat)
+    vectorized = best_of(lambda: normalize_spot_table(df), repeat)
+    materialized = best_of(lambda: normalize_spot_table(df).to_dict('records'), repeat)
+
+    # 两种实现结果一致
+    pd.testing.assert_frame_equal(pd.DataFrame(legacy_normalize(df)), normalize_spot_table(df))
+
+    print(f"快照行数: {rows}, 数值列: {len(SPOT_COLUMNS) - 2}")
+    print(f"iterrows + _parse_number : {legacy * 1000:9.2f} ms")
+    print(f"向量化规整                : {vectorized * 1000:9.2f} ms  ({legacy / vectorized:.1f}x)")
+    print(f"向量化规整 + to_dict      : {materialized * 1000:9.2f} ms  ({legacy / materialized:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="全市场快照规整基准")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
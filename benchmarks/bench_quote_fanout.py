@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+行情推送扇出基准：全市场快照逐帧变化时，单进程向大量订阅者分发增量的耗时
+
+每个订阅者随机订阅若干只股票，每帧有一部分股票价格变化；
+统计每帧 tick（比较 + 编码 + 入队）的耗时，以及与“为每个订阅者单独序列化”的对比。
+
+用法: python benchmarks/bench_quote_fanout.py --subscribers 5000 --symbols 5500 --per-sub 20 --ticks 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from app.domain.services.quote_hub import QUOTE_FIELDS, QuoteHub
+
+
+def make_frame(symbols, rng) -> pd.DataFrame:
+    frame = pd.DataFrame(rng.uniform(1, 100, (len(symbols), len(QUOTE_FIELDS))), columns=QUOTE_FIELDS)
+    frame.insert(0, 'symbol', symbols)
+    return frame
+
+
+async def run(subscribers: int, n_symbols: int, per_sub: int, ticks: int, change_ratio: float):
+    rng = np.random.default_rng(0)
+    symbols = [f"{i:06d}" for i in range(n_symbols)]
+    state = {'frame': make_frame(symbols, rng)}
+
+    async def producer():
+        return state['frame']
+
+    hub = QuoteHub(producer, queue_size=ticks + 2)
+    subs = [hub.subscribe(rng.choice(symbols, per_sub, replace=False).tolist()) for _ in range(subscribers)]
+    await hub.stop()  # 手动驱动 tick，不启动后台轮询
+
+    await hub.tick()  # 首帧全量快照
+    hub_times, naive_times = [], []
+    for _ in range(ticks):
+        frame = state['frame'].copy()
+        changed = rng.random(n_symbols) < change_ratio
+        frame.loc[changed, 'current_price'] += 0.01
+        frame.loc[changed, 'volume'] += 100
+        previous, state['frame'] = state['frame'], frame
+
+        t0 = time.perf_counter()
+        await hub.tick()
+        hub_times.append(time.perf_counter() - t0)
+
+        # 对照：每个订阅者各自 diff 并整体序列化（很慢，只测前 3 帧）
+        if len(naive_times) >= 3:
+            continue
+        t0 = time.perf_counter()
+        prev_idx, cur_idx = previous.set_index('symbol'), frame.set_index('symbol')
+        for sub in subs:
+            rows = sorted(sub.symbols)
+            cur, old = cur_idx.loc[rows], prev_idx.loc[rows]
+            data = {}
+            for symbol in rows:
+                diff = {k: v for k, v in cur.loc[symbol].items() if v != old.loc[symbol, k]}
+                if diff:
+                    data[symbol] = diff
+            if data:
+                json.dumps({'type': 'delta', 'data': data})
+        naive_times.append(time.perf_counter() - t0)
+
+    messages = sum(sub.queue.qsize() for sub in subs)
+    print(f"订阅者 {subscribers}，股票 {n_symbols}，每人订阅 {per_sub} 只，每帧变化比例 {change_ratio:.0%}")
+    print(f"  QuoteHub tick:        中位 {statistics.median(hub_times) * 1000:8.1f} ms，"
+          f"最大 {max(hub_times) * 1000:8.1f} ms（{len(hub_times)} 帧，共入队 {messages} 条消息）")
+    print(f"  逐订阅者 diff + 序列化: 中位 {statistics.median(naive_times) * 1000:8.1f} ms"
+          f"（只测 {len(naive_times)} 帧）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="行情推送扇出基准")
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--symbols", type=int, default=5500)
+    parser.add_argument("--per-sub", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--change-ratio", type=float, default=0.3)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.symbols, args.per_sub, args.ticks, args.change_ratio))
+
+
+if __name__ == "__main__":
+    main()
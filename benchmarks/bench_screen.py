@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+选股基准：全市场宽表上的向量化条件求值 vs 逐行 Python 判断
+
+- build     股票池 + 快照 + 财务合并为宽表（数据更新后的第一次请求）
+- vector    screen()：整列比较 + 布尔掩码（之后的每次请求）
+- rows      逐条记录 if 判断（等价结果，对照）
+- api       GET /api/v1/screen 端到端（关闭 HTTP 缓存）
+
+逐只调用上游财务接口的做法每次筛选需要与股票数相同次数的网络请求，此处不计。
+
+用法: python benchmarks/bench_screen.py --symbols 5000 --repeat 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import tempfile
+import time
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.domain.analysis.screen import build_screen_frame, parse_filters, screen
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+from app.main import app
+
+QUERY = {'pe_lt': '15', 'roe_gt': '0.05', 'gross_margin_gt': '0.2'}
+
+
+def row_screen(records):
+    return [r for r in records
+            if r['pe_ratio'] == r['pe_ratio'] and r['pe_ratio'] < 15
+            and r['roe'] == r['roe'] and r['roe'] > 0.05
+            and r['gross_margin'] == r['gross_margin'] and r['gross_margin'] > 0.2]
+
+
+def measure(fn, repeat: int) -> float:
+    fn()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times) * 1000
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as root:
+        source = SyntheticDataSource(n_symbols=args.symbols, years=1, seed=0, root=root)
+        service = StockService(data_source=source)
+        frame, _ = await service.get_screen_frame()
+        universe, snapshot, financials = service.universe.frame, await source.get_market_snapshot(), \
+            await source.get_financials()
+        filters = parse_filters(QUERY)
+        records = frame.to_dict('records')
+        matched = screen(frame, filters, limit=len(frame))[1]
+        assert matched == len(row_screen(records))
+
+        print(f"{len(frame)} 只股票，{len(financials)} 行财务数据，条件 {QUERY} 命中 {matched} 只")
+        print(f"  build   {measure(lambda: build_screen_frame(universe, snapshot, financials), args.repeat):>8.2f} ms")
+        print(f"  vector  {measure(lambda: screen(frame, filters, limit=100), args.repeat):>8.2f} ms")
+        print(f"  rows    {measure(lambda: row_screen(records), args.repeat):>8.2f} ms")
+
+        app.state.stock_service = service
+        transport = httpx.ASGITransport(app=app)
+        with patch('app.core.config.settings.HTTP_CACHE_ENABLED', False):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                times = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    resp = await client.get("/api/v1/screen", params={**QUERY, 'sort': 'roe', 'limit': 100})
+                    times.append(time.perf_counter() - t0)
+                    assert resp.status_code == 200
+        print(f"  api     {statistics.median(times) * 1000:>8.2f} ms（前 100 只）")
+        del app.state.stock_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="选股基准")
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+K 线响应序列化基准：1000 根 K 线（可选附带指标）单次响应的 CPU 耗时与响应体大小
+
+- pydantic   原路径：to_dict('records') + response_model 校验 + jsonable_encoder + json.dumps
+- records    orjson 直接从列数据编码，结构与原路径相同（默认）
+- columns    orjson 列式布局 {"date": [...], "open": [...]}
+
+用法: python benchmarks/bench_serialization.py --bars 1000 --repeat 200
+"""
+import argparse
+import json
+import statistics
+import sys
+import os
+import time
+from typing import List
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.encoders import kline_columns_json, kline_records_json
+from app.domain.analysis.indicators import INDICATOR_GROUPS, IndicatorEngine
+from app.domain.models.schemas.stock import StockKLineOut
+from app.domain.services.stock_service import kline_records
+
+ADAPTER = TypeAdapter(List[StockKLineOut])
+
+
+def make_frame(bars: int, with_indicators: bool) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = np.round(np.exp(np.log(10) + rng.normal(0, 0.02, bars).cumsum()), 2)
+    frame = pd.DataFrame({
+        'date': pd.bdate_range(end='2024-05-10', periods=bars), 'open': close, 'high': close * 1.01,
+        'low': close * 0.99, 'close': close, 'volume': np.round(rng.uniform(1e4, 1e6, bars)),
+        'amount': np.round(rng.uniform(1e7, 1e9, bars), 2),
+    })
+    if with_indicators:
+        values = IndicatorEngine().compute(frame['high'].to_numpy(), frame['low'].to_numpy(),
+                                           frame['close'].to_numpy(), groups=INDICATOR_GROUPS)
+        frame = pd.concat([frame, pd.DataFrame(values).round(4)], axis=1)
+    return frame
+
+
+def pydantic_path(frame: pd.DataFrame) -> bytes:
+    """FastAPI response_model 默认路径"""
+    rows = kline_records(frame)
+    validated = ADAPTER.validate_python(rows)
+    content = jsonable_encoder(validated, exclude_unset=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def measure(fn, frame, repeat: int):
+    fn(frame)
+    times = []
+    for _ in range(repeat):
+        t0 = time.process_time()
+        body = fn(frame)
+        times.append(time.process_time() - t0)
+    return statistics.median(times) * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K 线响应序列化基准")
+    parser.add_argument("--bars", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = {'pydantic': pydantic_path, 'records': kline_records_json, 'columns': kline_columns_json}
+    for with_indicators in (False, True):
+        frame = make_frame(args.bars, with_indicators)
+        label = '含全部指标' if with_indicators else '无指标'
+        print(f"\n{args.bars} 根 K 线（{label}）")
+        baseline = None
+        for name, fn in paths.items():
+            ms, size = measure(fn, frame, args.repeat)
+            baseline = baseline or ms
+            print(f"  {name:<10} CPU {ms:>8.3f} ms/次  ({baseline / ms:>5.1f}x)  响应体 {size / 1024:>8.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
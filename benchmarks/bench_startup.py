@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+启动耗时基准：在干净的子进程里导入应用 / CLI 入口，统计墙钟时间与 python -X importtime 的导入明细
+
+- lazy    当前代码：akshare / tushare 在第一次调用上游时才导入
+- eager   启动时先 import akshare, tushare，模拟延迟导入之前的行为
+
+用法: python benchmarks/bench_startup.py --repeat 5 --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import os
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'app.main': 'import app.main',
+    'tasks/run_analysis.py': "import runpy; runpy.run_path('tasks/run_analysis.py', run_name='cli')",
+}
+EAGER = 'import akshare, tushare; '
+
+
+def run(statement: str, importtime: bool = False):
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', statement]
+    t0 = time.perf_counter()
+    result = subprocess.run(args, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return elapsed, result.stderr
+
+
+def top_level_imports(stderr: str, top: int):
+    """importtime 输出中的顶层包（缩进为 0 或 1 层），按累计耗时排序"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for target, statement in TARGETS.items():
+        print(f"\n{target}")
+        for mode, prefix in (('lazy', ''), ('eager', EAGER)):
+            times = [run(prefix + statement)[0] for _ in range(args.repeat)]
+            print(f"  {mode:<6} 启动 {statistics.median(times) * 1000:>8.1f} ms（中位数，{args.repeat} 次）")
+
+    _, stderr = run(TARGETS['app.main'], importtime=True)
+    print(f"\napp.main 导入耗时前 {args.top} 的模块（累计）")
+    for cumulative, name in top_level_imports(stderr, args.top):
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
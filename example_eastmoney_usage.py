@@ -6,21 +6,28 @@ EastMoney 数据源使用示例（支持指定股票、K线周期和返回数量
 import asyncio
 import pandas as pd
 import argparse
-from app.infrastructure.data.sources import EastMoneyDataSource
+from app.infrastructure.data.sources import EastMoneyDataSource, SyntheticDataSource
 
 async def example_eastmoney_usage(
     symbol: str = None,
     kline_freq: str = 'daily',
     kline_limit: int = 30,
-    list_limit: int = 10
+    list_limit: int = 10,
+    offline: bool = False
 ):
     print("=" * 60)
     print("EastMoney数据源使用示例")
     print("=" * 60)
 
     try:
-        em_source = EastMoneyDataSource()
-        print("✅ 成功创建 EastMoneyDataSource 实例\n")
+        if offline:
+            # 离线合成数据：接口与 EastMoneyDataSource 相同，不访问网络
+            em_source = SyntheticDataSource()
+            symbol = symbol or (await em_source.get_universe())['symbol'].iloc[0]
+            print("✅ 成功创建 SyntheticDataSource 实例（离线合成数据）\n")
+        else:
+            em_source = EastMoneyDataSource()
+            print("✅ 成功创建 EastMoneyDataSource 实例\n")
 
         # 测试连接
         conn_result = await em_source.test_connection()
@@ -78,6 +85,7 @@ async def example_eastmoney_usage(
     print("1. 直接运行此脚本即可测试 EastMoney 数据源")
     print("2. 可以通过参数指定股票代码、K线周期、返回K线条数和股票列表条数，例如:")
     print("   python example_eastmoney_usage.py -s 600519 -f weekly --kline-limit 50 --list-limit 20")
+    print("3. 加 --offline 使用离线合成数据源，不访问网络")
     print("=" * 60)
 
 
@@ -87,6 +95,7 @@ if __name__ == "__main__":
     parser.add_argument('-f', '--freq', type=str, default='daily', choices=['daily', 'weekly', 'monthly'], help='K线周期')
     parser.add_argument('--kline-limit', type=int, default=30, help='返回K线条数')
     parser.add_argument('--list-limit', type=int, default=10, help='股票列表显示条数')
+    parser.add_argument('--offline', action='store_true', help='使用离线合成数据源')
     args = parser.parse_args()
 
-    asyncio.run(example_eastmoney_usage(args.symbol, args.freq, args.kline_limit, args.list_limit))
+    asyncio.run(example_eastmoney_usage(args.symbol, args.freq, args.kline_limit, args.list_limit, args.offline))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+录制一个交易日的上游调用到 cassette：股票列表、全市场快照、行业成分、逐只全量日线与复权因子
+
+录制时使用临时的本地日线库，保证每只股票都走一次全量下载；之后设置
+CASSETTE_MODE=replay CASSETTE_PATH=<目录> 即可离线回放（可用 CASSETTE_LATENCY_SCALE=1 按原始耗时重放）。
+回放按 接口 + 参数 匹配，日线增量同步的 start_date 取决于本地水位，因此回放时 KLINE_STORE_DIR 也应指向空目录。
+
+用法: python scripts/record_cassette.py --path data/cassettes/20240510 [--symbols 000001,600000] [--limit 500]
+"""
+import argparse
+import asyncio
+import sys
+import os
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.infrastructure.data.cassette import Cassette, use_cassette
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+async def record(path: str, symbols=None, limit: int = 0, industries: bool = False, adjust: bool = False):
+    cassette = Cassette(path, mode='auto')
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as root:
+        source = use_cassette(EastMoneyDataSource(kline_store=KLineStore(root)), cassette)
+        universe = await source.get_universe()
+        snapshot = await source.get_market_snapshot()
+        print(f"股票列表 {len(universe)} 只，全市场快照 {len(snapshot)} 行")
+        if industries:
+            print(f"行业成分 {len(await source.get_industry_map())} 行")
+
+        targets = symbols or universe['symbol'].tolist()
+        if limit:
+            targets = targets[:limit]
+        done = 0
+        for symbol in targets:
+            bars = await source.get_stock_kline(symbol, 'daily', 1, 'qfq' if adjust else '')
+            done += not bars.empty
+            if done and done % 200 == 0:
+                print(f"  已录制 {done}/{len(targets)} 只")
+    stats = cassette.stats()
+    print(f"完成：{stats['calls']} 次调用，{stats['size_bytes'] / 1e6:.1f} MB，耗时 {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="录制上游调用 cassette")
+    parser.add_argument("--path", required=True, help="cassette 目录")
+    parser.add_argument("--symbols", help="逗号分隔的股票代码，默认全市场")
+    parser.add_argument("--limit", type=int, default=0, help="最多录制多少只股票的日线")
+    parser.add_argument("--industries", action="store_true", help="同时录制行业板块成分")
+    parser.add_argument("--adjust", action="store_true", help="同时录制复权因子")
+    args = parser.parse_args()
+    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()] if args.symbols else None
+    asyncio.run(record(args.path, symbols, args.limit, args.industries, args.adjust))
+
+
+if __name__ == "__main__":
+    main()
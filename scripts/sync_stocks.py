@@ -1,22 +1,95 @@
 #!/usr/bin/env python3
 """
-股票数据同步脚本
+股票数据同步脚本：股票列表 + 最近日线 写入数据库
+
+- 东财（默认）：日线先走本地 K 线库的增量同步，再按 DB_BATCH_SIZE 批量 upsert 到 daily_bar
+- Tushare：按交易日整市场拉取 pro.daily(trade_date=...)，只补库中缺失的交易日
+
+用法: python scripts/sync_stocks.py [--days 5] [--symbols 000001,600000]
+      python scripts/sync_stocks.py --source tushare --start 20240101
 """
+import argparse
 import asyncio
 import sys
 import os
+import time
+from datetime import datetime, timedelta
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import pandas as pd
+
+from app.core.config import settings
+from app.core.database import init_db
+from app.domain.services.daily_bar_sync_service import DailyBarSyncService
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
 from app.infrastructure.data.sources.tushare import TushareDataSource
+from app.infrastructure.db import StockRepository
+
+# 每攒够这么多只股票的日线写一次库
+FLUSH_SYMBOLS = 500
 
-async def sync_stocks():
+
+async def sync_stocks(days: int = 5, symbols=None):
     """同步股票数据"""
     print("开始同步股票数据...")
-    
-    tushare = TushareDataSource()
-    
-    # 这里实现数据同步逻辑
-    print("股票数据同步完成")
+    started = time.perf_counter()
+
+    init_db()
+    repo = StockRepository()
+    data_source = EastMoneyDataSource()
+
+    universe = await data_source.get_universe(refresh=True)
+    if not universe.empty:
+        industries = await data_source.get_industry_map()
+        if not industries.empty:
+            universe = universe.drop(columns=['industry'], errors='ignore').merge(
+                industries[['symbol', 'industry']].drop_duplicates('symbol'), on='symbol', how='left'
+            )
+        count = repo.upsert_stock_basics(universe)
+        print(f"股票列表: {count} 只")
+    symbols = symbols or universe.get('symbol', pd.Series(dtype=str)).tolist()
+
+    semaphore = asyncio.Semaphore(settings.KLINE_BATCH_CONCURRENCY)
+
+    async def fetch(symbol):
+        async with semaphore:
+            bars = await data_source.get_stock_kline(symbol, 'daily', days)
+            return bars.assign(symbol=symbol) if not bars.empty else bars
+
+    total = 0
+    for start in range(0, len(symbols), FLUSH_SYMBOLS):
+        frames = await asyncio.gather(*(fetch(s) for s in symbols[start:start + FLUSH_SYMBOLS]))
+        frames = [f for f in frames if not f.empty]
+        if frames:
+            total += await asyncio.to_thread(repo.upsert_daily_bars, pd.concat(frames, ignore_index=True))
+        print(f"日线进度: {min(start + FLUSH_SYMBOLS, len(symbols))}/{len(symbols)}, 已写入 {total} 行")
+
+    print(f"股票数据同步完成，耗时 {time.perf_counter() - started:.1f} 秒")
+
+
+async def sync_daily_by_date(start: str):
+    """Tushare 按交易日补齐日线"""
+    print(f"开始按交易日同步日线（{start} 起）...")
+    started = time.perf_counter()
+
+    init_db()
+    service = DailyBarSyncService(TushareDataSource(), StockRepository())
+    counts = await service.backfill(datetime.strptime(start, '%Y%m%d').date())
+    for trade_date, count in counts.items():
+        print(f"  {trade_date}: {count} 行")
+
+    print(f"日线同步完成: {len(counts)} 个交易日, 耗时 {time.perf_counter() - started:.1f} 秒")
+
 
 if __name__ == "__main__":
-    asyncio.run(sync_stocks())
+    parser = argparse.ArgumentParser(description="股票数据同步")
+    parser.add_argument('--source', choices=['eastmoney', 'tushare'], default='eastmoney')
+    parser.add_argument('--start', default=None, help='tushare: 从该日期（YYYYMMDD）起补齐缺失交易日，默认 10 天前')
+    parser.add_argument('--days', type=int, default=5, help='eastmoney: 每只股票写入最近多少根日线')
+    parser.add_argument('--symbols', default=None, help='逗号分隔的股票代码，默认全市场')
+    args = parser.parse_args()
+    if args.source == 'tushare':
+        start = args.start or (datetime.now() - timedelta(days=10)).strftime('%Y%m%d')
+        asyncio.run(sync_daily_by_date(start))
+    else:
+        asyncio.run(sync_stocks(args.days, args.symbols.split(',') if args.symbols else None))
@@ -1,28 +1,71 @@
 #!/usr/bin/env python3
 """
-股票分析任务
+全市场股票分析任务
+
+按股票分片到进程池计算技术指标与信号，结果写入单个 Parquet 文件；
+同一 run_id 再次运行且本地日线未更新时，从已完成的分片处续跑；日线有更新则重新计算。
+
+用法: python tasks/run_analysis.py [--sync] [--workers 8] [--run-id 20240510]
 """
+import argparse
 import asyncio
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.config import settings
+from app.domain.analysis.runner import AnalysisRunner
 from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+async def load_symbols(stock_service: StockService, store: KLineStore, sync: bool):
+    """股票池；拿不到上游列表时使用本地已有日线的股票"""
+    universe = await stock_service.data_source.get_universe()
+    symbols = universe['symbol'].tolist() if not universe.empty else store.symbols()
+
+    if sync:
+        print(f"同步日线: {len(symbols)} 只")
+        semaphore = asyncio.Semaphore(settings.KLINE_BATCH_CONCURRENCY)
+
+        async def sync_one(symbol):
+            async with semaphore:
+                try:
+                    await stock_service.data_source.get_stock_kline(symbol, 'daily', 1)
+                except Exception as e:
+                    print(f"同步 {symbol} 失败: {e}")
 
-async def run_analysis():
+        await asyncio.gather(*(sync_one(s) for s in symbols))
+    return symbols
+
+
+def run_analysis(sync: bool = False, workers=None, run_id=None):
     """运行股票分析"""
     print("开始运行股票分析...")
-    
-    stock_service = StockService()
-    
-    # 获取股票列表进行分析
-    stocks = await stock_service.get_stocks(limit=10)
-    
-    for stock in stocks:
-        print(f"分析股票: {stock.symbol} - {stock.name}")
-        # 这里实现具体的分析逻辑
-    
-    print("股票分析完成")
+
+    store = KLineStore(settings.KLINE_STORE_DIR)
+    stock_service = StockService(EastMoneyDataSource(kline_store=store))
+    symbols = asyncio.run(load_symbols(stock_service, store, sync))
+
+    runner = AnalysisRunner(
+        store,
+        settings.ANALYSIS_OUTPUT_DIR,
+        workers=workers or settings.ANALYSIS_WORKERS,
+        shard_size=settings.ANALYSIS_SHARD_SIZE,
+        bars=settings.ANALYSIS_BARS,
+    )
+    summary = runner.run(symbols, run_id=run_id)
+
+    print(f"股票分析完成: {summary['symbols']} 只, {summary['shards']} 个分片"
+          f"（本次计算 {summary['computed_shards']}）, 耗时 {summary['seconds']} 秒")
+    print(f"结果文件: {summary['output']}")
+
 
 if __name__ == "__main__":
-    asyncio.run(run_analysis())
+    parser = argparse.ArgumentParser(description="全市场股票分析")
+    parser.add_argument('--sync', action='store_true', help='分析前先增量同步日线')
+    parser.add_argument('--workers', type=int, default=None, help='进程数，默认 CPU 核数')
+    parser.add_argument('--run-id', default=None, help='运行标识，默认当天日期；相同标识且日线未更新时续跑')
+    args = parser.parse_args()
+    run_analysis(args.sync, args.workers, args.run_id)
@@ -9,7 +9,10 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from app.core.database import init_db
+from app.domain.services.daily_bar_sync_service import DailyBarSyncService
 from app.infrastructure.data.sources.tushare import TushareDataSource
+from app.infrastructure.db import StockRepository
 
 async def sync_stocks_task():
     """执行股票数据同步任务"""
@@ -17,8 +20,10 @@ async def sync_stocks_task():
     
     try:
         tushare = TushareDataSource()
-        # 实现具体的同步逻辑
-        print("股票数据同步完成")
+        init_db()
+        # 按交易日整市场拉取，只补缺失的交易日；当日数据未发布时返回空，下次运行再补
+        counts = await DailyBarSyncService(tushare, StockRepository()).sync_recent(days=10)
+        print(f"股票数据同步完成: {len(counts)} 个交易日, {sum(counts.values())} 行")
     except Exception as e:
         print(f"股票数据同步失败: {e}")
 
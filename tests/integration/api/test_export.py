@@ -0,0 +1,62 @@
+"""
+Arrow / Parquet 批量导出接口集成测试
+"""
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+from app.main import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    source = SyntheticDataSource(n_symbols=50, years=2, seed=3, root=str(tmp_path))
+    app.state.stock_service = StockService(data_source=source)
+    yield TestClient(app)
+    del app.state.stock_service
+    if hasattr(app.state, "response_cache"):
+        del app.state.response_cache
+
+
+class TestExport:
+    """批量导出测试类"""
+
+    def test_klines_arrow_stream(self, client):
+        symbols = app.state.stock_service.data_source._universe['symbol'].tolist()[:3]
+        resp = client.get("/api/v1/stocks/export/klines",
+                          params={"symbols": ",".join(symbols), "limit": 40},
+                          headers={"Accept": "application/vnd.apache.arrow.stream"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+        table = pa.ipc.open_stream(resp.content).read_all()
+        assert table.schema.field('date').type == pa.date32()
+        assert table.num_rows == 120
+        # 按请求顺序，每只股票一段
+        assert table.column('symbol').to_pylist()[::40] == symbols
+
+    def test_klines_parquet_matches_json(self, client):
+        symbol = app.state.stock_service.data_source._universe['symbol'].iloc[5]
+        resp = client.get("/api/v1/stocks/export/klines",
+                          params={"symbols": symbol, "limit": 10, "format": "parquet"})
+        assert resp.headers["content-type"] == "application/vnd.apache.parquet"
+        frame = pq.read_table(pa.BufferReader(resp.content)).to_pandas()
+
+        bars = client.get(f"/api/v1/stocks/{symbol}/kline", params={"limit": 10, "layout": "columns"}).json()
+        assert frame['close'].tolist() == bars['close']
+        assert [d.isoformat() for d in frame['date']] == bars['date']
+
+    # 快照表的 attrs（快照时间）不能让 pyarrow 在序列化 pandas 元数据时告警
+    @pytest.mark.filterwarnings("error::UserWarning")
+    def test_universe_and_snapshot(self, client):
+        universe = pa.ipc.open_stream(client.get("/api/v1/stocks/export/universe").content).read_all()
+        assert universe.num_rows == 50 and 'industry' in universe.column_names
+
+        resp = client.get("/api/v1/stocks/export/snapshot",
+                          headers={"Accept": "application/vnd.apache.parquet"})
+        snapshot = pq.read_table(pa.BufferReader(resp.content))
+        assert snapshot.num_rows == 50
+        assert snapshot.schema.field('current_price').type == pa.float64()
@@ -0,0 +1,68 @@
+"""
+横截面因子排名接口集成测试
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+from app.main import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    source = SyntheticDataSource(n_symbols=300, years=1, seed=5, root=str(tmp_path))
+    app.state.stock_service = StockService(data_source=source)
+    yield TestClient(app)
+    del app.state.stock_service
+    if hasattr(app.state, "response_cache"):
+        del app.state.response_cache
+
+
+class TestFactors:
+    """因子排名接口测试类"""
+
+    def test_list(self, client):
+        factors = client.get("/api/v1/factors").json()
+        assert [f["name"] for f in factors] == list(app.state.stock_service.factor_engine.factors)
+        assert all(f["weight"] == 1.0 for f in factors)
+
+    def test_top_and_bottom(self, client):
+        top = client.get("/api/v1/factors/top", params={"n": 20}).json()
+        # 与本次请求所用的同一份因子表比较（快照 TTL 过期后会重新计算）
+        frame = app.state.stock_service._factor_frame[3]
+        ranked = frame.dropna(subset=["score"])
+        assert top["total"] == len(ranked) > 20
+        assert top["count"] == 20
+        # as_of 是计算所用快照的回源时间，而不是因子表的计算时间
+        snapshot = app.state.stock_service.data_source.snapshot_cache._snapshot
+        assert datetime.fromisoformat(top["as_of"]) == snapshot.fetched_at
+        assert [r["symbol"] for r in top["data"]] == \
+            ranked.sort_values("score", ascending=False, kind="mergesort")["symbol"].head(20).tolist()
+
+        bottom = client.get("/api/v1/factors/bottom", params={"n": 5, "by": "ep"}).json()
+        frame = app.state.stock_service._factor_frame[3]
+        expected = frame.dropna(subset=["ep_z"]).sort_values("ep_z", kind="mergesort")["symbol"].head(5)
+        assert [r["symbol"] for r in bottom["data"]] == expected.tolist()
+
+    def test_industry_and_weights(self, client):
+        universe = app.state.stock_service.data_source._universe
+        industry = universe["industry"].value_counts().index[0]
+        params = {"industry": industry, "by": "score_ind", "weights": "bp:1", "n": 1000}
+        resp = client.get("/api/v1/factors/top", params=params).json()
+        assert {r["industry"] for r in resp["data"]} == {industry}
+        assert resp["count"] == resp["total"]
+        # 只用 bp 时行业综合分就是 bp 的行业内百分位
+        np.testing.assert_allclose([r["score_ind"] for r in resp["data"]],
+                                   [r["bp_ind_pct"] for r in resp["data"]])
+        assert [r["score_ind"] for r in resp["data"]] == sorted((r["score_ind"] for r in resp["data"]), reverse=True)
+
+    def test_bad_request(self, client):
+        assert client.get("/api/v1/factors/top", params={"by": "name"}).status_code == 400
+        assert client.get("/api/v1/factors/top", params={"weights": "alpha:1"}).status_code == 400
+        assert client.get("/api/v1/factors/bottom", params={"weights": "ep:x"}).status_code == 400
+        for weights in ("ep:-1", "ep:nan", "ep:inf,bp:1"):
+            assert client.get("/api/v1/factors/top", params={"weights": weights}).status_code == 400
@@ -0,0 +1,58 @@
+"""
+HTTP 响应缓存（ETag / 条件请求 / Cache-Control）集成测试
+"""
+import pandas as pd
+from unittest.mock import AsyncMock, patch
+
+
+def _bars(limit):
+    dates = pd.bdate_range(end='2024-05-10', periods=limit)
+    return pd.DataFrame({'date': dates, 'open': 10.0, 'high': 11.0, 'low': 9.0, 'close': 10.5,
+                         'volume': 1e5, 'amount': 1e8})
+
+
+class TestHttpCache:
+    """K 线响应缓存测试类"""
+
+    def test_etag_and_not_modified(self, start_app):
+        kline = AsyncMock(side_effect=lambda symbol, freq, limit, adjust: _bars(limit))
+        with patch('app.infrastructure.data.sources.eastmoney.EastMoneyDataSource.get_stock_kline', kline), \
+                patch('app.domain.services.stock_service.StockService.cache_max_age',
+                      AsyncMock(return_value=3600)):
+            with start_app() as client:
+                url = "/api/v1/stocks/000001/kline"
+                first = client.get(url, params={"limit": 5})
+                assert first.status_code == 200 and len(first.json()) == 5
+                assert first.headers["X-Cache"] == "MISS"
+                assert first.headers["Cache-Control"] == "public, max-age=3600"
+                etag = first.headers["ETag"]
+
+                # 带 ETag 的条件请求：304，不再读数据源
+                revalidated = client.get(url, params={"limit": 5}, headers={"If-None-Match": etag})
+                assert revalidated.status_code == 304 and revalidated.content == b""
+                assert revalidated.headers["ETag"] == etag
+
+                again = client.get(url, params={"limit": 5})
+                assert again.headers["X-Cache"] == "HIT" and again.content == first.content
+                assert kline.await_count == 1
+
+                # 不同参数是不同的缓存条目
+                other = client.get(url, params={"limit": 6})
+                assert other.headers["X-Cache"] == "MISS" and other.headers["ETag"] != etag
+                assert client.get(url, params={"limit": 6},
+                                  headers={"If-None-Match": f'"stale", W/{other.headers["ETag"]}'}).status_code == 304
+
+                columns = client.get(url, params={"limit": 5, "layout": "columns"})
+                assert columns.headers["X-Cache"] == "MISS"
+                assert columns.json()["close"] == [10.5] * 5 and columns.json()["volume"] == [1e5] * 5
+
+                stats = client.get("/api/v1/system/caches").json()["http_response"]
+                assert stats["entries"] == 3 and stats["not_modified"] == 2
+
+    def test_errors_are_not_cached(self, start_app):
+        kline = AsyncMock(return_value=pd.DataFrame())
+        with patch('app.infrastructure.data.sources.eastmoney.EastMoneyDataSource.get_stock_kline', kline):
+            with start_app() as client:
+                for _ in range(2):
+                    assert client.get("/api/v1/stocks/000001/kline").status_code == 500
+                assert kline.await_count == 2
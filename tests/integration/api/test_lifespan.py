@@ -0,0 +1,51 @@
+"""
+应用生命周期集成测试：共享 StockService、启动预热、缓存状态接口
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.data.executor import shutdown_executors
+from app.main import app
+
+
+class TestLifespan:
+    """生命周期测试类"""
+
+    def test_shared_service_is_warmed_up_and_inspectable(self, start_app):
+        with start_app(APP_WARMUP_ON_STARTUP=True) as client:
+            service = app.state.stock_service
+            caches = client.get("/api/v1/system/caches").json()["service"]
+            assert caches["universe"]["rows"] == 2
+            assert caches["snapshot"]["rows"] == 2
+            assert caches["universe_index"]["rows"] == 2
+
+            resp = client.get("/api/v1/stocks", params={"limit": 1})
+            assert [s["symbol"] for s in resp.json()] == ["000001"]
+            resp = client.get("/api/v1/stocks", params={"limit": 1, "cursor": resp.headers["X-Next-Cursor"]})
+            assert [s["symbol"] for s in resp.json()] == ["600000"]
+            assert "X-Next-Cursor" not in resp.headers
+            assert app.state.stock_service is service
+            # 列表请求走内存索引，不回源
+            assert client.get("/api/v1/system/caches").json()["service"]["universe"]["fetches"] == 1
+
+    def test_shutdown_releases_shared_state(self, start_app):
+        with start_app() as client:
+            assert client.get("/api/v1/stocks/000001").status_code == 200
+        # 线程池已随 lifespan 关闭，共享对象一并移除；之后未经 lifespan 的请求按需重建，不会用到已关闭的线程池
+        assert not hasattr(app.state, "stock_service") and not hasattr(app.state, "quote_hub")
+        client = TestClient(app)
+        assert client.get("/api/v1/stocks/000001").status_code == 200
+        del app.state.stock_service
+        del app.state.response_cache
+
+    def test_failed_startup_still_cleans_up(self, start_app):
+        # 预热抛出非超时异常时启动失败，已创建的共享对象与线程池仍要回收
+        with patch('app.main.StockService.warm_up', side_effect=RuntimeError("upstream down")), \
+                patch('app.main.shutdown_executors', wraps=shutdown_executors) as shutdown:
+            with pytest.raises(RuntimeError):
+                with start_app(APP_WARMUP_ON_STARTUP=True):
+                    pass
+        shutdown.assert_called_once()
+        assert not hasattr(app.state, "stock_service") and not hasattr(app.state, "quote_hub")
@@ -0,0 +1,29 @@
+"""
+/metrics 接口集成测试
+"""
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.main import app
+
+
+class TestMetricsEndpoint:
+    """指标接口测试类"""
+
+    def test_disabled_returns_404(self):
+        with patch.object(metrics.registry, 'enabled', False):
+            assert TestClient(app).get("/metrics").status_code == 404
+
+    def test_exports_routes_sources_and_caches(self, start_app):
+        with patch.object(metrics.registry, 'enabled', True), start_app() as client:
+            service = app.state.stock_service
+            client.portal.call(service.data_source.get_stock_realtime_quote, '000001')
+            client.portal.call(service.data_source.get_stock_realtime_quote, '600000')
+            client.get("/health")
+            text = client.get("/metrics").text
+
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"} 1' in text
+        assert 'stock_call_rows_total{component="eastmoney",method="get_stock_realtime_quote"}' in text
+        assert 'stock_cache_hits_total{cache="snapshot"} 1' in text
+        assert 'stock_cache_hit_ratio{cache="snapshot"} 0.5' in text
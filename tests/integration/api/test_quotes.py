@@ -0,0 +1,56 @@
+"""
+实时行情推送接口集成测试
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+
+
+class TestQuoteStream:
+    """行情推送接口测试类"""
+
+    def test_websocket_snapshot_and_subscribe(self, start_app):
+        with start_app(QUOTE_STREAM_INTERVAL_SECONDS=0.05) as client:
+            with client.websocket_connect("/api/v1/quotes/ws?symbols=000001") as ws:
+                message = ws.receive_json()
+                assert message['type'] == 'snapshot'
+                assert message['data']['000001']['current_price'] == 10.0
+                assert set(message['data']) == {'000001'}
+
+                ws.send_json({"action": "subscribe", "symbols": ["600000"]})
+                message = ws.receive_json()
+                assert message['type'] == 'snapshot'
+                assert message['data']['600000']['current_price'] == 8.0
+
+                ws.send_text("not json")
+                assert ws.receive_json()['type'] == 'error'
+
+            stats = client.get("/api/v1/system/caches").json()["quote_hub"]
+            assert stats['ticks'] >= 1
+
+    def test_each_tick_reads_a_fresh_snapshot(self, start_app):
+        # 快照 TTL（默认 5 秒）长于推送间隔时，每帧仍要回源，而不是隔帧复用缓存
+        with start_app(QUOTE_STREAM_INTERVAL_SECONDS=0.05, SNAPSHOT_TTL_SECONDS=60) as client:
+            hub = app.state.quote_hub
+            cache = app.state.stock_service.data_source.snapshot_cache
+            with client.websocket_connect("/api/v1/quotes/ws?symbols=000001") as ws:
+                ws.receive_json()
+                ticks, fetches = hub.ticks, cache.fetches
+                deadline = time.monotonic() + 5
+                while hub.ticks < ticks + 3 and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                assert hub.ticks >= ticks + 3
+                assert cache.fetches - fetches >= 3
+
+    def test_hub_only_exists_within_lifespan(self):
+        # 未经 lifespan 启动时不按需创建推送中心（其后台轮询无人停止）
+        client = TestClient(app)
+        assert client.get("/api/v1/quotes/stream", params={"symbols": "000001"}).status_code == 503
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/v1/quotes/ws?symbols=000001"):
+                pass
+        assert not hasattr(app.state, "quote_hub")
@@ -0,0 +1,63 @@
+"""
+横截面选股接口集成测试
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+from app.infrastructure.data.storage.financial_store import report_periods
+from app.main import app
+
+
+@pytest.fixture
+def client(tmp_path):
+    source = SyntheticDataSource(n_symbols=300, years=1, seed=5, root=str(tmp_path))
+    app.state.stock_service = StockService(data_source=source)
+    yield TestClient(app)
+    del app.state.stock_service
+    if hasattr(app.state, "response_cache"):
+        del app.state.response_cache
+
+
+class TestScreen:
+    """选股接口测试类"""
+
+    def test_filters_match_pandas(self, client):
+        resp = client.get("/api/v1/screen", params={"pe_lt": 15, "roe_gt": 0.05, "sort": "roe", "limit": 10})
+        assert resp.status_code == 200
+        body = resp.json()
+
+        # 与本次请求所用的同一份宽表比较（快照 TTL 过期后会重新生成）
+        cached = app.state.stock_service._screen_frame
+        frame, period = cached.frame, cached.used
+        assert body["period"] == period
+        assert (frame['report_date'].dropna() == pd.Timestamp(period)).all()
+        expected = frame[(frame['pe_ratio'] > 0) & (frame['pe_ratio'] < 15) & (frame['roe'] > 0.05)]
+        assert body["total"] == len(expected) > 10
+        assert body["count"] == 10
+        top = expected.sort_values('roe', ascending=False)['symbol'].head(10).tolist()
+        assert [r["symbol"] for r in body["data"]] == top
+        assert all(r["report_date"] == body["data"][0]["report_date"] for r in body["data"])
+
+    def test_industry_and_period(self, client):
+        universe = app.state.stock_service.data_source._universe
+        industries = universe['industry'].value_counts().index[:2].tolist()
+        period = report_periods(date.today() - timedelta(days=365), date.today())[-2]
+        params = {"industry": ",".join(industries), "period": period, "sort": "eps", "order": "asc", "limit": 1000}
+        resp = client.get("/api/v1/screen", params=params).json()
+        assert resp["total"] == resp["count"] == universe['industry'].isin(industries).sum()
+        assert {r["industry"] for r in resp["data"]} == set(industries)
+        eps = [np.nan if r["eps"] is None else r["eps"] for r in resp["data"]]
+        assert pd.Series(eps).dropna().is_monotonic_increasing
+        reported = {r["report_date"] for r in resp["data"] if r["report_date"]}
+        assert reported == {pd.Timestamp(period).strftime("%Y-%m-%d")}
+
+    def test_bad_request(self, client):
+        assert client.get("/api/v1/screen", params={"foo_lt": 1}).status_code == 400
+        assert client.get("/api/v1/screen", params={"roe_gt": "high"}).status_code == 400
+        assert client.get("/api/v1/screen", params={"sort": "name"}).status_code == 400
@@ -0,0 +1,62 @@
+"""
+集成测试共用夹具：本地伪造的上游表、带 lifespan 启动的 TestClient
+
+后台回源任务（行业 / 财务刷新）与 K 线主备对冲默认关闭，测试运行时不产生外网请求
+"""
+from contextlib import ExitStack, contextmanager
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.infrastructure.data.normalize import normalize_stock_list
+from app.main import app
+
+EASTMONEY = 'app.infrastructure.data.sources.eastmoney.EastMoneyDataSource'
+STOCK_NAMES = {'000001': '平安银行', '600000': '浦发银行'}
+
+
+def stock_list() -> pd.DataFrame:
+    return normalize_stock_list(pd.DataFrame({'code': list(STOCK_NAMES), 'name': list(STOCK_NAMES.values())}))
+
+
+def spot_table() -> pd.DataFrame:
+    return pd.DataFrame({'symbol': list(STOCK_NAMES), 'name': list(STOCK_NAMES.values()),
+                         'current_price': [10.0, 8.0]})
+
+
+@pytest.fixture(autouse=True)
+def no_background_upstream():
+    with patch('app.core.config.settings.UNIVERSE_INDUSTRY_ENABLED', False), \
+            patch('app.core.config.settings.FINANCIAL_REFRESH_ENABLED', False), \
+            patch('app.core.config.settings.KLINE_HEDGE_ENABLED', False):
+        yield
+
+
+@pytest.fixture
+def fake_upstream():
+    """东财股票列表与全市场快照改为 stock_list() / spot_table()"""
+    with patch(f'{EASTMONEY}._fetch_stock_list', lambda self: stock_list()), \
+            patch(f'{EASTMONEY}._fetch_spot_table', lambda self: spot_table()):
+        yield
+
+
+@pytest.fixture
+def start_app(fake_upstream):
+    """
+    启动带 lifespan 的 TestClient（上游见 fake_upstream）；关键字参数覆盖 settings，默认不做启动预热::
+
+        with start_app(QUOTE_STREAM_INTERVAL_SECONDS=0.05) as client:
+            ...
+    """
+    @contextmanager
+    def start(**overrides):
+        overrides = {'APP_WARMUP_ON_STARTUP': False, **overrides}
+        with ExitStack() as stack:
+            for name, value in overrides.items():
+                stack.enter_context(patch(f'app.core.config.settings.{name}', value))
+            with TestClient(app) as client:
+                yield client
+
+    return start
@@ -0,0 +1,69 @@
+"""
+快速序列化单元测试：输出与 pydantic response_model 路径一致
+"""
+import json
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import TypeAdapter
+
+from app.api.encoders import kline_columns_json, kline_records_json, stocks_json
+from app.domain.analysis.indicators import IndicatorEngine
+from app.domain.models.schemas.stock import StockKLineOut, StockResponse
+from app.domain.services.stock_service import kline_records
+
+
+def _frame(n=60, indicators=False):
+    rng = np.random.default_rng(0)
+    close = np.round(10 + rng.normal(0, 0.2, n).cumsum(), 2)
+    frame = pd.DataFrame({
+        'date': pd.bdate_range('2024-01-02', periods=n), 'open': close, 'high': close + 0.1,
+        'low': close - 0.1, 'close': close, 'volume': rng.integers(1e4, 1e6, n).astype(float),
+        'amount': rng.uniform(1e7, 1e9, n),
+    })
+    if indicators:
+        values = IndicatorEngine().compute(frame['high'].to_numpy(), frame['low'].to_numpy(),
+                                           frame['close'].to_numpy(), groups=('ma', 'macd'))
+        frame = pd.concat([frame, pd.DataFrame(values).round(4)], axis=1)
+    return frame
+
+
+def _pydantic_json(frame):
+    adapter = TypeAdapter(List[StockKLineOut])
+    return json.loads(adapter.dump_json(adapter.validate_python(kline_records(frame)), exclude_unset=True))
+
+
+class TestKLineEncoders:
+    """K 线编码测试类"""
+
+    @pytest.mark.parametrize('indicators', [False, True])
+    def test_records_match_response_model(self, indicators):
+        frame = _frame(indicators=indicators)
+        assert json.loads(kline_records_json(frame)) == _pydantic_json(frame)
+
+    def test_columns_layout(self):
+        frame = _frame(indicators=True)
+        payload = json.loads(kline_columns_json(frame))
+        assert payload['date'][:2] == ['2024-01-02', '2024-01-03']
+        assert payload['close'] == frame['close'].tolist()
+        assert payload['volume'] == frame['volume'].tolist()
+        # 预热不足的位置为 null
+        assert payload['indicators']['ma20'][0] is None
+        assert payload['indicators']['ma20'][-1] == frame['ma20'].iloc[-1]
+
+
+class TestStocksEncoder:
+    """股票列表编码测试类"""
+
+    def test_matches_response_model(self):
+        stocks = [{'symbol': '000001', 'name': '平安银行', 'exchange': 'SZSE', 'industry': '银行',
+                   'market_cap': np.float64(2.1e11), 'volume': np.int64(1200)},
+                  {'symbol': '600000', 'name': '浦发银行', 'exchange': 'SSE'}]
+        adapter = TypeAdapter(List[StockResponse])
+        expected = json.loads(adapter.dump_json(adapter.validate_python(stocks)))
+        actual = json.loads(stocks_json(stocks))
+        for row in expected + actual:
+            row.pop('updated_at')
+        assert actual == expected
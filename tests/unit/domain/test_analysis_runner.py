@@ -0,0 +1,82 @@
+"""
+全市场分析任务单元测试
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.analysis.indicators import IndicatorEngine
+from app.domain.analysis.runner import AnalysisRunner
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def _make_store(root, n_symbols=12, n_bars=120):
+    store = KLineStore(str(root))
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2024-01-01', periods=n_bars)
+    for i in range(n_symbols):
+        # 最后一只只有少量K线，检验左侧补 NaN 的处理
+        k = 10 if i == n_symbols - 1 else n_bars
+        close = 10 + np.cumsum(rng.normal(0, 0.2, k))
+        store.upsert(f"{600000 + i:06d}", pd.DataFrame({
+            'date': dates[-k:].date, 'open': close, 'high': close + 0.3, 'low': close - 0.3,
+            'close': close, 'volume': 1e5, 'amount': 1e8,
+        }))
+    return store
+
+
+class TestAnalysisRunner:
+    """全市场分析任务测试类"""
+
+    def test_run_matches_single_symbol_indicators(self, tmp_path):
+        store = _make_store(tmp_path / 'kline')
+        symbols = store.symbols() + ['999999']
+        runner = AnalysisRunner(store, str(tmp_path / 'out'), workers=2, shard_size=5, bars=100)
+
+        summary = runner.run(symbols, run_id='t1')
+        result = pd.read_parquet(summary['output'])
+
+        assert summary['shards'] == 3 and summary['computed_shards'] == 3
+        # 本地没有数据的股票不进入结果
+        assert result['symbol'].tolist() == store.symbols()
+
+        bars = store.read('600003').tail(100)
+        expected = IndicatorEngine().compute(bars['high'].to_numpy(), bars['low'].to_numpy(), bars['close'].to_numpy())
+        row = result.set_index('symbol').loc['600003']
+        for column in ('ma20', 'macd_dif', 'rsi14', 'kdj_k', 'atr14'):
+            assert row[column] == pytest.approx(expected[column][-1])
+        assert result.set_index('symbol').loc['600011', 'bars'] == 10
+
+    def test_resume_only_recomputes_missing_shards(self, tmp_path):
+        store = _make_store(tmp_path / 'kline')
+        runner = AnalysisRunner(store, str(tmp_path / 'out'), workers=1, shard_size=5, bars=100)
+        first = runner.run(store.symbols(), run_id='t2')
+
+        # 模拟任务在最后一个分片前崩溃
+        (tmp_path / 'out' / 't2' / 'shards' / '00002.parquet').unlink()
+        second = runner.run(store.symbols(), run_id='t2')
+
+        assert second['computed_shards'] == 1
+        pd.testing.assert_frame_equal(pd.read_parquet(first['output']), pd.read_parquet(second['output']))
+
+    def test_rerun_after_bars_update_recomputes(self, tmp_path):
+        store = _make_store(tmp_path / 'kline', n_symbols=6)
+        runner = AnalysisRunner(store, str(tmp_path / 'out'), workers=1, shard_size=5, bars=100)
+        first = runner.run(store.symbols(), run_id='t4')
+
+        # 同一天同步了新一根日线后再跑：不能直接返回上次的结果
+        last = store.read('600000').iloc[[-1]]
+        next_day = (pd.Timestamp(last['date'].iloc[0]) + pd.offsets.BDay(1)).date()
+        store.upsert('600000', last.assign(date=[next_day], close=99.0))
+        second = runner.run(store.symbols(), run_id='t4')
+
+        assert second['computed_shards'] == first['shards']
+        row = pd.read_parquet(second['output']).set_index('symbol').loc['600000']
+        assert row['close'] == 99.0
+
+    def test_resume_with_different_params_is_rejected(self, tmp_path):
+        store = _make_store(tmp_path / 'kline', n_symbols=3)
+        AnalysisRunner(store, str(tmp_path / 'out'), workers=1, bars=50).run(store.symbols(), run_id='t3')
+
+        with pytest.raises(ValueError):
+            AnalysisRunner(store, str(tmp_path / 'out'), workers=1, bars=60).run(store.symbols(), run_id='t3')
@@ -0,0 +1,72 @@
+"""
+按日期同步日线服务单元测试
+"""
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.database import init_db
+from app.domain.services.daily_bar_sync_service import DailyBarSyncService
+from app.infrastructure.data.calendar import TradingCalendarStore
+from app.infrastructure.data.executor import SourceExecutor
+from app.infrastructure.data.ratelimit import TokenBucket
+from app.infrastructure.data.sources.tushare import TushareDataSource
+from app.infrastructure.db import StockRepository
+
+
+def _daily(trade_date):
+    return pd.DataFrame({
+        'ts_code': ['000001.SZ', '600000.SH'], 'trade_date': [trade_date] * 2,
+        'open': [10.0, 8.0], 'high': [10.5, 8.2], 'low': [9.8, 7.9], 'close': [10.2, 8.1],
+        'vol': [1e5, 2e5], 'amount': [1e5, 1.6e5],
+    })
+
+
+class TestDailyBarSyncService:
+    """按日期同步测试类"""
+
+    def setup_method(self):
+        self.pro = MagicMock()
+        self.pro.daily.side_effect = lambda trade_date, fields: _daily(trade_date)
+
+    def _service(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}")
+        init_db(engine)
+        trade_dates = pd.DataFrame({'trade_date': ['2024-01-02', '2024-01-03', '2024-01-04']})
+        calendar = TradingCalendarStore(str(tmp_path / 'sse.parquet'), lambda: trade_dates)
+        with patch('app.infrastructure.data.sources.tushare.ts') as ts:
+            ts.pro_api.return_value = self.pro
+            source = TushareDataSource(token='test', executor=SourceExecutor('tushare-test', 2, 5),
+                                       rate_limiter=TokenBucket(6000), calendar_store=calendar)
+        return DailyBarSyncService(source, StockRepository(engine)), engine
+
+    @pytest.mark.asyncio
+    async def test_backfill_only_missing_dates(self, tmp_path):
+        service, engine = self._service(tmp_path)
+
+        first = await service.backfill(date(2024, 1, 1), date(2024, 1, 3))
+        assert list(first) == ['20240102', '20240103']
+        second = await service.backfill(date(2024, 1, 1), date(2024, 1, 4))
+        assert list(second) == ['20240104']
+
+        assert self.pro.daily.call_count == 3
+        self.pro.trade_cal.assert_not_called()
+        assert len(service.repository.read_daily_bars('000001')) == 3
+        engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_per_symbol_rows_do_not_hide_a_date(self, tmp_path):
+        service, engine = self._service(tmp_path)
+        # 逐只写入的单只股票日线（如 K 线接口落库）不代表该交易日已全市场同步
+        service.repository.upsert_daily_bars(
+            pd.DataFrame({'date': ['2024-01-03'], 'open': [1.0], 'high': [1.0], 'low': [1.0], 'close': [1.0],
+                          'volume': [1.0], 'amount': [1.0]}), symbol='000001')
+
+        synced = await service.backfill(date(2024, 1, 1), date(2024, 1, 4))
+        assert list(synced) == ['20240102', '20240103', '20240104']
+        assert await service.missing_dates(date(2024, 1, 1), date(2024, 1, 4)) == []
+        assert len(service.repository.read_daily_bars('600000')) == 3
+        engine.dispose()
@@ -0,0 +1,126 @@
+"""
+横截面因子引擎单元测试
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.analysis.factors import FACTOR_INPUTS, MAD_SCALE, FactorEngine, group_percentile, winsorize, zscore
+
+
+def _snapshot(n: int = 500, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    data = {
+        'current_price': rng.uniform(2, 100, n),
+        'pe_ratio': rng.normal(25, 20, n),
+        'pb_ratio': rng.uniform(-1, 8, n),
+        'market_cap': np.exp(rng.normal(23, 1.2, n)),
+        'change_percent': np.round(rng.normal(0, 2, n), 1),  # 保留一位小数，制造并列值
+        'turnover_rate': rng.uniform(0, 10, n),
+    }
+    data['current_price'][:10] = 0.0  # 停牌
+    industries = rng.choice(['银行', '医药', '半导体', ''], n)
+    return data, industries
+
+
+class TestFactorHelpers:
+    """基础算子测试类"""
+
+    def test_group_percentile_matches_pandas(self):
+        rng = np.random.default_rng(1)
+        values = np.round(rng.normal(0, 1, 1000), 1)
+        values[::17] = np.nan
+        groups = rng.integers(0, 6, 1000)
+        groups[0] = 99  # 只有一只股票的组
+
+        s = pd.Series(values)
+        size = s.groupby(groups).transform('count')
+        expected = ((s.groupby(groups).rank(method='average') - 1) / (size - 1)).where(size > 1, 0.5)
+        expected[s.isna()] = np.nan
+        np.testing.assert_allclose(group_percentile(values, groups), expected, equal_nan=True)
+
+        expected = (s.rank(method='average') - 1) / (s.count() - 1)
+        np.testing.assert_allclose(group_percentile(values), expected, equal_nan=True)
+
+    def test_winsorize(self):
+        values = np.array([1.0, 2.0, 3.0, 100.0])
+        # 中位数 2.5，MAD 1.0
+        expected = np.clip(values, 2.5 - 1.5 * MAD_SCALE, 2.5 + 1.5 * MAD_SCALE)
+        np.testing.assert_allclose(winsorize(values, 1.5), expected)
+        same = np.array([5.0, 5.0, 5.0, 9.0])
+        np.testing.assert_array_equal(winsorize(same), same)
+
+    def test_zscore(self):
+        values = np.array([1.0, 2.0, 3.0, np.nan, 100.0])
+        z = zscore(values, winsor=1.5)
+        assert np.isnan(z[3])
+        # 先截尾原始值，再用截尾后的均值 / 标准差标准化
+        x = winsorize(values[[0, 1, 2, 4]], 1.5)
+        np.testing.assert_allclose(z[[0, 1, 2, 4]], (x - x.mean()) / x.std())
+        assert np.all(zscore(np.array([5.0, 5.0, np.nan]))[:2] == 0)
+
+    def test_outlier_does_not_squash_scores(self):
+        values = np.random.default_rng(2).normal(0, 1, 500)
+        spiked = values.copy()
+        spiked[0] = 1e6
+        np.testing.assert_allclose(zscore(spiked)[1:], zscore(values)[1:], atol=0.05)
+
+
+class TestFactorEngine:
+    """因子引擎测试类"""
+
+    def setup_method(self):
+        self.engine = FactorEngine()
+        self.data, self.industries = _snapshot()
+
+    def test_compute(self):
+        out = self.engine.compute(self.data, self.industries)
+        assert set(out) == set(self.engine.columns())
+        assert all(len(v) == len(self.industries) for v in out.values())
+
+        # 停牌股票所有因子为空；亏损（PE ≤ 0）的 ep 为空
+        assert all(np.isnan(v[:10]).all() for v in out.values())
+        loss = self.data['pe_ratio'] <= 0
+        assert np.isnan(out['ep_z'][loss]).all()
+        assert not np.isnan(out['ep_z'][~loss][10:]).any()
+
+        # 方向：市盈率最低（ep 最高）的百分位为 1，市值最大的 size 百分位为 0
+        valid = ~loss & (self.data['current_price'] > 0)
+        cheapest = np.flatnonzero(valid)[np.argmin(self.data['pe_ratio'][valid])]
+        assert out['ep_pct'][cheapest] == 1.0
+        biggest = 10 + np.argmax(self.data['market_cap'][10:])
+        assert out['size_pct'][biggest] == 0.0
+
+        # 行业内百分位每个行业都覆盖 [0, 1]
+        frame = pd.DataFrame({'industry': self.industries, 'pct': out['bp_ind_pct']}).dropna()
+        assert (frame.groupby('industry')['pct'].agg(['min', 'max']).to_numpy() == [0.0, 1.0]).all()
+
+        # 等权综合分：有效因子 z 分数的均值
+        z = np.vstack([out[f'{name}_z'] for name in self.engine.factors])
+        np.testing.assert_allclose(out['score'][10:], np.nanmean(z[:, 10:], axis=0))
+
+    def test_weights(self):
+        out = self.engine.compute(self.data, self.industries)
+        only_ep = self.engine.composite(out, FactorEngine.parse_weights('ep'))
+        np.testing.assert_allclose(only_ep['score'], out['ep_z'], equal_nan=True)
+
+        engine = FactorEngine(weights=FactorEngine.parse_weights('ep:3, size:1'))
+        score = engine.compute(self.data, self.industries)['score']
+        expected = np.where(np.isnan(out['ep_z']), out['size_z'], (3 * out['ep_z'] + out['size_z']) / 4)
+        np.testing.assert_allclose(score, expected, equal_nan=True)
+
+        with pytest.raises(ValueError):
+            FactorEngine.parse_weights('ep:high')
+        for text in ('ep:-1', 'ep:nan', 'ep:inf', 'ep:1,size:-inf'):
+            with pytest.raises(ValueError):
+                FactorEngine.parse_weights(text)
+        for weights in ({'ep': -1.0, 'size': 2.0}, {'ep': float('nan')}, {'ep': float('inf')}):
+            with pytest.raises(ValueError):
+                self.engine.composite(out, weights)
+        with pytest.raises(ValueError):
+            self.engine.composite(out, {'alpha': 1.0})
+        with pytest.raises(ValueError):
+            self.engine.composite(out, {'ep': 0.0})
+
+    def test_inputs(self):
+        assert set(FACTOR_INPUTS) == set(self.data)
@@ -0,0 +1,62 @@
+"""
+技术指标引擎单元测试
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.analysis.indicators import IndicatorEngine
+
+
+def _bars(n_symbols: int = 4, n_bars: int = 300, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_symbols, n_bars)), axis=1))
+    high = close * (1 + rng.uniform(0, 0.02, close.shape))
+    low = close * (1 - rng.uniform(0, 0.02, close.shape))
+    close[1, :50] = np.nan  # 上市较晚的股票，开头用 NaN 补齐
+    high[1, :50] = np.nan
+    low[1, :50] = np.nan
+    return high, low, close
+
+
+class TestIndicatorEngine:
+    """指标引擎测试类"""
+
+    def setup_method(self):
+        self.engine = IndicatorEngine()
+        self.high, self.low, self.close = _bars()
+
+    def test_matches_pandas_reference(self):
+        out = self.engine.compute(self.high, self.low, self.close)
+        for row in range(self.close.shape[0]):
+            s = pd.Series(self.close[row]).dropna()
+            offset = len(self.close[row]) - len(s)
+            np.testing.assert_allclose(out['ma20'][row, offset:], s.rolling(20).mean(), equal_nan=True)
+            np.testing.assert_allclose(out['ema12'][row, offset:], s.ewm(span=12, adjust=False).mean())
+            np.testing.assert_allclose(out['boll_upper'][row, offset:],
+                                       s.rolling(20).mean() + 2 * s.rolling(20).std(ddof=0),
+                                       equal_nan=True)
+            delta = s.diff()
+            gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+            loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+            np.testing.assert_allclose(out['rsi14'][row, offset + 1:], (100 - 100 / (1 + gain / loss))[1:])
+
+    def test_one_dimensional_input(self):
+        out = self.engine.compute(self.high[0], self.low[0], self.close[0], groups=['macd'])
+        assert set(out) == {'macd_dif', 'macd_dea', 'macd_hist'}
+        assert out['macd_dif'].shape == self.close[0].shape
+
+    def test_incremental_update_matches_full_recompute(self):
+        split = 250
+        _, state = self.engine.init_state(self.high[:, :split], self.low[:, :split], self.close[:, :split])
+        for t in range(split, self.close.shape[1]):
+            latest = self.engine.update(state, self.high[:, t], self.low[:, t], self.close[:, t])
+
+        full = self.engine.compute(self.high, self.low, self.close)
+        assert set(latest) == set(full)
+        for name, values in latest.items():
+            np.testing.assert_allclose(values, full[name][:, -1], rtol=1e-9, err_msg=name)
+
+    def test_unknown_indicator_rejected(self):
+        with pytest.raises(ValueError):
+            self.engine.compute(self.high, self.low, self.close, groups=['foo'])
@@ -0,0 +1,147 @@
+"""
+实时行情推送单元测试
+"""
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.services.quote_hub import QuoteHub
+
+
+class FakeProducer:
+    """本地伪造的全市场快照，每次调用返回当前帧"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.calls = 0
+
+    async def __call__(self) -> pd.DataFrame:
+        self.calls += 1
+        return self.frame.copy()
+
+
+def _frame(prices):
+    return pd.DataFrame({
+        'symbol': list(prices),
+        'current_price': list(prices.values()),
+        'volume': [1000.0] * len(prices),
+    })
+
+
+def _drain(sub):
+    messages = []
+    while not sub.queue.empty():
+        messages.append(json.loads(sub.queue.get_nowait()))
+    return messages
+
+
+class TestQuoteHub:
+    """行情推送中心测试类"""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_changed_fields_only(self):
+        producer = FakeProducer(_frame({'000001': 10.0, '600000': 8.0}))
+        hub = QuoteHub(producer, fields=['current_price', 'volume'])
+        sub = hub.subscribe(['000001'])
+        try:
+            await hub.tick()
+            assert _drain(sub) == [{'type': 'snapshot', 'ts': hub._last_ts,
+                                    'data': {'000001': {'current_price': 10.0, 'volume': 1000.0}}}]
+
+            # 未订阅的股票变化不推送，订阅股票只推送变化的字段
+            producer.frame = _frame({'000001': 10.5, '600000': 9.0})
+            await hub.tick()
+            assert [m['data'] for m in _drain(sub)] == [{'000001': {'current_price': 10.5}}]
+
+            # 没有变化不推送
+            await hub.tick()
+            assert _drain(sub) == []
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_nan_is_null_and_unchanged_nan_is_not_pushed(self):
+        producer = FakeProducer(_frame({'000001': np.nan}))
+        hub = QuoteHub(producer, fields=['current_price', 'volume'])
+        sub = hub.subscribe(['000001'])
+        try:
+            await hub.tick()
+            assert _drain(sub)[0]['data'] == {'000001': {'current_price': None, 'volume': 1000.0}}
+            await hub.tick()
+            assert _drain(sub) == []
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_update_sends_snapshot_for_added_symbols(self):
+        producer = FakeProducer(_frame({'000001': 10.0, '600000': 8.0}))
+        hub = QuoteHub(producer, fields=['current_price'])
+        sub = hub.subscribe(['000001'])
+        try:
+            await hub.tick()
+            _drain(sub)
+            hub.update(sub, add=['600000'], remove=['000001'])
+            assert _drain(sub) == [{'type': 'snapshot', 'ts': hub._last_ts,
+                                    'data': {'600000': {'current_price': 8.0}}}]
+
+            producer.frame = _frame({'000001': 11.0, '600000': 8.0})
+            await hub.tick()
+            assert _drain(sub) == []
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_resyncs_with_snapshot(self):
+        producer = FakeProducer(_frame({'000001': 10.0}))
+        hub = QuoteHub(producer, fields=['current_price'], queue_size=2)
+        sub = hub.subscribe(['000001'])
+        try:
+            for price in (10.0, 10.1, 10.2):
+                producer.frame = _frame({'000001': price})
+                await hub.tick()
+            assert sub.dropped == 1 and sub.queue.empty()
+
+            producer.frame = _frame({'000001': 10.3})
+            await hub.tick()
+            assert _drain(sub) == [{'type': 'snapshot', 'ts': hub._last_ts,
+                                    'data': {'000001': {'current_price': 10.3}}}]
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_after_overflow_keeps_resync(self):
+        producer = FakeProducer(_frame({'000001': 10.0, '600000': 8.0}))
+        hub = QuoteHub(producer, fields=['current_price'], queue_size=2)
+        sub = hub.subscribe(['000001'])
+        try:
+            for price in (10.0, 10.1, 10.2):
+                producer.frame = _frame({'000001': price, '600000': 8.0})
+                await hub.tick()
+            assert sub.dropped == 1
+
+            # 新增订阅的快照同时带上积压被丢弃的股票
+            hub.update(sub, add=['600000'])
+            assert _drain(sub) == [{'type': 'snapshot', 'ts': hub._last_ts,
+                                    'data': {'000001': {'current_price': 10.2}, '600000': {'current_price': 8.0}}}]
+            assert sub.pending is None
+        finally:
+            await hub.stop()
+
+    @pytest.mark.asyncio
+    async def test_poller_idles_without_subscribers(self):
+        producer = FakeProducer(_frame({'000001': 10.0}))
+        hub = QuoteHub(producer, interval=0.01)
+        sub = hub.subscribe(['000001'])
+        try:
+            message = json.loads(await asyncio.wait_for(sub.get(), 1))
+            assert message['type'] == 'snapshot'
+            hub.unsubscribe(sub)
+            calls = producer.calls
+            await asyncio.sleep(0.05)
+            assert producer.calls == calls
+            assert hub.stats()['subscriptions'] == 0
+        finally:
+            await hub.stop()
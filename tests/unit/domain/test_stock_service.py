@@ -2,7 +2,8 @@
 股票服务单元测试
 """
 import pytest
-from unittest.mock import Mock, patch
+import pandas as pd
+from unittest.mock import AsyncMock, Mock, patch
 from app.domain.services.stock_service import StockService
 from app.domain.models.schemas.stock import StockResponse
 
@@ -27,3 +28,23 @@ class TestStockService:
         stock = await self.stock_service.get_stock("000001")
         # 这里根据实际实现添加断言
         pass
+
+    @pytest.mark.asyncio
+    async def test_get_kline_many(self):
+        """测试批量K线：去重、部分成功与逐只错误"""
+        bars = pd.DataFrame({
+            "date": pd.to_datetime(["2024-01-02", "2024-01-03"]),
+            "open": [10.0, 10.2], "high": [10.5, 10.6], "low": [9.8, 10.0], "close": [10.2, 10.4],
+            "volume": [1e5, 2e5], "amount": [1e8, 2e8],
+        })
+
+        async def fake_kline(symbol, freq, limit, adjust=""):
+            return pd.DataFrame() if symbol == "999999" else bars.copy()
+
+        self.stock_service.data_source.get_stock_kline = AsyncMock(side_effect=fake_kline)
+        result = await self.stock_service.get_kline_many(["000001", "600000", "000001", "999999"])
+
+        assert list(result["data"]) == ["000001", "600000"]
+        assert len(result["data"]["000001"]) == 2
+        assert "999999" in result["errors"]
+        assert self.stock_service.data_source.get_stock_kline.await_count == 3
@@ -0,0 +1,84 @@
+"""
+本地复权单元测试
+"""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.adjust import apply_adjustment, has_ex_rights, normalize_factors
+from app.infrastructure.data.calendar import TradingCalendarStore
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+DATES = pd.bdate_range('2024-06-03', periods=6)
+# 06-06 除息：每股派 1 元，前收盘价由 11 调整为 10
+CLOSES = [10.0, 10.5, 11.0, 10.2, 10.4, 10.6]
+CHANGES = [0.1, 0.5, 0.5, 0.2, 0.2, 0.2]
+FACTORS = pd.DataFrame({'date': ['2024-06-06', '1990-12-19'], 'hfq_factor': ['1.1', '1.0']})
+
+
+def _raw_hist(idx):
+    return pd.DataFrame({
+        '日期': DATES[idx].strftime('%Y-%m-%d'),
+        '开盘': [CLOSES[i] for i in idx], '收盘': [CLOSES[i] for i in idx],
+        '最高': [CLOSES[i] + 0.1 for i in idx], '最低': [CLOSES[i] - 0.1 for i in idx],
+        '成交量': 1000.0, '成交额': 1e6, '涨跌额': [CHANGES[i] for i in idx],
+    })
+
+
+class TestAdjust:
+    """复权计算测试类"""
+
+    def test_qfq_and_hfq(self):
+        bars = pd.DataFrame({'date': DATES, 'open': CLOSES, 'high': CLOSES, 'low': CLOSES, 'close': CLOSES,
+                             'volume': 1000.0, 'amount': 1e6})
+        factors = normalize_factors(FACTORS)
+
+        hfq = apply_adjustment(bars, factors, 'hfq')
+        qfq = apply_adjustment(bars, factors, 'qfq')
+
+        assert hfq['close'].tolist() == pytest.approx([10.0, 10.5, 11.0, 11.22, 11.44, 11.66])
+        assert qfq['close'].tolist() == pytest.approx([10 / 1.1, 10.5 / 1.1, 11 / 1.1, 10.2, 10.4, 10.6])
+        # 最新一根前复权价等于不复权价，成交量不变
+        assert qfq['volume'].equals(bars['volume'])
+        assert apply_adjustment(bars, factors, '') is bars
+
+    def test_ex_rights_detection(self):
+        bars = pd.DataFrame({'close': CLOSES[2:5]}, index=[0, 1, 2])
+        assert has_ex_rights(10.5, bars, pd.Series(CHANGES[2:5]))
+        no_event = pd.DataFrame({'close': CLOSES[3:6]}, index=[0, 1, 2])
+        assert not has_ex_rights(None, no_event, pd.Series(CHANGES[3:6]))
+
+
+class TestAdjustedKLine:
+    """本地复权K线测试类"""
+
+    @pytest.mark.asyncio
+    async def test_factors_cached_and_invalidated_on_ex_rights(self, tmp_path):
+        calendar = TradingCalendarStore(str(tmp_path / 'sse.parquet'), lambda: pd.DataFrame())
+        store = KLineStore(str(tmp_path))
+        source = EastMoneyDataSource(kline_store=store, calendar_store=calendar)
+
+        with patch('app.infrastructure.data.sources.eastmoney.ak') as ak, \
+                patch('app.infrastructure.data.sources.eastmoney.settings') as settings:
+            settings.KLINE_SYNC_INTERVAL_SECONDS = 0
+            ak.stock_zh_a_daily.return_value = FACTORS
+
+            ak.stock_zh_a_hist.return_value = _raw_hist([0, 1, 2])
+            await source.get_stock_kline('600000', limit=10, adjust='qfq')
+            plain = await source.get_stock_kline('600000', limit=10, adjust='')
+            assert ak.stock_zh_a_daily.call_count == 1
+            assert ak.stock_zh_a_daily.call_args.kwargs['symbol'] == 'sh600000'
+            assert store.read_factors('600000') is not None
+            assert plain['close'].tolist() == CLOSES[:3]
+
+            # 增量日线带来除息事件：只让这只股票的因子失效，下次复权请求重取
+            ak.stock_zh_a_hist.return_value = _raw_hist([2, 3, 4, 5])
+            await source.get_stock_kline('600000', limit=10)
+            assert store.read_factors('600000') is None
+
+            qfq = await source.get_stock_kline('600000', limit=10, adjust='qfq')
+            assert ak.stock_zh_a_daily.call_count == 2
+
+        assert qfq['close'].tolist() == pytest.approx([10 / 1.1, 10.5 / 1.1, 11 / 1.1, 10.2, 10.4, 10.6])
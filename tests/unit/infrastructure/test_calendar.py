@@ -0,0 +1,84 @@
+"""
+交易日历单元测试
+"""
+import os
+import time
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.core.exceptions import DataSourceException
+from app.infrastructure.data.calendar import TradingCalendar, TradingCalendarStore
+
+# 2024-02-09 ~ 2024-02-16 春节休市
+DAYS = [d for d in pd.bdate_range('2024-02-01', '2024-02-29').date
+        if not date(2024, 2, 9) <= d <= date(2024, 2, 16)]
+
+
+class TestTradingCalendar:
+    """交易日历查询测试类"""
+
+    def setup_method(self):
+        self.calendar = TradingCalendar(DAYS)
+
+    def test_is_trading_day(self):
+        assert self.calendar.is_trading_day('2024-02-08')
+        assert self.calendar.is_trading_day('20240219')
+        assert not self.calendar.is_trading_day(date(2024, 2, 12))
+        assert not self.calendar.is_trading_day(date(2024, 2, 17))
+
+    def test_latest_previous_next(self):
+        assert self.calendar.latest(date(2024, 2, 14)) == date(2024, 2, 8)
+        assert self.calendar.latest(date(2024, 2, 19)) == date(2024, 2, 19)
+        assert self.calendar.previous(date(2024, 2, 19)) == date(2024, 2, 8)
+        assert self.calendar.previous(date(2024, 2, 14), 2) == date(2024, 2, 7)
+        assert self.calendar.next(date(2024, 2, 8)) == date(2024, 2, 19)
+        assert self.calendar.next(date(2024, 2, 10), 1) == date(2024, 2, 19)
+        assert self.calendar.next(date(2024, 2, 10), 0) == date(2024, 2, 19)
+        with pytest.raises(IndexError):
+            self.calendar.next(date(2024, 2, 29))
+
+    def test_between(self):
+        assert self.calendar.count('2024-02-05', '2024-02-20') == 6
+
+    def test_seconds_until_open(self):
+        # 交易时段内（含收盘后的数据落地窗口）为 0
+        assert self.calendar.seconds_until_open(datetime(2024, 2, 8, 10, 0)) == 0
+        assert self.calendar.seconds_until_open(datetime(2024, 2, 8, 15, 20)) == 0
+        # 开盘前：到当天 9:15
+        assert self.calendar.seconds_until_open(datetime(2024, 2, 8, 9, 0)) == 15 * 60
+        # 节前收盘后：跨过春节休市到 2024-02-19 9:15
+        until = self.calendar.seconds_until_open(datetime(2024, 2, 8, 16, 0))
+        assert until == (datetime(2024, 2, 19, 9, 15) - datetime(2024, 2, 8, 16, 0)).total_seconds()
+        # 日历之外无法判断
+        assert self.calendar.seconds_until_open(datetime(2024, 2, 29, 16, 0)) == 0
+
+
+class TestTradingCalendarStore:
+    """交易日历加载与缓存测试类"""
+
+    def test_persists_and_reuses_local_copy(self, tmp_path):
+        loader = MagicMock(return_value=pd.DataFrame({'trade_date': DAYS}))
+        path = tmp_path / 'sse.parquet'
+        assert TradingCalendarStore(str(path), loader).get().last == date(2024, 2, 29)
+
+        # 新进程：本地文件未过期，不回源
+        store = TradingCalendarStore(str(path), loader)
+        assert len(store.get()) == len(DAYS)
+        assert loader.call_count == 1
+
+    def test_stale_copy_survives_failed_refresh(self, tmp_path):
+        path = tmp_path / 'sse.parquet'
+        TradingCalendarStore(str(path), MagicMock(return_value=pd.DataFrame({'trade_date': DAYS}))).get()
+        old = time.time() - 2 * 86400
+        os.utime(path, (old, old))
+
+        failing = MagicMock(side_effect=ConnectionError('offline'))
+        store = TradingCalendarStore(str(path), failing)
+        assert store.get().is_trading_day('2024-02-19')
+        assert failing.call_count == 1
+
+        with pytest.raises(DataSourceException):
+            TradingCalendarStore(str(tmp_path / 'missing.parquet'), failing).get()
@@ -0,0 +1,78 @@
+"""
+上游调用录制 / 回放单元测试
+"""
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.cassette import (
+    Cassette, CassetteMissError, RecordedUpstreamError, use_cassette
+)
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+
+
+def _hist(symbol, period='daily', start_date='19700101', adjust=''):
+    return pd.DataFrame({
+        '日期': ['2024-01-02', '2024-01-03'], '开盘': [10.0, 10.2], '收盘': [10.1, 10.3],
+        '最高': [10.2, 10.4], '最低': [9.9, 10.1], '成交量': [1000.0, 1200.0], '成交额': [1e6, 1.2e6],
+        '股票代码': [symbol, symbol],
+    })
+
+
+class TestCassette:
+    """cassette 测试类"""
+
+    def test_record_then_replay_from_disk(self, tmp_path):
+        calls = []
+
+        def upstream(symbol, **kwargs):
+            calls.append(symbol)
+            return _hist(symbol, **kwargs)
+
+        recorder = Cassette(str(tmp_path), mode='record')
+        expected = recorder.call('akshare.stock_zh_a_hist', upstream, '000001', start_date='19700101')
+        recorder.call('akshare.stock_zh_a_hist', upstream, '600000', start_date='19700101')
+
+        player = Cassette(str(tmp_path), mode='replay')
+        assert len(player) == 2
+        replayed = player.call('akshare.stock_zh_a_hist', upstream, '000001', start_date='19700101')
+        pd.testing.assert_frame_equal(replayed, expected)
+        assert calls == ['000001', '600000']
+
+        with pytest.raises(CassetteMissError):
+            player.call('akshare.stock_zh_a_hist', upstream, '000001', start_date='20240101')
+
+    def test_errors_are_recorded_and_replayed(self, tmp_path):
+        def broken():
+            raise ValueError("upstream down")
+
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path), mode='auto').call('akshare.stock_zh_a_spot_em', broken)
+        with pytest.raises(RecordedUpstreamError, match="upstream down"):
+            Cassette(str(tmp_path), mode='replay').call('akshare.stock_zh_a_spot_em', broken)
+
+    def test_replay_latency(self, tmp_path):
+        Cassette(str(tmp_path), mode='record').call('akshare.stock_zh_a_spot_em', lambda: pd.DataFrame({'a': [1]}))
+        player = Cassette(str(tmp_path), mode='replay', latency=0.05)
+        started = time.perf_counter()
+        player.call('akshare.stock_zh_a_spot_em', lambda: None)
+        assert time.perf_counter() - started >= 0.05
+
+    def test_data_source_replays_offline(self, tmp_path):
+        fake_ak = SimpleNamespace(stock_zh_a_hist=_hist)
+        source = EastMoneyDataSource(kline_store=KLineStore(str(tmp_path / 'a')))
+        source.ak = fake_ak
+        use_cassette(source, Cassette(str(tmp_path / 'cassette'), mode='record'))
+        recorded = source._load_kline('000001', 'daily', 10)
+
+        def offline(*args, **kwargs):
+            raise AssertionError("回放时不应访问上游")
+
+        source = EastMoneyDataSource(kline_store=KLineStore(str(tmp_path / 'b')))
+        source.ak = SimpleNamespace(stock_zh_a_hist=offline)
+        use_cassette(source, Cassette(str(tmp_path / 'cassette'), mode='replay'))
+        pd.testing.assert_frame_equal(source._load_kline('000001', 'daily', 10), recorded)
+        assert source.cache_stats()['cassette']['hits'] == 1
@@ -0,0 +1,219 @@
+"""
+主备组合数据源（K 线对冲 / 熔断 / Tushare 规整）单元测试
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.adjust import sina_symbol
+from app.infrastructure.data.calendar import TradingCalendar
+from app.infrastructure.data.circuit import CircuitBreaker
+from app.infrastructure.data.executor import SourceExecutor
+from app.infrastructure.data.normalize import exchange_by_symbol, exchange_of, from_ts_code, to_ts_code
+from app.infrastructure.data.ratelimit import TokenBucket
+from app.infrastructure.data.sources.composite import CompositeDataSource
+from app.infrastructure.data.sources.tushare import TushareDataSource
+
+
+def _bars(close: float) -> pd.DataFrame:
+    return pd.DataFrame({'date': pd.to_datetime(['2024-05-09', '2024-05-10']), 'open': [close] * 2,
+                         'high': [close] * 2, 'low': [close] * 2, 'close': [close] * 2,
+                         'volume': [100.0] * 2, 'amount': [1e6] * 2})
+
+
+class FakeSource:
+    """按给定延迟返回固定 K 线；fail=True 时 get_stock_kline 返回空表、get_kline_frame 抛异常，empty=True 时没有数据"""
+
+    def __init__(self, close: float, delay: float = 0.0, fail: bool = False, empty: bool = False):
+        self.close = close
+        self.delay = delay
+        self.fail = fail
+        self.empty = empty
+        self.calls = 0
+        self.cancelled = 0
+
+    async def _run(self, empty_on_fail: bool) -> pd.DataFrame:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            if empty_on_fail:
+                return pd.DataFrame()
+            raise RuntimeError("upstream down")
+        return pd.DataFrame() if self.empty else _bars(self.close)
+
+    async def get_stock_kline(self, symbol, freq='daily', limit=30, adjust=''):
+        return await self._run(empty_on_fail=True)
+
+    async def get_kline_frame(self, symbol, freq='daily', limit=30, adjust=''):
+        return await self._run(empty_on_fail=False)
+
+    def cache_stats(self):
+        return {'snapshot': {}}
+
+
+def _composite(primary, secondary, **kwargs):
+    options = dict(default_delay=0.05, min_delay=0.01, max_delay=1.0, failure_threshold=2, reset_seconds=60)
+    options.update(kwargs)
+    return CompositeDataSource(primary, secondary, **options)
+
+
+class TestCodeMapping:
+    """代码映射测试类"""
+
+    @pytest.mark.parametrize('symbol,ts_code', [
+        ('000001', '000001.SZ'), ('300750', '300750.SZ'), ('600000', '600000.SH'),
+        ('688981', '688981.SH'), ('830799', '830799.BJ'), ('920002', '920002.BJ'),
+    ])
+    def test_round_trip(self, symbol, ts_code):
+        assert to_ts_code(symbol) == ts_code
+        assert from_ts_code(ts_code) == symbol
+
+    def test_ts_code_passes_through(self):
+        assert to_ts_code('000001.sz') == '000001.SZ'
+
+    @pytest.mark.parametrize('symbol,exchange,sina', [
+        ('000001', 'SZSE', 'sz000001'), ('200011', 'SZSE', 'sz200011'), ('600000', 'SSE', 'sh600000'),
+        ('900901', 'SSE', 'sh900901'), ('830799', 'BSE', 'bj830799'), ('920002', 'BSE', 'bj920002'),
+    ])
+    def test_exchange_is_consistent(self, symbol, exchange, sina):
+        # ts_code / 新浪代码 / 交易所字段共用同一张前缀表
+        assert exchange_of(symbol) == exchange
+        assert exchange_by_symbol(pd.Series([symbol]))[0] == exchange
+        assert sina_symbol(symbol) == sina
+        assert to_ts_code(symbol).endswith(sina[:2].upper())
+
+
+class TestCircuitBreaker:
+    """熔断器测试类"""
+
+    def test_opens_after_threshold_and_half_opens(self):
+        breaker = CircuitBreaker('x', failure_threshold=2, reset_seconds=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == 'open' and not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()          # 试探请求
+        assert not breaker.allow()      # 试探期间其余请求仍被拒绝
+        breaker.record_success()
+        assert breaker.state == 'closed' and breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker('x', failure_threshold=1, reset_seconds=0.0)
+        breaker.record_failure()
+        assert breaker.allow() and breaker.state == 'half_open'
+        breaker.record_failure()
+        assert breaker.state == 'open' and breaker.trips == 2
+
+
+class TestCompositeDataSource:
+    """K 线对冲测试类"""
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_hedge(self):
+        primary, secondary = FakeSource(10.0), FakeSource(20.0)
+        source = _composite(primary, secondary)
+        df = await source.get_stock_kline('000001')
+        assert df['close'].iloc[-1] == 10.0
+        assert secondary.calls == 0 and source.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        primary, secondary = FakeSource(10.0, delay=1.0), FakeSource(20.0, delay=0.01)
+        source = _composite(primary, secondary)
+        df = await source.get_stock_kline('000001')
+        assert df['close'].iloc[-1] == 20.0
+        assert source.hedged == 1 and source.wins['secondary'] == 1
+        await asyncio.sleep(0)
+        assert primary.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_primary_falls_over_without_waiting(self):
+        primary, secondary = FakeSource(10.0, fail=True), FakeSource(20.0)
+        source = _composite(primary, secondary, default_delay=5.0)
+        df = await asyncio.wait_for(source.get_stock_kline('000001'), timeout=1.0)
+        assert df['close'].iloc[-1] == 20.0
+        assert source.failures['primary'] == 1 and source.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_primary(self):
+        primary, secondary = FakeSource(10.0, fail=True), FakeSource(20.0)
+        source = _composite(primary, secondary)
+        for _ in range(2):
+            await source.get_stock_kline('000001')
+        assert source.breakers['primary'].state == 'open'
+
+        await source.get_stock_kline('000001')
+        assert primary.calls == 2 and secondary.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_both_failing_returns_empty(self):
+        source = _composite(FakeSource(10.0, fail=True), FakeSource(20.0, fail=True))
+        assert (await source.get_stock_kline('000001')).empty
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_not_a_failure(self):
+        primary, secondary = FakeSource(10.0, empty=True), FakeSource(20.0)
+        source = _composite(primary, secondary)
+        for _ in range(5):
+            assert (await source.get_stock_kline('999999')).empty
+        assert secondary.calls == 0
+        assert source.failures['primary'] == 0 and source.breakers['primary'].state == 'closed'
+
+    @pytest.mark.asyncio
+    async def test_cancelled_primary_latency_is_recorded(self):
+        primary, secondary = FakeSource(10.0, delay=1.0), FakeSource(20.0, delay=0.01)
+        source = _composite(primary, secondary)
+        await source.get_stock_kline('000001')
+        await asyncio.sleep(0)
+        assert len(source.latency['primary']) == 1
+        assert source.latency['primary'].percentile(50) >= 0.05
+
+    def test_hedge_delay_follows_primary_percentile(self):
+        source = _composite(FakeSource(1.0), FakeSource(2.0), min_samples=10, percentile=95)
+        assert source.hedge_delay() == 0.05
+        for i in range(100):
+            source.latency['primary'].record(0.1 if i < 95 else 3.0)
+        assert source.hedge_delay() == pytest.approx(0.1, abs=0.2)
+        assert 'kline_hedge' in source.cache_stats()
+
+
+class TestTushareKLineFrame:
+    """Tushare K 线规整测试类"""
+
+    @pytest.mark.asyncio
+    async def test_matches_eastmoney_schema(self):
+        pro = MagicMock()
+        pro.daily.return_value = pd.DataFrame({
+            'ts_code': ['000001.SZ'] * 3, 'trade_date': ['20240510', '20240509', '20240508'],
+            'open': [10.0, 9.0, 8.0], 'high': [10.5, 9.5, 8.5], 'low': [9.5, 8.5, 7.5],
+            'close': [10.0, 9.0, 8.0], 'vol': [100.0, 200.0, 300.0], 'amount': [1000.0, 2000.0, 3000.0],
+        })
+        pro.adj_factor.return_value = pd.DataFrame({
+            'ts_code': ['000001.SZ'] * 3, 'trade_date': ['20240510', '20240509', '20240508'],
+            'adj_factor': [2.0, 1.0, 1.0],
+        })
+        calendar_store = MagicMock()
+        calendar_store.get.return_value = TradingCalendar(pd.bdate_range('2024-01-01', '2024-05-10'))
+        with patch('app.infrastructure.data.sources.tushare.ts') as ts:
+            ts.pro_api.return_value = pro
+            source = TushareDataSource(token='test', executor=SourceExecutor('tushare-test', 2, 5),
+                                       rate_limiter=TokenBucket(6000), calendar_store=calendar_store)
+
+        # 日历截止 2024-05-10，即最新交易日
+        df = await source.get_kline_frame('000001', 'daily', 2, adjust='qfq')
+
+        assert pro.daily.call_args.kwargs['ts_code'] == '000001.SZ'
+        assert list(df.columns) == ['date', 'open', 'high', 'low', 'close', 'volume', 'amount']
+        assert pd.api.types.is_datetime64_any_dtype(df['date'])
+        assert df['date'].dt.strftime('%Y-%m-%d').tolist() == ['2024-05-09', '2024-05-10']
+        assert df['close'].tolist() == [4.5, 10.0]      # 前复权：9.0 × 1/2
+        assert df['amount'].tolist() == [2e6, 1e6]      # 千元 → 元
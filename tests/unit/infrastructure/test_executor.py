@@ -0,0 +1,72 @@
+"""
+数据源执行层单元测试
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.exceptions import DataSourceException
+from app.infrastructure.data.executor import SourceExecutor
+
+
+async def _max_loop_lag(until: asyncio.Future, interval: float = 0.005) -> float:
+    """在 until 完成前持续测量事件循环调度延迟"""
+    worst = 0.0
+    while not until.done():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - t0 - interval)
+    return worst
+
+
+class TestSourceExecutor:
+    """执行层测试类"""
+
+    def setup_method(self):
+        self.executor = SourceExecutor('test', max_in_flight=2, timeout=5)
+
+    def teardown_method(self):
+        self.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_blocking_calls_do_not_stall_event_loop(self):
+        calls = asyncio.ensure_future(asyncio.gather(*(self.executor.run(time.sleep, 0.2) for _ in range(4))))
+        lag = await _max_loop_lag(calls)
+        await calls
+        assert lag < 0.05
+
+    @pytest.mark.asyncio
+    async def test_in_flight_calls_are_bounded(self):
+        active, peak = 0, 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*(self.executor.run(work) for _ in range(10)))
+        assert peak == 2
+        assert self.executor.stats()['calls'] == 10
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_and_cancels_queued_calls(self):
+        started = []
+
+        def work(i):
+            started.append(i)
+            time.sleep(0.2)
+
+        with pytest.raises(DataSourceException) as exc:
+            await asyncio.gather(*(self.executor.run(work, i, timeout=0.05) for i in range(4)))
+        assert exc.value.status_code == 504
+
+        await asyncio.sleep(0.3)
+        # 只有前两个已开始执行，排队中的调用被取消
+        assert sorted(started) == [0, 1]
@@ -0,0 +1,54 @@
+"""
+本地财务数据存储（按报告期分区 + 增量刷新）单元测试
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.normalize import normalize_financial_report
+from app.infrastructure.data.storage.financial_store import (
+    FinancialStore, disclosure_deadline, latest_covered_period, report_periods,
+)
+
+
+def _report(symbols, roe):
+    return pd.DataFrame({'股票代码': symbols, '每股收益': [0.5] * len(symbols), '净资产收益率': roe,
+                         '销售毛利率': ['-'] * len(symbols), '最新公告日期': ['2024-04-20'] * len(symbols)})
+
+
+class TestFinancialStore:
+    """财务数据存储测试类"""
+
+    def test_periods_and_deadlines(self):
+        assert report_periods(date(2023, 1, 1), date(2024, 5, 10)) == [
+            '20230331', '20230630', '20230930', '20231231', '20240331']
+        assert disclosure_deadline('20231231') == date(2024, 4, 30)
+        assert disclosure_deadline('20240930') == date(2024, 10, 31)
+
+    def test_normalize_report(self):
+        frame = normalize_financial_report(_report([1, '600000'], ['12.5', '-']), '20231231')
+        assert frame['symbol'].tolist() == ['000001', '600000']
+        assert frame['roe'].iloc[0] == 0.125 and np.isnan(frame['roe'].iloc[1])
+        assert frame['gross_margin'].isna().all()
+        assert (frame['report_date'] == pd.Timestamp('2023-12-31')).all()
+
+    def test_incremental_refresh(self, tmp_path):
+        store = FinancialStore(str(tmp_path))
+        today = date(2024, 5, 10)
+        assert store.pending_periods(date(2023, 7, 1), today) == ['20230930', '20231231', '20240331']
+
+        store.write_period('20230930', normalize_financial_report(_report(['000001'], [6.0]), '20230930'), today)
+        store.write_period('20240331', normalize_financial_report(_report(['000001'], [2.0]), '20240331'), today)
+        # 一季报披露期未结束（4/30 之前抓取的），之后仍需回源；已结束的不再回源
+        store.write_period('20231231', normalize_financial_report(_report(['000001', '600000'], [9.0, 11.0]),
+                                                                  '20231231'), date(2024, 4, 1))
+        assert store.pending_periods(date(2023, 7, 1), today) == ['20231231']
+
+        frame = FinancialStore(str(tmp_path)).read()
+        assert list(zip(frame['symbol'], frame['report_date'].dt.strftime('%Y%m%d'))) == [
+            ('000001', '20230930'), ('000001', '20231231'), ('000001', '20240331'), ('600000', '20231231')]
+        # 财务字段为年初至今累计：所有股票取同一期，只有 000001 披露的一季报不算“最新”
+        assert latest_covered_period(frame) == '20231231'
+        latest = store.latest().set_index('symbol')['roe']
+        assert latest.to_dict() == {'000001': 0.09, '600000': 0.11}
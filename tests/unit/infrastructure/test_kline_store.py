@@ -0,0 +1,145 @@
+"""
+本地K线存储单元测试
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from app.infrastructure.data.calendar import TradingCalendarStore
+from app.infrastructure.data.storage.kline_store import KLineStore
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+
+
+def _raw_hist(dates):
+    """构造东财 stock_zh_a_hist 形状的返回"""
+    n = len(dates)
+    return pd.DataFrame({
+        '日期': [d.strftime('%Y-%m-%d') for d in dates],
+        '开盘': [10.0] * n, '收盘': [10.5] * n, '最高': [11.0] * n, '最低': [9.5] * n,
+        '成交量': [1000.0] * n, '成交额': [1e6] * n,
+    })
+
+
+class TestKLineStore:
+    """本地K线存储测试类"""
+
+    def test_upsert_merges_and_advances_watermark(self, tmp_path):
+        store = KLineStore(str(tmp_path))
+        assert store.read('000001').empty
+        assert store.get_watermark('000001') is None
+
+        first = EastMoneyDataSource._normalize_kline(_raw_hist(pd.bdate_range('2024-01-01', periods=5)))
+        store.upsert('000001', first)
+        # 最后一根被新数据覆盖，并追加两根
+        second = EastMoneyDataSource._normalize_kline(_raw_hist(pd.bdate_range('2024-01-05', periods=3)))
+        second['close'] = 12.0
+        merged = store.upsert('000001', second)
+
+        assert len(merged) == 7
+        assert merged['date'].is_monotonic_increasing
+        assert merged.loc[merged['date'] == '2024-01-05', 'close'].item() == 12.0
+        assert store.get_watermark('000001')['last_date'] == pd.Timestamp('2024-01-09').date()
+        assert len(store.read('000001')) == 7
+
+    def test_invalidate_factors_waits_for_symbol_lock(self, tmp_path):
+        store = KLineStore(str(tmp_path))
+        store.write_factors('000001', pd.DataFrame({'date': pd.to_datetime(['2024-01-02']), 'hfq_factor': [1.0]}))
+        with store._lock('000001'):
+            worker = threading.Thread(target=store.invalidate_factors, args=('000001',))
+            worker.start()
+            worker.join(0.1)
+            # 持锁期间（如正在写入因子）不会删除
+            assert worker.is_alive()
+            assert store.read_factors('000001') is not None
+        worker.join(5)
+        assert store.read_factors('000001') is None
+
+    @pytest.mark.asyncio
+    async def test_kline_fetches_only_after_watermark(self, tmp_path):
+        source = EastMoneyDataSource(kline_store=KLineStore(str(tmp_path)))
+        dates = pd.bdate_range('2024-01-01', periods=40)
+
+        with patch('app.infrastructure.data.sources.eastmoney.ak') as ak, \
+                patch('app.infrastructure.data.sources.eastmoney.settings') as settings:
+            settings.KLINE_SYNC_INTERVAL_SECONDS = 0
+            ak.stock_zh_a_hist.return_value = _raw_hist(dates)
+            cold = await source.get_stock_kline('000001', limit=30)
+            assert ak.stock_zh_a_hist.call_args.kwargs['start_date'] == '19700101'
+
+            ak.stock_zh_a_hist.return_value = _raw_hist(dates[-1:])
+            warm = await source.get_stock_kline('000001', limit=30)
+            assert ak.stock_zh_a_hist.call_args.kwargs['start_date'] == dates[-1].strftime('%Y%m%d')
+
+        assert len(cold) == len(warm) == 30
+        pd.testing.assert_frame_equal(cold, warm)
+
+    @pytest.mark.asyncio
+    async def test_kline_skips_upstream_after_last_close(self, tmp_path):
+        dates = pd.bdate_range('2024-01-01', periods=40)
+        # 日历截止到最后一根K线：此后（“周末/节假日”）不再有新日线
+        calendar = TradingCalendarStore(str(tmp_path / 'sse.parquet'), lambda: pd.DataFrame({'trade_date': dates}))
+        source = EastMoneyDataSource(kline_store=KLineStore(str(tmp_path)), calendar_store=calendar)
+
+        with patch('app.infrastructure.data.sources.eastmoney.ak') as ak, \
+                patch('app.infrastructure.data.sources.eastmoney.settings') as settings:
+            settings.KLINE_SYNC_INTERVAL_SECONDS = 0
+            ak.stock_zh_a_hist.return_value = _raw_hist(dates)
+            await source.get_stock_kline('000001', limit=30)
+            await source.get_stock_kline('000001', limit=30)
+
+        assert ak.stock_zh_a_hist.call_count == 1
+
+
+def _legacy_resample(daily: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """原 _load_kline 中的重采样实现（'M' 即现在的 'ME'）"""
+    df = daily.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.set_index('date')
+    agg_dict = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'amount': 'sum'}
+    df = df.resample('W-MON' if freq == 'weekly' else 'ME').agg(agg_dict)
+    return df.reset_index().dropna().reset_index(drop=True)
+
+
+class TestKLineAggregates:
+    """周/月线聚合测试类"""
+
+    def _daily(self):
+        rng = np.random.default_rng(1)
+        dates = pd.bdate_range('2023-01-02', '2024-06-28')
+        # 整周休市（国庆）、跨月休市（春节）
+        dates = dates[~((dates >= '2023-10-02') & (dates <= '2023-10-06'))]
+        dates = dates[~((dates >= '2024-02-08') & (dates <= '2024-02-19'))]
+        close = 10 + np.cumsum(rng.normal(0, 0.1, len(dates)))
+        return pd.DataFrame({
+            'date': dates, 'open': close + 0.05, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+            'volume': rng.integers(1000, 5000, len(dates)).astype(float), 'amount': close * 1e5,
+        })
+
+    def test_incremental_aggregates_match_resample(self, tmp_path):
+        daily = self._daily()
+        store = KLineStore(str(tmp_path))
+        store.upsert('000001', daily.iloc[:200])
+        for i in range(200, len(daily), 7):
+            # 每次重叠一根（覆盖盘中写入的当日K线）
+            store.upsert('000001', daily.iloc[i - 1:i + 7])
+        store.upsert('000001', daily.tail(1).assign(close=99.0, high=99.0))
+        daily.loc[daily.index[-1], ['close', 'high']] = 99.0
+
+        for freq in ('weekly', 'monthly'):
+            expected = _legacy_resample(daily, freq)
+            actual = store.read('000001', freq)
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_aggregates_rebuilt_for_existing_store(self, tmp_path):
+        daily = self._daily()
+        store = KLineStore(str(tmp_path))
+        store.upsert('000001', daily)
+        # 模拟升级前的存储：只有日线
+        (tmp_path / 'daily' / 'symbol=000001' / 'weekly.parquet').unlink()
+
+        pd.testing.assert_frame_equal(store.read('000001', 'weekly'), _legacy_resample(daily, 'weekly'),
+                                      check_dtype=False)
+        assert (tmp_path / 'daily' / 'symbol=000001' / 'weekly.parquet').exists()
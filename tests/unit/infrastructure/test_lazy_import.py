@@ -0,0 +1,122 @@
+"""
+上游库延迟导入、数据源注册表与启动导入开销的回归测试
+"""
+import os
+import subprocess
+import sys
+import threading
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.lazy import LazyModule
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+from app.infrastructure.data.storage.kline_store import KLineStore
+from app.infrastructure.data.sources import registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+HEAVY_MODULES = ('akshare', 'tushare')
+
+
+def _heavy(report: dict) -> list:
+    return [name for name in report if name.split('.')[0] in HEAVY_MODULES]
+
+
+def _import_report(statement: str) -> dict:
+    """在干净的子进程里执行 statement，按 python -X importtime 的输出返回 {模块: 累计导入微秒}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    report = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        report[name.strip()] = int(cumulative)
+    return report
+
+
+class TestLazyModule:
+    """LazyModule 测试类"""
+
+    def test_loads_on_first_attribute(self):
+        module = LazyModule('colorsys')
+        sys.modules.pop('colorsys', None)
+        assert not module.loaded
+        assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+        assert module.loaded and module.load() is sys.modules['colorsys']
+
+    def test_missing_module_raises_on_use(self):
+        module = LazyModule('no_such_upstream_library')
+        with pytest.raises(ModuleNotFoundError):
+            module.anything
+
+
+class TestUpstreamAccess:
+    """上游接口的属性访问（首次访问会导入 akshare）只发生在线程池里"""
+
+    @pytest.mark.asyncio
+    async def test_akshare_attributes_resolved_off_loop(self, tmp_path):
+        tables = {
+            'stock_board_industry_name_em': pd.DataFrame({'板块名称': ['银行']}),
+            'stock_board_industry_cons_em': pd.DataFrame({'代码': ['000001']}),
+        }
+        threads = []
+
+        class FakeAk:
+            def __getattr__(self, name):
+                threads.append(threading.get_ident())
+                return lambda *args, **kwargs: tables.get(name, pd.DataFrame())
+
+        source = EastMoneyDataSource(kline_store=KLineStore(str(tmp_path)))
+        source.ak = FakeAk()
+        await source._fetch_single_stock('000001')
+        industries = await source._load_industry_map()
+        await source.get_financial_data('000001')
+
+        assert industries['industry'].tolist() == ['银行']
+        assert len(threads) == 4 and threading.get_ident() not in threads
+
+
+class TestSourceRegistry:
+    """数据源注册表测试类"""
+
+    def test_get_and_register(self):
+        from app.infrastructure.data.sources.synthetic import SyntheticDataSource
+
+        assert registry.get_source_class('synthetic') is SyntheticDataSource
+        with pytest.raises(ValueError):
+            registry.get_source_class('unknown')
+
+        class CustomSource:
+            def __init__(self, flag=False):
+                self.flag = flag
+
+        registry.register_source('custom-test', CustomSource)
+        try:
+            assert registry.create_source('custom-test', flag=True).flag
+            assert 'custom-test' in registry.available_sources()
+        finally:
+            registry._SOURCES.pop('custom-test')
+
+
+class TestStartupImports:
+    """启动导入开销回归：应用与 CLI 入口都不应在启动时导入 akshare / tushare"""
+
+    def test_app_startup_skips_upstream_libraries(self):
+        report = _import_report('import app.main')
+        assert 'app.main' in report
+        assert not _heavy(report)
+
+    @pytest.mark.parametrize('script', ['tasks/run_analysis.py', 'tasks/sync_stocks.py', 'scripts/sync_stocks.py'])
+    def test_cli_startup_skips_upstream_libraries(self, script):
+        assert not _heavy(_import_report(f"import runpy; runpy.run_path('{script}', run_name='cli')"))
+
+    def test_sources_package_is_lazy(self):
+        report = _import_report('from app.infrastructure.data.sources import create_source')
+        assert not [name for name in report if name.startswith('app.infrastructure.data.sources.')
+                    and name != 'app.infrastructure.data.sources.registry']
+
+    def test_upstream_imported_on_first_call(self):
+        report = _import_report('from app.infrastructure.data.sources.eastmoney import ak; ak.__version__')
+        assert 'akshare.registry' in report and not [name for name in _heavy(report) if name.startswith('tushare')]
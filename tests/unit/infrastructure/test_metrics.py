@@ -0,0 +1,63 @@
+"""
+进程内指标单元测试
+"""
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+from app.core import metrics
+from app.core.metrics import Histogram, MetricsRegistry, instrument, upstream
+
+
+class TestMetrics:
+    """指标测试类"""
+
+    def test_histogram_renders_cumulative_buckets(self):
+        hist = Histogram('latency_seconds', '耗时', ('route',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            hist.observe(value, '/a"b')
+        lines = hist.render()
+        assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+        assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+
+    def test_collector_skips_missing_values(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.add_collector(lambda: [('hit_ratio', 'gauge', '命中率', [({'cache': 'x'}, 0.5), ({'cache': 'y'}, None)])])
+        text = registry.render()
+        assert 'hit_ratio{cache="x"} 0.5' in text
+        assert 'cache="y"' not in text
+
+    @pytest.mark.asyncio
+    async def test_instrument_records_latency_rows_and_errors(self):
+        @instrument('fake')
+        async def load(n):
+            if n < 0:
+                raise ValueError(n)
+            return pd.DataFrame({'x': range(n)})
+
+        with patch.object(metrics.registry, 'enabled', True):
+            rows = metrics.CALL_ROWS.value('fake', 'load')
+            count = metrics.CALL_SECONDS.count('fake', 'load')
+            await load(3)
+            with pytest.raises(ValueError):
+                await load(-1)
+            assert metrics.CALL_SECONDS.count('fake', 'load') == count + 2
+            assert metrics.CALL_ROWS.value('fake', 'load') == rows + 3
+            assert metrics.CALL_ERRORS.value('fake', 'load', 'ValueError') >= 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_records_nothing(self):
+        @instrument('fake')
+        async def idle():
+            return [1]
+
+        def daily(**kwargs):
+            return kwargs
+
+        with patch.object(metrics.registry, 'enabled', False):
+            await idle()
+            assert upstream('fake', daily)(trade_date='20240102') == {'trade_date': '20240102'}
+        assert metrics.CALL_SECONDS.count('fake', 'idle') == 0
+        assert metrics.UPSTREAM_SECONDS.count('fake', 'daily', 'ok') == 0
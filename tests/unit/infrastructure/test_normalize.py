@@ -0,0 +1,39 @@
+"""
+行情表向量化规整单元测试
+"""
+import numpy as np
+import pandas as pd
+
+from app.infrastructure.data.normalize import parse_number_series, normalize_spot_table, SPOT_COLUMNS
+from app.infrastructure.data.sources.eastmoney import EastMoneyDataSource
+
+
+class TestNormalize:
+    """向量化规整测试类"""
+
+    def test_parse_number_series_matches_scalar_parser(self):
+        values = ['1,234.5', '3.2万', '1.5亿', '1.2万亿', '-', '', None, np.nan, 12, 7.5, 'abc', ' 8 ']
+        parser = EastMoneyDataSource.__new__(EastMoneyDataSource)
+        expected = [parser._parse_number(v) for v in values]
+
+        result = parse_number_series(pd.Series(values, dtype=object))
+
+        assert result.dtype == np.float64
+        assert result.tolist() == expected
+
+    def test_longest_unit_wins(self):
+        result = parse_number_series(pd.Series(['1.2万亿', '3亿', '5万'], dtype=object))
+        np.testing.assert_allclose(result, [1.2e12, 3e8, 5e4])
+        parser = EastMoneyDataSource.__new__(EastMoneyDataSource)
+        assert parser._parse_number('1.2万亿') == 1.2e12
+
+    def test_normalize_spot_table_columns(self):
+        raw = pd.DataFrame({cn: ['1.0', '-'] for cn in SPOT_COLUMNS})
+        raw['代码'] = ['000001', '600000']
+        raw['名称'] = ['平安银行', '浦发银行']
+
+        df = normalize_spot_table(raw)
+
+        assert list(df.columns) == list(SPOT_COLUMNS.values())
+        assert df['current_price'].tolist() == [1.0, 0.0]
+        assert df.dtypes[2:].eq(np.float64).all()
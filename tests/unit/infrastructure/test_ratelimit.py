@@ -0,0 +1,73 @@
+"""
+Tushare 限流单元测试
+"""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.executor import SourceExecutor
+from app.infrastructure.data.ratelimit import TokenBucket
+from app.infrastructure.data.sources.tushare import TushareDataSource
+
+
+def _tushare(pro, bucket):
+    with patch('app.infrastructure.data.sources.tushare.ts') as ts:
+        ts.pro_api.return_value = pro
+        return TushareDataSource(token='test', executor=SourceExecutor('tushare-test', 2, 5), rate_limiter=bucket,
+                                 calendar_store=MagicMock())
+
+
+def _daily(trade_date):
+    return pd.DataFrame({
+        'ts_code': ['000001.SZ', '600000.SH'], 'trade_date': [trade_date] * 2,
+        'open': [10.0, 8.0], 'high': [10.5, 8.2], 'low': [9.8, 7.9], 'close': [10.2, 8.1],
+        'vol': [1e5, 2e5], 'amount': [1e5, 1.6e5],
+    })
+
+
+class TestTokenBucket:
+    """令牌桶测试类"""
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 每 0.1s 一个令牌
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+        assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_shared_across_concurrent_callers(self):
+        bucket = TokenBucket(rate_per_minute=1200, capacity=1)  # 每 0.05s 一个令牌
+        t0 = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        assert time.perf_counter() - t0 == pytest.approx(0.2, abs=0.05)
+
+
+class TestTushareRateLimit:
+    """Tushare 调用限流与重试测试类"""
+
+    @pytest.mark.asyncio
+    async def test_retries_when_quota_exceeded(self):
+        pro = MagicMock()
+        pro.daily.side_effect = [Exception('抱歉，您每分钟最多访问该接口500次'), _daily('20240102')]
+        source = _tushare(pro, TokenBucket(6000))
+
+        with patch('app.infrastructure.data.sources.tushare.settings.TUSHARE_RETRY_BACKOFF_SECONDS', 0.01):
+            bars = await source.get_daily_by_date('20240102')
+
+        assert pro.daily.call_count == 2
+        assert bars['symbol'].tolist() == ['000001', '600000']
+        assert bars['amount'].tolist() == [1e8, 1.6e8]
+
+    @pytest.mark.asyncio
+    async def test_daily_quota_is_not_retried(self):
+        pro = MagicMock()
+        pro.daily.side_effect = Exception('抱歉，您每天最多访问该接口10000次')
+        source = _tushare(pro, TokenBucket(6000))
+
+        with pytest.raises(Exception):
+            await source.get_daily_by_date('20240102')
+        assert pro.daily.call_count == 1
@@ -0,0 +1,65 @@
+"""
+全市场快照缓存单元测试
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.cache.snapshot_cache import MarketSnapshotCache
+
+
+def _spot_table(n: int = 1000) -> pd.DataFrame:
+    return pd.DataFrame({'代码': [f"{i:06d}" for i in range(n)], '最新价': [float(i) for i in range(n)]})
+
+
+class TestMarketSnapshotCache:
+    """快照缓存测试类"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_coalesce_into_one_fetch(self):
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _spot_table()
+
+        cache = MarketSnapshotCache(loader, ttl=60)
+        rows = await asyncio.gather(*(cache.lookup(f"{i:06d}") for i in range(500)))
+
+        assert calls == 1
+        assert [row['最新价'] for row in rows] == [float(i) for i in range(500)]
+        assert await cache.lookup('999999') is None
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_max_age_shorter_than_ttl_refetches(self):
+        async def loader():
+            return _spot_table(3)
+
+        cache = MarketSnapshotCache(loader, ttl=60)
+        first = await cache.get()
+        # 行情推送按推送间隔取快照：未超过 max_age 时复用，超过即回源，即使 ttl 尚未到期
+        assert await cache.get(max_age=10) is first
+        await asyncio.sleep(0.02)
+        assert await cache.get(max_age=0.01) is not first
+        assert cache.fetches == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_snapshot_refetches_and_survives_loader_error(self):
+        tables = [_spot_table(3), RuntimeError("upstream down")]
+
+        async def loader():
+            item = tables.pop(0)
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+        cache = MarketSnapshotCache(loader, ttl=0)
+        first = await cache.get()
+        second = await cache.get()
+
+        assert second is first
+        assert cache.stats()['fetches'] == 2
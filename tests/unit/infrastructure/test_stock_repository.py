@@ -0,0 +1,64 @@
+"""
+股票数据仓储单元测试（SQLite）
+"""
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.database import init_db
+from app.infrastructure.db import StockRepository
+
+
+@pytest.fixture(params=['sqlite', 'generic'])
+def repo(request, tmp_path):
+    """sqlite 走 ON CONFLICT；generic 把方言名改掉，走没有原生 upsert 的通用路径"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'stock.db'}")
+    init_db(engine)
+    engine.dialect.name = request.param
+    yield StockRepository(engine, batch_size=3)
+    engine.dispose()
+
+
+class TestStockRepository:
+    """股票数据仓储测试类"""
+
+    def test_upsert_stock_basics_keeps_columns_not_provided(self, repo):
+        repo.upsert_stock_basics(pd.DataFrame({
+            'symbol': ['000001', '600000'], 'name': ['平安银行', '浦发银行'], 'exchange': ['SZSE', 'SSE'],
+        }))
+        repo.upsert_stock_basics(pd.DataFrame({'symbol': ['000001'], 'name': ['平安'], 'industry': ['银行']}))
+
+        basics = repo.get_stock_basics().set_index('symbol')
+        assert len(basics) == 2
+        assert basics.loc['000001', 'name'] == '平安'
+        assert basics.loc['000001', 'exchange'] == 'SZSE'
+        assert basics.loc['000001', 'industry'] == '银行'
+
+    def test_upsert_daily_bars_in_batches_and_stream(self, repo):
+        dates = pd.bdate_range('2024-01-01', periods=5)
+        bars = pd.DataFrame({
+            'date': dates, 'open': 10.0, 'high': 11.0, 'low': 9.0, 'close': 10.5,
+            'volume': [1e5, 1e5, float('nan'), 1e5, 1e5], 'amount': 1e8,
+        })
+        assert repo.upsert_daily_bars(bars, symbol='000001') == 5
+        repo.upsert_daily_bars(bars.assign(symbol='600000'))
+        # 重复写入最后一根覆盖而不是新增
+        repo.upsert_daily_bars(bars.tail(1).assign(close=12.0), symbol='000001')
+
+        local = repo.read_daily_bars('000001')
+        assert len(local) == 5
+        assert local['close'].iloc[-1] == 12.0
+        assert pd.isna(local['volume'].iloc[2])
+
+        chunks = list(repo.iter_daily_bars(start=dates[1].date(), chunk_size=3))
+        assert [len(c) for c in chunks] == [3, 3, 2]
+        assert pd.concat(chunks)['symbol'].tolist() == ['000001'] * 4 + ['600000'] * 4
+
+    def test_upsert_financials(self, repo):
+        frame = pd.DataFrame({
+            'symbol': ['000001', '000001'], 'report_date': ['2023-12-31', '2024-03-31'],
+            'eps': [2.25, 0.66], 'roe': [11.4, float('nan')],
+        })
+        assert repo.upsert_financials(frame) == 2
+        with pytest.raises(ValueError):
+            repo.upsert_financials(frame.drop(columns='report_date'))
@@ -0,0 +1,65 @@
+"""
+离线合成数据源单元测试
+"""
+import pandas as pd
+import pytest
+
+from app.domain.services.stock_service import StockService
+from app.infrastructure.data.sources.synthetic import BOARDS, SyntheticDataSource
+
+
+@pytest.fixture
+def source(tmp_path):
+    return SyntheticDataSource(n_symbols=300, years=5, seed=7, root=str(tmp_path))
+
+
+class TestSyntheticDataSource:
+    """合成数据源测试类"""
+
+    def test_universe_is_deterministic_and_realistic(self, source, tmp_path):
+        other = SyntheticDataSource(n_symbols=300, years=5, seed=7, root=str(tmp_path / 'other'))
+        a, b = source._fetch_stock_list(), other._fetch_stock_list()
+        pd.testing.assert_frame_equal(a, b)
+        assert len(a) == 300 and a['symbol'].is_unique
+        assert set(a['market_type']) == {'主板', '创业板', '科创板', '北交所'}
+        assert (a['industry'] != '').all()
+
+    def test_board_ranges_do_not_overlap(self):
+        ranges = sorted((start, start + size) for _, start, size, _ in BOARDS)
+        assert all(end <= nxt for (_, end), (nxt, _) in zip(ranges, ranges[1:]))
+
+    @pytest.mark.asyncio
+    async def test_full_universe_symbols_are_unique(self, tmp_path):
+        # 基准测试用的默认规模：号段重叠时 600 与 601/603 会生成相同代码
+        service = StockService(data_source=SyntheticDataSource(years=1, root=str(tmp_path)))
+        universe = await service.get_universe_frame()
+        assert len(universe) == 5000
+        assert universe['symbol'].is_unique
+
+    def test_history_ends_at_snapshot_prev_close(self, source):
+        symbol = source._universe['symbol'].iloc[10]
+        hist = source.history(symbol)
+        pd.testing.assert_frame_equal(hist, source.history(symbol))
+        assert (hist['最高'] >= hist[['开盘', '收盘']].max(axis=1)).all()
+        assert (hist['最低'] <= hist[['开盘', '收盘']].min(axis=1)).all()
+
+        spot = source._fetch_spot_table().set_index('symbol')
+        assert spot.loc[symbol, 'prev_close'] == hist['收盘'].iloc[-1]
+
+    @pytest.mark.asyncio
+    async def test_kline_goes_through_store_and_adjustment(self, source):
+        symbol = source._universe['symbol'].iloc[0]
+        daily = await source.get_stock_kline(symbol, 'daily', 20)
+        assert len(daily) == 20
+        assert not source.kline_store.read(symbol).empty
+
+        qfq = await source.get_stock_kline(symbol, 'weekly', 5, 'qfq')
+        weekly = await source.get_stock_kline(symbol, 'weekly', 5)
+        pd.testing.assert_frame_equal(qfq, weekly)
+
+    @pytest.mark.asyncio
+    async def test_snapshot_moves_between_fetches(self, source):
+        first = source._fetch_spot_table()
+        second = source._fetch_spot_table()
+        assert (first['prev_close'] == second['prev_close']).all()
+        assert (first['current_price'] != second['current_price']).any()
@@ -0,0 +1,59 @@
+"""
+股票池索引单元测试
+"""
+import pandas as pd
+import pytest
+
+from app.infrastructure.data.cache.universe_index import UniverseIndex
+from app.infrastructure.data.normalize import normalize_stock_list
+
+
+def _universe() -> pd.DataFrame:
+    codes = ([f"{i:06d}" for i in range(1, 40)]
+             + [f"{600000 + i}" for i in range(30)]
+             + [f"{300000 + i}" for i in range(20)])
+    frame = normalize_stock_list(pd.DataFrame({'code': codes[::-1], 'name': [f"股票{c}" for c in codes[::-1]]}))
+    frame['industry'] = ['银行' if int(c) % 3 == 0 else '医药' for c in frame['symbol']]
+    return frame
+
+
+def _walk(index: UniverseIndex, limit: int, **filters):
+    symbols, cursor = [], None
+    while True:
+        items, cursor = index.page(limit, cursor=cursor, **filters)
+        symbols.extend(item['symbol'] for item in items)
+        if cursor is None:
+            return symbols
+
+
+class TestUniverseIndex:
+    """股票池索引测试类"""
+
+    def setup_method(self):
+        self.frame = _universe()
+        self.index = UniverseIndex(self.frame)
+
+    def test_lookup_and_offset_page(self):
+        assert self.index.get('600001')['exchange'] == 'SSE'
+        assert self.index.get('999999') is None
+        items, cursor = self.index.page(5, offset=2)
+        assert [i['symbol'] for i in items] == sorted(self.frame['symbol'])[2:7]
+        assert cursor == items[-1]['symbol']
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {'exchange': 'SZSE'},
+        {'market_type': '创业板'},
+        {'exchange': 'SZSE', 'industry': '银行'},
+        {'exchange': 'SSE', 'market_type': '创业板'},
+    ])
+    def test_keyset_pagination_visits_each_match_once(self, filters):
+        expected = self.frame
+        for field, value in filters.items():
+            expected = expected[expected[field] == value]
+
+        assert _walk(self.index, 7, **filters) == sorted(expected['symbol'])
+
+    def test_unknown_filter_rejected(self):
+        with pytest.raises(ValueError):
+            self.index.page(10, sector='银行')